@@ -11,7 +11,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-if config.config_file_name is not None:
+# (skipped when run from app.server, which has configured logging already)
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -26,9 +27,20 @@ import app.models.company
 import app.models.job
 import app.models.application
 import app.models.application_history
+import app.models.outbox
+import app.models.job_stage_count
+import app.models.job_recommendation
 
 target_metadata = Base.metadata
 
+# PostgreSQL-only objects created by migrations but not mapped on the models
+# (full-text search, see app/core/search.py); keep autogenerate from dropping them
+UNMAPPED_OBJECTS = {"search_vector", "ix_jobs_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (reflected and compare_to is None and name in UNMAPPED_OBJECTS)
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -54,6 +66,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -75,7 +88,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""allow NULL old_stage for the initial application history entry
+
+Revision ID: 05cb3382511f
+Revises: 1544a754f51d
+Create Date: 2026-10-17 10:03:15.228904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '05cb3382511f'
+down_revision: Union[str, Sequence[str], None] = '1544a754f51d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # apply_to_job records the first "Applied" entry with old_stage = NULL
+    with op.batch_alter_table('application_history') as batch_op:  # SQLite: table rebuild
+        batch_op.alter_column('old_stage',
+                   existing_type=sa.VARCHAR(),
+                   nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE application_history SET old_stage = '' WHERE old_stage IS NULL")
+    with op.batch_alter_table('application_history') as batch_op:
+        batch_op.alter_column('old_stage',
+                   existing_type=sa.VARCHAR(),
+                   nullable=False)
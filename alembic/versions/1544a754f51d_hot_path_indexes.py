@@ -0,0 +1,57 @@
+"""hot path indexes for applications, jobs, users and history
+
+Revision ID: 1544a754f51d
+Revises: 2d1a801a0bb3
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1544a754f51d'
+down_revision: Union[str, Sequence[str], None] = '2d1a801a0bb3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('uq_applications_candidate_job', 'applications', ['candidate_id', 'job_id'], True),
+    ('ix_applications_job_stage_created', 'applications', ['job_id', 'stage', 'created_at'], False),
+    ('ix_jobs_company_status', 'jobs', ['company_id', 'status'], False),
+    ('ix_users_company_role', 'users', ['company_id', 'role'], False),
+    ('ix_application_history_application_changed', 'application_history', ['application_id', 'changed_at'], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and building
+    # these on a large applications table must not block inserts.
+    # NOTE: the unique index fails if duplicate (candidate_id, job_id) rows
+    # already exist; remove them before upgrading.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -1,7 +1,7 @@
 """initial migration
 
 Revision ID: 2d1a801a0bb3
-Revises: 
+Revises: 0b7e3f1c9a24
 Create Date: 2025-12-10 19:38:26.190560
 
 """
@@ -13,38 +13,39 @@ from sqlalchemy.dialects import postgresql
 
 # revision identifiers, used by Alembic.
 revision: str = '2d1a801a0bb3'
-down_revision: Union[str, Sequence[str], None] = None
+down_revision: Union[str, Sequence[str], None] = '0b7e3f1c9a24'
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.alter_column('jobs', 'description',
-               existing_type=sa.VARCHAR(),
-               nullable=False)
-    op.alter_column('jobs', 'status',
-               existing_type=postgresql.ENUM('open', 'closed', name='jobstatus'),
-               type_=sa.String(),
-               existing_nullable=True)
-    op.alter_column('jobs', 'company_id',
-               existing_type=sa.INTEGER(),
-               nullable=True)
-    # ### end Alembic commands ###
+    # batch mode: SQLite cannot ALTER COLUMN and gets the table rebuilt;
+    # elsewhere these are plain ALTER TABLE statements
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.alter_column('description',
+                   existing_type=sa.VARCHAR(),
+                   nullable=False)
+        batch_op.alter_column('status',
+                   existing_type=postgresql.ENUM('open', 'closed', name='jobstatus'),
+                   type_=sa.String(),
+                   existing_nullable=True)
+        batch_op.alter_column('company_id',
+                   existing_type=sa.INTEGER(),
+                   nullable=True)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.alter_column('jobs', 'company_id',
-               existing_type=sa.INTEGER(),
-               nullable=False)
-    op.alter_column('jobs', 'status',
-               existing_type=sa.String(),
-               type_=postgresql.ENUM('open', 'closed', name='jobstatus'),
-               existing_nullable=True)
-    op.alter_column('jobs', 'description',
-               existing_type=sa.VARCHAR(),
-               nullable=True)
-    # ### end Alembic commands ###
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.alter_column('company_id',
+                   existing_type=sa.INTEGER(),
+                   nullable=False)
+        batch_op.alter_column('status',
+                   existing_type=sa.String(),
+                   type_=postgresql.ENUM('open', 'closed', name='jobstatus'),
+                   existing_nullable=True,
+                   postgresql_using='status::jobstatus')
+        batch_op.alter_column('description',
+                   existing_type=sa.VARCHAR(),
+                   nullable=True)
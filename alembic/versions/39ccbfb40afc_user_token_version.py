@@ -0,0 +1,28 @@
+"""add users.token_version for stateless token revocation
+
+Revision ID: 39ccbfb40afc
+Revises: 05cb3382511f
+Create Date: 2026-10-17 11:20:47.901365
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '39ccbfb40afc'
+down_revision: Union[str, Sequence[str], None] = '05cb3382511f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,42 @@
+"""add outbox_messages.claimed_at/failed_at and purge indexes
+
+Revision ID: 6e2b8d4f1a57
+Revises: a7d3f9c2e481
+Create Date: 2026-10-18 16:42:07.215930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2b8d4f1a57'
+down_revision: Union[str, Sequence[str], None] = 'a7d3f9c2e481'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('outbox_messages', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.add_column('outbox_messages', sa.Column('failed_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_outbox_messages_dispatched_at'), 'outbox_messages', ['dispatched_at'], unique=False)
+    op.create_index(
+        'ix_outbox_messages_failed_at',
+        'outbox_messages',
+        ['failed_at'],
+        unique=False,
+        postgresql_where=sa.text('failed_at IS NOT NULL'),
+        sqlite_where=sa.text('failed_at IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_messages_failed_at', table_name='outbox_messages')
+    op.drop_index(op.f('ix_outbox_messages_dispatched_at'), table_name='outbox_messages')
+    with op.batch_alter_table('outbox_messages') as batch_op:
+        batch_op.drop_column('failed_at')
+        batch_op.drop_column('claimed_at')
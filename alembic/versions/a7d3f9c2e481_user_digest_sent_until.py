@@ -0,0 +1,28 @@
+"""add users.digest_sent_until (recruiter digest watermark)
+
+Revision ID: a7d3f9c2e481
+Revises: f1a3c5e7b920
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f9c2e481'
+down_revision: Union[str, Sequence[str], None] = 'f1a3c5e7b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('digest_sent_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'digest_sent_until')
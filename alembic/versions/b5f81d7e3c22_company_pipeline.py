@@ -0,0 +1,28 @@
+"""add companies.pipeline for per-company hiring workflows
+
+Revision ID: b5f81d7e3c22
+Revises: 7c4e2b9d1a03
+Create Date: 2026-10-17 14:02:37.116540
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5f81d7e3c22'
+down_revision: Union[str, Sequence[str], None] = '7c4e2b9d1a03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('companies', sa.Column('pipeline', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('companies', 'pipeline')
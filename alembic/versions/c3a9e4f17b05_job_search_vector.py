@@ -0,0 +1,64 @@
+"""add jobs.search_vector (generated tsvector) with a GIN index
+
+Revision ID: c3a9e4f17b05
+Revises: b5f81d7e3c22
+Create Date: 2026-10-17 15:21:09.664217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e4f17b05'
+down_revision: Union[str, Sequence[str], None] = 'b5f81d7e3c22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Title matches rank above description matches (weights A and B)
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL only: other databases use the in-process index in app/core/search.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    # NOTE: adding a stored generated column rewrites the jobs table under an
+    # ACCESS EXCLUSIVE lock; run this in a maintenance window on large tables.
+    op.add_column(
+        'jobs',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_DOCUMENT, persisted=True))
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_jobs_search_vector',
+            'jobs',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_jobs_search_vector',
+            table_name='jobs',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('jobs', 'search_vector')
@@ -0,0 +1,41 @@
+"""add job_stage_counts (per-job pipeline counters)
+
+Revision ID: d8b2f6a4c190
+Revises: c3a9e4f17b05
+Create Date: 2026-10-17 18:21:09.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b2f6a4c190'
+down_revision: Union[str, Sequence[str], None] = 'c3a9e4f17b05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_stage_counts',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id', 'stage'),
+    )
+    # Backfill from existing applications in one grouped scan
+    op.execute(
+        "INSERT INTO job_stage_counts (job_id, stage, count) "
+        "SELECT job_id, stage, count(*) FROM applications "
+        "WHERE stage IS NOT NULL GROUP BY job_id, stage"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_stage_counts')
@@ -0,0 +1,28 @@
+"""add users.profile (candidate text for applicant ranking)
+
+Revision ID: e4c7a1b9d256
+Revises: d8b2f6a4c190
+Create Date: 2026-10-17 20:47:52.830114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c7a1b9d256'
+down_revision: Union[str, Sequence[str], None] = 'd8b2f6a4c190'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('profile', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'profile')
@@ -0,0 +1,37 @@
+"""add job_recommendations (precomputed candidate job feeds)
+
+Revision ID: f1a3c5e7b920
+Revises: e4c7a1b9d256
+Create Date: 2026-10-17 21:36:44.208513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a3c5e7b920'
+down_revision: Union[str, Sequence[str], None] = 'e4c7a1b9d256'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Filled by the recommendation Celery tasks (refresh_recommendations)
+    op.create_table(
+        'job_recommendations',
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('feed', sa.JSON(), nullable=False),
+        sa.Column('last_job_id', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['candidate_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('candidate_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_recommendations')
@@ -3,10 +3,129 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _async_url(url):
+    if not url:
+        return url
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
 class Settings:
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+
+    # Async request path (AsyncSession over asyncpg); the sync engine is
+    # still used by Celery tasks and CLIs
+    DB_ASYNC: bool = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+    # Connection pool (per process)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # Behind PgBouncer (transaction pooling): no app-side pool, no prepared statements
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+    # Connections each worker opens at startup, so first requests skip the connect
+    DB_POOL_WARM_CONNECTIONS: int = int(os.getenv("DB_POOL_WARM_CONNECTIONS", "2"))
+    # Connection budget of the database (0 = unknown); caps the worker count
+    DB_MAX_CONNECTIONS: int = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+
+    # Production server (python -m app.server)
+    HOST: str = os.getenv("HOST", "0.0.0.0")
+    PORT: int = int(os.getenv("PORT", "8000"))
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "0"))  # 0 = one per CPU core
+    GRACEFUL_TIMEOUT_SECONDS: int = int(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30"))
+    KEEP_ALIVE_SECONDS: int = int(os.getenv("KEEP_ALIVE_SECONDS", "5"))
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    # strict: refuse to start unless the database is at the Alembic head; warn: log only
+    SCHEMA_CHECK: str = os.getenv("SCHEMA_CHECK", "strict").lower()
+    WARM_UP: bool = os.getenv("WARM_UP", "true").lower() in ("1", "true", "yes")
+
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
+    # Celery broker / result backend
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
+
+    # 0 = email recruiters on every application; N = one digest per recruiter
+    # every N minutes listing all new applicants
+    RECRUITER_DIGEST_MINUTES: int = int(os.getenv("RECRUITER_DIGEST_MINUTES", "0"))
+
+    # Transactional outbox relay (python -m app.tasks.outbox_relay)
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+    OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", "1.0"))
+    OUTBOX_RETENTION_HOURS: int = int(os.getenv("OUTBOX_RETENTION_HOURS", "24"))
+    OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+    # A claimed message not marked within this time (relay died mid-batch)
+    # is claimed again
+    OUTBOX_CLAIM_TIMEOUT_SECONDS: int = int(os.getenv("OUTBOX_CLAIM_TIMEOUT_SECONDS", "300"))
+
+    # "stateless": authorize reads from signed token claims (no per-request
+    #   query); writes and admin requests are checked against the token version
+    # "database": re-check every request against the (cached) user row
+    # Revocation window in stateless mode (role/company change, password
+    # reset): writes are refused at once in the worker that made the change and
+    # within USER_CACHE_TTL_SECONDS elsewhere; reads until the token expires,
+    # ACCESS_TOKEN_EXPIRE_MINUTES
+    AUTH_MODE: str = os.getenv("AUTH_MODE", "stateless")
+    USER_CACHE_SIZE: int = int(os.getenv("USER_CACHE_SIZE", "10000"))
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    TOKEN_CACHE_SIZE: int = int(os.getenv("TOKEN_CACHE_SIZE", "50000"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+
+    # Password hashing (bcrypt runs in a dedicated process pool)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+    # Compiled per-company hiring pipelines
+    PIPELINE_CACHE_SIZE: int = int(os.getenv("PIPELINE_CACHE_SIZE", "1000"))
+    PIPELINE_CACHE_TTL_SECONDS: int = int(os.getenv("PIPELINE_CACHE_TTL_SECONDS", "300"))
+
+    # Hiring-funnel analytics reports, cached per (company, job, window)
+    ANALYTICS_CACHE_SIZE: int = int(os.getenv("ANALYTICS_CACHE_SIZE", "500"))
+    ANALYTICS_CACHE_TTL_SECONDS: int = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300"))
+    ANALYTICS_MAX_DAYS: int = int(os.getenv("ANALYTICS_MAX_DAYS", "730"))
+
+    # Applicant ranking (/jobs/{id}/applications/ranked): per-job indexes
+    MATCH_INDEX_CACHE_SIZE: int = int(os.getenv("MATCH_INDEX_CACHE_SIZE", "200"))
+    MATCH_INDEX_TTL_SECONDS: int = int(os.getenv("MATCH_INDEX_TTL_SECONDS", "600"))
+    RANKED_APPLICANTS_MAX: int = int(os.getenv("RANKED_APPLICANTS_MAX", "200"))
+
+    # Job recommendations (/jobs/recommended): top-N per candidate, refreshed by Celery
+    RECOMMENDATIONS_TOP_N: int = int(os.getenv("RECOMMENDATIONS_TOP_N", "50"))
+    RECOMMENDATIONS_ACTIVE_DAYS: int = int(os.getenv("RECOMMENDATIONS_ACTIVE_DAYS", "180"))
+    RECOMMENDATIONS_BATCH_SIZE: int = int(os.getenv("RECOMMENDATIONS_BATCH_SIZE", "500"))
+    RECOMMENDATIONS_REFRESH_MINUTES: int = int(os.getenv("RECOMMENDATIONS_REFRESH_MINUTES", "1440"))
+    RECOMMENDATIONS_CACHE_SIZE: int = int(os.getenv("RECOMMENDATIONS_CACHE_SIZE", "10000"))
+    RECOMMENDATIONS_CACHE_TTL_SECONDS: int = int(os.getenv("RECOMMENDATIONS_CACHE_TTL_SECONDS", "60"))
+
+    # Request metrics: Server-Timing header, /metrics, slow-query log
+    SERVER_TIMING: bool = os.getenv("SERVER_TIMING", "true").lower() == "true"
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+    # Read-through cache for job/company listings: memory | redis | none
+    LISTING_CACHE_BACKEND: str = os.getenv("LISTING_CACHE_BACKEND", "memory").lower()
+    LISTING_CACHE_TTL_SECONDS: int = int(os.getenv("LISTING_CACHE_TTL_SECONDS", "30"))
+    LISTING_CACHE_SIZE: int = int(os.getenv("LISTING_CACHE_SIZE", "5000"))
+    LISTING_CACHE_REDIS_URL: str = os.getenv("LISTING_CACHE_REDIS_URL", REDIS_URL)
+
+    # Pagination / streaming for list endpoints
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "500"))
+    STREAM_CHUNK_SIZE: int = int(os.getenv("STREAM_CHUNK_SIZE", "1000"))
+
+    # Bulk job import (POST /jobs/import, app.tasks.import_jobs)
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+    IMPORT_MAX_ERRORS: int = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+    IMPORT_MAX_BYTES: int = int(os.getenv("IMPORT_MAX_BYTES", str(100 * 1024 * 1024)))
+
 settings = Settings()
@@ -0,0 +1,284 @@
+"""
+Hiring-funnel analytics over `application_history`.
+
+Everything is computed set-based in SQL: a LEAD() window over each
+application's history turns stage entries into stints (time spent in a
+stage), and GROUP BYs produce the funnel and throughput series. PostgreSQL
+also aggregates the percentiles (percentile_cont); on other databases the
+stint durations come back as one column and are summarised in memory,
+vectorised with numpy when it is installed.
+
+Reports are cached per (company, job, window, bucket) for
+ANALYTICS_CACHE_TTL_SECONDS: dashboards poll, history only grows.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import extract, func, literal_column
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.lazy import numpy
+from app.core.workflow import pipeline_for_company
+from app.models.application import Application
+from app.models.application_history import ApplicationHistory
+from app.models.job import Job
+
+
+BUCKETS = ("day", "week", "month")
+
+# Percentiles reported for time-in-stage
+QUANTILES = (0.5, 0.9)
+
+analytics_cache = TTLCache(
+    maxsize=settings.ANALYTICS_CACHE_SIZE,
+    ttl=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _scoped(query, company_id: int, job_id: Optional[int]):
+    """Restrict a query joined to Application to one company (and job)."""
+    query = query.join(Job, Job.id == Application.job_id).filter(Job.company_id == company_id)
+    if job_id is not None:
+        query = query.filter(Job.id == job_id)
+    return query
+
+
+# ---------------------------------------------------------
+# 🧮 In-memory summaries (numpy, or plain Python)
+# ---------------------------------------------------------
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linear interpolation between closest ranks, like percentile_cont."""
+    position = (len(sorted_values) - 1) * q
+    low, high = math.floor(position), math.ceil(position)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+def summarize_durations(stages: Sequence[str], seconds: Sequence[float]) -> Dict[str, dict]:
+    """
+    Per-stage count, mean and QUANTILES of stint durations given as two
+    parallel columns (stage entered, seconds spent there).
+    """
+    if not stages:
+        return {}
+
+    np = numpy()  # optional: vectorised percentiles for in-memory batches
+    if np is not None:
+        stage_arr = np.asarray(stages, dtype=object)
+        seconds_arr = np.asarray(seconds, dtype=float)
+        # One stable sort by stage, then each stage is a contiguous slice
+        order = np.argsort(stage_arr, kind="stable")
+        stage_arr, seconds_arr = stage_arr[order], seconds_arr[order]
+        names, starts = np.unique(stage_arr, return_index=True)
+        summary = {}
+        for name, values in zip(names, np.split(seconds_arr, starts[1:])):
+            percentiles = np.quantile(values, QUANTILES)
+            summary[name] = {
+                "stints": int(values.size),
+                "mean": float(values.mean()),
+                **{q: float(p) for q, p in zip(QUANTILES, percentiles)},
+            }
+        return summary
+
+    grouped = defaultdict(list)
+    for stage, value in zip(stages, seconds):
+        grouped[stage].append(float(value))
+    summary = {}
+    for stage, values in grouped.items():
+        values.sort()
+        summary[stage] = {
+            "stints": len(values),
+            "mean": sum(values) / len(values),
+            **{q: _percentile(values, q) for q in QUANTILES},
+        }
+    return summary
+
+
+# ---------------------------------------------------------
+# 🐘 Set-based queries
+# ---------------------------------------------------------
+def funnel_counts(db: Session, company_id: int, job_id: Optional[int], since: datetime, until: datetime):
+    """
+    Applications created in [since, until) and, per stage, how many of them
+    ever entered it. Returns (applications, {stage: reached}).
+    """
+    applications = _scoped(
+        db.query(func.count(Application.id)), company_id, job_id
+    ).filter(Application.created_at >= since, Application.created_at < until).scalar()
+
+    reached = _scoped(
+        db.query(ApplicationHistory.new_stage, func.count(func.distinct(ApplicationHistory.application_id)))
+        .join(Application, Application.id == ApplicationHistory.application_id),
+        company_id, job_id,
+    ).filter(
+        Application.created_at >= since, Application.created_at < until
+    ).group_by(ApplicationHistory.new_stage).all()
+
+    return applications or 0, dict(reached)
+
+
+def _stints(db: Session, company_id: int, job_id: Optional[int], since: datetime):
+    """
+    Subquery: one row per history entry from `since` on, with the seconds
+    until the application's next entry. LEAD only looks forward, so older
+    history can be skipped before the window runs.
+    """
+    left_at = func.lead(ApplicationHistory.changed_at).over(
+        partition_by=ApplicationHistory.application_id,
+        order_by=(ApplicationHistory.changed_at, ApplicationHistory.id),
+    )
+    if _is_postgres(db):
+        seconds = extract("epoch", left_at - ApplicationHistory.changed_at)
+    else:
+        seconds = (func.julianday(left_at) - func.julianday(ApplicationHistory.changed_at)) * 86400.0
+
+    return _scoped(
+        db.query(
+            ApplicationHistory.new_stage.label("stage"),
+            ApplicationHistory.changed_at.label("entered_at"),
+            seconds.label("seconds"),
+        ).join(Application, Application.id == ApplicationHistory.application_id),
+        company_id, job_id,
+    ).filter(ApplicationHistory.changed_at >= since).subquery()
+
+
+def time_in_stage(db: Session, company_id: int, job_id: Optional[int], since: datetime, until: datetime):
+    """
+    Completed stints that started in [since, until), summarised per stage:
+    {stage: {"stints", "mean", 0.5, 0.9}} (seconds).
+    """
+    stints = _stints(db, company_id, job_id, since)
+    finished = (stints.c.seconds.isnot(None), stints.c.entered_at < until)
+
+    if _is_postgres(db):
+        rows = (
+            db.query(
+                stints.c.stage,
+                func.count(),
+                func.avg(stints.c.seconds),
+                *[func.percentile_cont(q).within_group(stints.c.seconds) for q in QUANTILES],
+            )
+            .filter(*finished)
+            .group_by(stints.c.stage)
+            .all()
+        )
+        return {
+            stage: {"stints": count, "mean": float(mean), **{q: float(p) for q, p in zip(QUANTILES, pcts)}}
+            for stage, count, mean, *pcts in rows
+        }
+
+    rows = db.query(stints.c.stage, stints.c.seconds).filter(*finished).all()
+    return summarize_durations([row[0] for row in rows], [row[1] for row in rows])
+
+
+def _period(db: Session, bucket: str):
+    if _is_postgres(db):
+        # Inlined (bucket is one of BUCKETS) so SELECT and GROUP BY match
+        return func.date(func.date_trunc(literal_column(f"'{bucket}'"), ApplicationHistory.changed_at))
+    changed_at = ApplicationHistory.changed_at
+    if bucket == "day":
+        return func.date(changed_at)
+    if bucket == "week":
+        # ISO weeks start on Monday, like date_trunc('week')
+        return func.date(changed_at, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    return func.strftime("%Y-%m-01", changed_at)
+
+
+def throughput(db: Session, company_id: int, job_id: Optional[int], since: datetime, until: datetime,
+               bucket: str) -> List[dict]:
+    """Stage entries per `bucket` period in [since, until), oldest period first."""
+    period = _period(db, bucket).label("period")
+    rows = _scoped(
+        db.query(period, ApplicationHistory.new_stage, func.count())
+        .join(Application, Application.id == ApplicationHistory.application_id),
+        company_id, job_id,
+    ).filter(
+        ApplicationHistory.changed_at >= since, ApplicationHistory.changed_at < until
+    ).group_by(period, ApplicationHistory.new_stage).order_by(period, ApplicationHistory.new_stage).all()
+
+    return [
+        {"period": str(p.isoformat() if hasattr(p, "isoformat") else p), "stage": stage, "count": count}
+        for p, stage, count in rows
+    ]
+
+
+# ---------------------------------------------------------
+# 📊 Report
+# ---------------------------------------------------------
+def _hours(seconds: float) -> float:
+    return round(seconds / 3600, 2)
+
+
+def _ordered(stages: Iterable[str], pipeline_stages: Sequence[str]) -> List[str]:
+    """Pipeline order first, then stages the pipeline no longer has."""
+    extra = sorted(set(stages) - set(pipeline_stages))
+    return list(pipeline_stages) + extra
+
+
+def hiring_report(db: Session, company_id: int, job_id: Optional[int] = None,
+                  days: int = 90, bucket: str = "week") -> dict:
+    """
+    Funnel conversion, time-in-stage percentiles and throughput for one
+    company (or one of its jobs) over the last `days` days. Cached.
+    """
+    key = (company_id, job_id, days, bucket)
+    report = analytics_cache.get(key)
+    if report is not None:
+        return report
+
+    until = datetime.utcnow()
+    since = until - timedelta(days=days)
+    pipeline = pipeline_for_company(db, company_id)
+
+    applications, reached = funnel_counts(db, company_id, job_id, since, until)
+    # Rows created without a history entry still entered the first stage
+    reached[pipeline.initial_stage] = max(reached.get(pipeline.initial_stage, 0), applications)
+    entered = reached[pipeline.initial_stage]
+
+    funnel, previous = [], None
+    for stage in _ordered(reached, pipeline.stages):
+        count = reached.get(stage, 0)
+        # Step conversion only when the previous stage in order feeds this one
+        step_rate = None
+        if previous is not None and previous in pipeline.allowed_sources(stage) and reached.get(previous):
+            step_rate = round(count / reached[previous], 4)
+        funnel.append({
+            "stage": stage,
+            "reached": count,
+            "rate": round(count / entered, 4) if entered else None,
+            "step_rate": step_rate,
+        })
+        previous = stage
+
+    durations = time_in_stage(db, company_id, job_id, since, until)
+    stage_times = [
+        {
+            "stage": stage,
+            "stints": durations[stage]["stints"],
+            "mean_hours": _hours(durations[stage]["mean"]),
+            "median_hours": _hours(durations[stage][0.5]),
+            "p90_hours": _hours(durations[stage][0.9]),
+        }
+        for stage in _ordered(durations, [s for s in pipeline.stages if s in durations])
+    ]
+
+    report = {
+        "company_id": company_id,
+        "job_id": job_id,
+        "since": since,
+        "until": until,
+        "bucket": bucket,
+        "applications": applications,
+        "funnel": funnel,
+        "time_in_stage": stage_times,
+        "throughput": throughput(db, company_id, job_id, since, until, bucket),
+    }
+    analytics_cache.set(key, report)
+    return report
@@ -1,8 +1,8 @@
 from celery_app import celery_app
 
-# Celery Task
-@celery_app.task
-def send_email_task(to_email: str, subject: str, body: str):
+
+def deliver_email(to_email: str, subject: str, body: str):
+    """Actually send one email (runs inside the Celery worker)."""
     print("\n====== EMAIL SENT (Celery Worker) ======")
     print(f"To: {to_email}")
     print(f"Subject: {subject}")
@@ -10,6 +10,12 @@ def send_email_task(to_email: str, subject: str, body: str):
     print("========================================\n")
 
 
+# Celery Task
+@celery_app.task
+def send_email_task(to_email: str, subject: str, body: str):
+    deliver_email(to_email, subject, body)
+
+
 # FastAPI will call THIS function
 def send_email(to_email: str, subject: str, body: str):
     send_email_task.delay(to_email, subject, body)
@@ -0,0 +1,162 @@
+"""
+Compliance export: every application of a company, joined with its job,
+candidate and full stage history, streamed as CSV or NDJSON.
+
+Applications are read through a server-side cursor (`yield_per`) in id
+order, one partition at a time; the history of each partition is fetched
+with one extra query. Memory stays flat whatever the company's size, and an
+interrupted export resumes with `after_id` = the last application id that
+was fully written.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.application import Application
+from app.models.application_history import ApplicationHistory
+from app.models.job import Job
+from app.models.user import User
+
+
+FORMATS = ("csv", "ndjson")
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+APPLICATION_FIELDS = [
+    "application_id", "job_id", "job_title", "job_status",
+    "candidate_id", "candidate_email", "candidate_name", "stage", "created_at",
+]
+HISTORY_FIELDS = ["old_stage", "new_stage", "changed_by", "changed_at"]
+
+# CSV is flat: one line per history entry, application columns repeated
+CSV_HEADER = APPLICATION_FIELDS + [f"history_{field}" for field in HISTORY_FIELDS]
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _applications(company_id: int, after_id: Optional[int]):
+    query = (
+        select(
+            Application.id.label("application_id"),
+            Application.job_id,
+            Job.title.label("job_title"),
+            Job.status.label("job_status"),
+            Application.candidate_id,
+            User.email.label("candidate_email"),
+            User.full_name.label("candidate_name"),
+            Application.stage,
+            Application.created_at,
+        )
+        .join(Job, Job.id == Application.job_id)
+        .join(User, User.id == Application.candidate_id)
+        .where(Job.company_id == company_id)
+        .order_by(Application.id)
+    )
+    if after_id is not None:
+        query = query.where(Application.id > after_id)
+    return query
+
+
+def _history(db: Session, application_ids: List[int]) -> dict:
+    rows = db.execute(
+        select(ApplicationHistory.application_id, *[getattr(ApplicationHistory, f) for f in HISTORY_FIELDS])
+        .where(ApplicationHistory.application_id.in_(application_ids))
+        .order_by(ApplicationHistory.application_id, ApplicationHistory.changed_at, ApplicationHistory.id)
+    )
+    history = {application_id: [] for application_id in application_ids}
+    for application_id, *values in rows:
+        history[application_id].append({f: _value(v) for f, v in zip(HISTORY_FIELDS, values)})
+    return history
+
+
+def export_records(
+    company_id: int,
+    after_id: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Iterator[List[dict]]:
+    """
+    Yield lists of application dicts (with a `history` list), `chunk_size`
+    applications at a time. Owns its session: it outlives the request.
+    """
+    chunk_size = chunk_size or settings.STREAM_CHUNK_SIZE
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _applications(company_id, after_id).execution_options(yield_per=chunk_size)
+        )
+        for partition in result.partitions():
+            records = [{f: _value(v) for f, v in row._mapping.items()} for row in partition]
+            history = _history(db, [record["application_id"] for record in records])
+            for record in records:
+                record["history"] = history[record["application_id"]]
+            yield records
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------
+# 🧾 Encoders
+# ---------------------------------------------------------
+def _ndjson_chunks(chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    for records in chunks:
+        yield "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode()
+
+
+def _csv_chunks(chunks: Iterable[List[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    for records in chunks:
+        for record in records:
+            application = [record[f] for f in APPLICATION_FIELDS]
+            # Applications without history still get one line
+            for entry in record["history"] or [dict.fromkeys(HISTORY_FIELDS)]:
+                writer.writerow(application + [entry[f] for f in HISTORY_FIELDS])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def encode(chunks: Iterable[List[dict]], fmt: str) -> Iterator[bytes]:
+    return _csv_chunks(chunks) if fmt == "csv" else _ndjson_chunks(chunks)
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a byte stream on the fly into one gzip member. Each chunk is
+    sync-flushed, so everything handed in so far is on the wire (and a
+    truncated file still decompresses up to the last full chunk).
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def export_stream(
+    company_id: int,
+    fmt: str = "csv",
+    after_id: Optional[int] = None,
+    gzip: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """The export as encoded (and optionally gzipped) bytes."""
+    stream = encode(export_records(company_id, after_id, chunk_size), fmt)
+    return gzip_chunks(stream) if gzip else stream
+
+
+def filename(company_id: int, fmt: str, after_id: Optional[int], gzip: bool) -> str:
+    name = f"applications-company-{company_id}"
+    if after_id is not None:
+        name += f"-after-{after_id}"
+    return f"{name}.{fmt}" + (".gz" if gzip else "")
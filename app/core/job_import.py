@@ -0,0 +1,188 @@
+"""
+Bulk job import from CSV or NDJSON.
+
+Rows are read lazily, validated with the `JobCreate` schema IMPORT_BATCH_SIZE
+at a time, and each batch of valid rows is loaded in one round trip:
+`COPY jobs FROM STDIN` on PostgreSQL (psycopg2), a single executemany
+INSERT elsewhere. Invalid rows are reported and skipped; a batch the
+database rejects is retried row by row under savepoints so one bad row
+doesn't sink its neighbours. Each batch commits on its own.
+
+Core inserts bypass the ORM, so callers must invalidate the job search index
+and listing caches afterwards (the router and CLI do).
+"""
+import csv
+import io
+import json
+import logging
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.job import Job
+from app.schemas.job import JobCreate
+
+logger = logging.getLogger(__name__)
+
+
+FORMATS = ("csv", "ndjson")
+
+# Column order of the COPY / INSERT
+COLUMNS = ("title", "description", "status", "company_id")
+
+
+# ---------------------------------------------------------
+# 📥 Readers: (row number, dict or parse error)
+# ---------------------------------------------------------
+def _csv_rows(text: IO[str]) -> Iterator[Tuple[int, object]]:
+    for number, row in enumerate(csv.DictReader(text), start=1):
+        # Empty cells mean "not given", so schema defaults apply
+        yield number, {key: value for key, value in row.items() if key and value not in ("", None)}
+
+
+def _ndjson_rows(text: IO[str]) -> Iterator[Tuple[int, object]]:
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield number, ValueError(f"Invalid JSON: {exc}")
+            continue
+        yield number, row if isinstance(row, dict) else ValueError("Expected a JSON object")
+
+
+def read_rows(text: IO[str], fmt: str) -> Iterator[Tuple[int, object]]:
+    return _csv_rows(text) if fmt == "csv" else _ndjson_rows(text)
+
+
+def _batches(iterable: Iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# ---------------------------------------------------------
+# ✅ Validation
+# ---------------------------------------------------------
+def _error_messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+def validate_batch(rows, company_id: int):
+    """Split a batch into (valid insert dicts, [(row number, [messages])])."""
+    valid, errors = [], []
+    for number, row in rows:
+        if isinstance(row, Exception):
+            errors.append((number, [str(row)]))
+            continue
+
+        row = {"company_id": company_id, **row}
+        if isinstance(row.get("status"), str):
+            row["status"] = row["status"].strip().lower()
+        try:
+            job = JobCreate.model_validate(row)
+        except ValidationError as exc:
+            errors.append((number, _error_messages(exc)))
+            continue
+
+        if job.company_id != company_id:
+            errors.append((number, [f"company_id: not allowed to create jobs for company {job.company_id}"]))
+            continue
+
+        valid.append((number, {
+            "title": job.title,
+            "description": job.description or "",  # jobs.description is NOT NULL
+            "status": job.status,
+            "company_id": job.company_id,
+        }))
+    return valid, errors
+
+
+# ---------------------------------------------------------
+# 🚚 Loaders
+# ---------------------------------------------------------
+def supports_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _copy(db: Session, rows: List[dict]) -> None:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([row[column] for column in COLUMNS] for row in rows)
+    buffer.seek(0)
+
+    # Raw DBAPI connection of the session's transaction
+    raw = db.connection().connection.dbapi_connection
+    with raw.cursor() as cursor:
+        cursor.copy_expert(f"COPY jobs ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _load(db: Session, rows: List[dict]) -> None:
+    if supports_copy(db):
+        _copy(db, rows)
+    else:
+        db.execute(insert(Job), rows)
+
+
+def _load_row_by_row(db: Session, valid) -> List[Tuple[int, List[str]]]:
+    errors = []
+    for number, row in valid:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Job), [row])
+        except Exception as exc:  # constraint violations, bad encodings...
+            errors.append((number, [f"database: {str(exc).splitlines()[0][:300]}"]))
+    return errors
+
+
+def import_jobs(db: Session, text: IO[str], fmt: str, company_id: int,
+                batch_size: Optional[int] = None) -> dict:
+    """
+    Import every row of `text` for `company_id`. Returns a summary with
+    per-row errors (capped at IMPORT_MAX_ERRORS).
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    received = imported = failed = 0
+    errors, method = [], "copy" if supports_copy(db) else "executemany"
+
+    def report(batch_errors):
+        nonlocal failed
+        failed += len(batch_errors)
+        room = settings.IMPORT_MAX_ERRORS - len(errors)
+        errors.extend({"row": number, "errors": messages} for number, messages in batch_errors[:max(room, 0)])
+
+    for batch in _batches(read_rows(text, fmt), batch_size):
+        received += len(batch)
+        valid, batch_errors = validate_batch(batch, company_id)
+
+        if valid:
+            try:
+                _load(db, [row for _, row in valid])
+                db.commit()
+                imported += len(valid)
+            except Exception:
+                db.rollback()
+                logger.warning("Bulk load of %s job(s) failed; retrying row by row", len(valid), exc_info=True)
+                row_errors = _load_row_by_row(db, valid)
+                db.commit()
+                imported += len(valid) - len(row_errors)
+                batch_errors += row_errors
+
+        report(sorted(batch_errors))
+
+    return {
+        "received": received,
+        "imported": imported,
+        "failed": failed,
+        "method": method,
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
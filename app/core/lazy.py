@@ -0,0 +1,18 @@
+"""
+Optional heavy dependencies, imported on first use instead of at module
+import so API workers start faster (benchmarks/startup_benchmark.py keeps
+them out of `import app.main`).
+"""
+_numpy = None  # (module or None,) once looked up
+
+
+def numpy():
+    """numpy (vectorised scoring and bulk checks), or None when not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover
+            np = None
+        _numpy = (np,)
+    return _numpy[0]
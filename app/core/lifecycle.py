@@ -0,0 +1,194 @@
+"""
+Process lifecycle.
+
+- `check_schema` / `migrate`: run once by the production entrypoint
+  (app.server) before any worker starts; the schema is owned by Alembic,
+  workers never create tables.
+- `create_schema`: the seeders' shortcut, Base.metadata.create_all (plus
+  the PostgreSQL search column) then stamped at the migration head so the
+  schema check accepts the database.
+- `lifespan`: what every worker does around serving. Startup warms the
+  connection pool, the password-hashing processes and (on SQLite) the
+  search index, so the first requests don't pay for them. Shutdown runs
+  after uvicorn has drained in-flight requests and closes the hasher
+  processes, the listing-cache connection and the database engines.
+"""
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal, async_engine, engine
+
+logger = logging.getLogger(__name__)
+
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+# ---------------------------------------------------------
+# 🧱 Schema (Alembic)
+# ---------------------------------------------------------
+def alembic_config():
+    from alembic.config import Config  # only the entrypoint needs Alembic
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False  # keep the server's logging setup
+    # The app's database, not the URL in alembic.ini ("%" is configparser syntax)
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+    return config
+
+
+def schema_revisions() -> Tuple[Set[str], Set[str]]:
+    """(revisions the database is at, head revisions in alembic/versions)."""
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return current, heads
+
+
+def check_schema(mode: Optional[str] = None) -> bool:
+    """
+    Compare the database's Alembic revision with the migration heads. A
+    mismatch raises RuntimeError in "strict" mode and is logged in "warn".
+    """
+    mode = mode or settings.SCHEMA_CHECK
+    if mode == "off":
+        return True
+
+    current, heads = schema_revisions()
+    if current == heads:
+        logger.info("Database schema is at %s", ", ".join(sorted(heads)))
+        return True
+
+    message = (
+        f"Database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+        f"migrations are at {', '.join(sorted(heads))}: run `alembic upgrade head` "
+        f"(or start the server with --migrate)"
+    )
+    if mode == "strict":
+        raise RuntimeError(message)
+    logger.warning(message)
+    return False
+
+
+def migrate() -> None:
+    """alembic upgrade head, against DATABASE_URL."""
+    from alembic import command
+
+    command.upgrade(alembic_config(), "head")
+
+
+def create_schema(bind) -> None:
+    """
+    Create the tables from the models on `bind` (an engine) and record the
+    migration head, as `alembic stamp head` would. On PostgreSQL it also adds
+    the objects only the migrations create (jobs.search_vector and its GIN
+    index), so the result matches `alembic upgrade head`.
+    """
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    import app.models  # noqa: F401  (registers the tables)
+    from app.core.search import create_search_vector
+    from app.database import Base
+
+    script = ScriptDirectory.from_config(alembic_config())
+    with bind.begin() as connection:
+        Base.metadata.create_all(connection)
+        if connection.dialect.name == "postgresql":
+            create_search_vector(connection)
+        MigrationContext.configure(connection).stamp(script, "head")
+
+
+# ---------------------------------------------------------
+# 🔥 Worker startup / shutdown
+# ---------------------------------------------------------
+def _warm_sync_pool(size: int) -> None:
+    connections = []
+    try:
+        for _ in range(size):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in connections:
+            connection.close()  # back to the pool, still open
+
+
+async def _warm_async_pool(size: int) -> None:
+    connections = []
+    try:
+        for _ in range(size):
+            connection = await async_engine.connect()
+            connections.append(connection)
+            await connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in connections:
+            await connection.close()
+
+
+def _build_search_index() -> None:
+    from app.core.search import search_index
+
+    db = SessionLocal()
+    try:
+        search_index.ensure_built(db)
+    finally:
+        db.close()
+
+
+async def warm_up() -> None:
+    from app.core.passwords import password_hasher
+
+    pooled = not settings.DB_PGBOUNCER and engine.dialect.name != "sqlite"
+    size = min(settings.DB_POOL_WARM_CONNECTIONS, settings.DB_POOL_SIZE)
+    if pooled and size > 0:
+        if async_engine is not None:
+            await _warm_async_pool(size)
+        else:
+            await run_in_threadpool(_warm_sync_pool, size)
+
+    if engine.dialect.name != "postgresql":
+        # PostgreSQL searches its GIN index; elsewhere the in-process index
+        # would otherwise be built by the first search request
+        await run_in_threadpool(_build_search_index)
+
+    # Starts the hashing processes (spawned lazily otherwise, on the first login)
+    await password_hasher.hash("warm-up")
+
+
+async def shutdown() -> None:
+    from app.core import listing_cache
+    from app.core.passwords import password_hasher
+
+    await run_in_threadpool(password_hasher.shutdown)
+    try:
+        await listing_cache.close()
+    except Exception:
+        logger.warning("Closing the listing cache failed", exc_info=True)
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    if settings.WARM_UP:
+        try:
+            await warm_up()
+        except Exception:
+            # A cold start is slower, not broken: serve anyway
+            logger.warning("Warm-up failed", exc_info=True)
+    app.state.ready = True
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        await shutdown()
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+# Namespaces: every cached key lives in one, and a write bumps the namespace
+# generation instead of hunting down individual keys
+JOBS = "jobs"
+COMPANIES = "companies"
+
+
+# ---------------------------------------------------------
+# 🗄️ Backends
+# ---------------------------------------------------------
+class MemoryBackend:
+    """Per-process LRU; invalidation is local, so other workers rely on the TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generations: Dict[str, int] = {}
+
+    async def generation(self, namespace: str) -> int:
+        return self.generations.get(namespace, 0)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self.entries.get(key)
+
+    async def set(self, key: str, entry: dict) -> None:
+        self.entries.set(key, entry)
+
+    async def invalidate(self, namespace: str) -> None:
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+
+    def stats(self) -> dict:
+        return self.entries.stats()
+
+
+class RedisBackend:
+    """Shared across workers: invalidation from any process is seen by all."""
+
+    def __init__(self, url: str, ttl: int):
+        import redis.asyncio as redis  # optional: installed with celery[redis]
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = "listing-cache:"
+
+    async def generation(self, namespace: str) -> int:
+        return int(await self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self.client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, entry: dict) -> None:
+        await self.client.set(self.prefix + key, json.dumps(entry), ex=self.ttl)
+
+    async def invalidate(self, namespace: str) -> None:
+        await self.client.incr(f"{self.prefix}gen:{namespace}")
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {}
+
+
+def _build_backend():
+    if settings.LISTING_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.LISTING_CACHE_REDIS_URL, settings.LISTING_CACHE_TTL_SECONDS)
+    if settings.LISTING_CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.LISTING_CACHE_SIZE, settings.LISTING_CACHE_TTL_SECONDS)
+    return None  # "none": ETags still work, nothing is stored
+
+
+backend = _build_backend()
+
+
+# ---------------------------------------------------------
+# 🔁 Read-through + ETag
+# ---------------------------------------------------------
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+def _respond(request: Request, entry: dict) -> Response:
+    headers = {**entry["headers"], "ETag": entry["etag"], "Cache-Control": "no-cache"}
+    if _not_modified(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+
+async def cached(
+    request: Request,
+    namespace: str,
+    produce: Callable[[], Awaitable[Tuple[object, Dict[str, str]]]],
+) -> Response:
+    """
+    Serve a JSON listing from the cache, keyed by namespace generation, path
+    and query string. On a miss `produce()` returns (data, extra headers).
+    Clients sending a matching If-None-Match get 304 without a body.
+    """
+    key = None
+    if backend is not None:
+        try:
+            generation = await backend.generation(namespace)
+            query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+            key = f"{namespace}:{generation}:{request.url.path}?{query}"
+            entry = await backend.get(key)
+            if entry is not None:
+                return _respond(request, entry)
+        except Exception:
+            logger.warning("Listing cache read failed; serving from the database", exc_info=True)
+            key = None
+
+    data, headers = await produce()
+    body = json.dumps(jsonable_encoder(data), separators=(",", ":")).encode()
+    entry = {"body": body.decode(), "etag": _etag(body), "headers": headers}
+
+    if key is not None:
+        try:
+            await backend.set(key, entry)
+        except Exception:
+            logger.warning("Listing cache write failed", exc_info=True)
+
+    return _respond(request, entry)
+
+
+async def invalidate(*namespaces: str) -> None:
+    """Call after a write commits; the next read of each namespace misses."""
+    if backend is None:
+        return
+    for namespace in namespaces:
+        try:
+            await backend.invalidate(namespace)
+        except Exception:
+            logger.warning("Listing cache invalidation failed for %s", namespace, exc_info=True)
+
+
+def cache_stats() -> dict:
+    return backend.stats() if backend is not None else {}
+
+
+async def close() -> None:
+    """Release the backend's connections (worker shutdown)."""
+    if backend is not None and hasattr(backend, "close"):
+        await backend.close()
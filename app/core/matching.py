@@ -0,0 +1,203 @@
+"""
+Applicant ranking: BM25 of each applicant's profile against the job.
+
+The job's title and description (title terms weighted up, as in search)
+form the query; applicants' `User.profile` texts are the documents. Each job
+keeps an in-process inverted index over its applicants: term ->
+(applicant positions, term frequencies), plus document lengths. It is built
+on first use and caught up incrementally by application id, so applications
+made through any worker are indexed on the next ranking request; only new
+rows are read. Profile edits drop the affected indexes in this process
+(other workers rebuild after MATCH_INDEX_TTL_SECONDS).
+
+Scoring is one vectorised pass per query term (a fancy-indexed add into a
+score array) and the top k are picked with `argpartition`, without sorting every
+applicant. Without numpy the same runs on dicts with `heapq.nlargest`.
+"""
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.lazy import numpy
+from app.core.search import DESCRIPTION_WEIGHT, TITLE_WEIGHT, tokenize
+from app.models.application import Application
+from app.models.user import User
+
+
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+
+def job_vector(title: Optional[str], description: Optional[str]) -> Dict[str, float]:
+    """Sparse term vector of a job, title terms weighted like search ranking."""
+    vector = Counter()
+    for term in tokenize(title):
+        vector[term] += TITLE_WEIGHT
+    for term in tokenize(description):
+        vector[term] += DESCRIPTION_WEIGHT
+    return dict(vector)
+
+
+def text_vector(text: Optional[str]) -> Dict[str, int]:
+    return dict(Counter(tokenize(text)))
+
+
+class ApplicantIndex:
+    """Inverted index over one job's applicants, appended to by application id."""
+
+    def __init__(self):
+        self.application_ids: List[int] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+        self.last_application_id = 0
+        self._arrays = None  # numpy views, rebuilt after appends
+        self._lock = threading.Lock()
+
+    def add(self, application_id: int, profile: Optional[str]) -> None:
+        position = len(self.application_ids)
+        terms = text_vector(profile)
+        self.application_ids.append(application_id)
+        self.lengths.append(sum(terms.values()))
+        for term, tf in terms.items():
+            positions, tfs = self.postings[term]
+            positions.append(position)
+            tfs.append(tf)
+        self.last_application_id = max(self.last_application_id, application_id)
+        self._arrays = None
+
+    def catch_up(self, db: Session, job_id: int) -> None:
+        """Index applications newer than the last one seen (one query, new rows only)."""
+        with self._lock:
+            rows = (
+                db.query(Application.id, User.profile)
+                .join(User, User.id == Application.candidate_id)
+                .filter(Application.job_id == job_id, Application.id > self.last_application_id)
+                .order_by(Application.id)
+            )
+            for application_id, profile in rows:
+                self.add(application_id, profile)
+
+    def __len__(self) -> int:
+        return len(self.application_ids)
+
+    # --- scoring --------------------------------------------------------
+    def _idf(self, df: int) -> float:
+        n = len(self.application_ids)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _numpy_arrays(self):
+        if self._arrays is None:
+            np = numpy()
+            postings = {
+                term: (np.asarray(positions, dtype=np.int32), np.asarray(tfs, dtype=np.float32))
+                for term, (positions, tfs) in self.postings.items()
+            }
+            self._arrays = (np.asarray(self.lengths, dtype=np.float32), postings)
+        return self._arrays
+
+    def scores(self, query: Dict[str, float], mask=None):
+        """BM25 score of every applicant (array, or dict position -> score)."""
+        n = len(self.application_ids)
+        np = numpy()
+        if not n:
+            return np.zeros(0, dtype=np.float32) if np is not None else {}
+        avgdl = (sum(self.lengths) / n) or 1.0
+
+        if np is not None:
+            lengths, postings = self._numpy_arrays()
+            norm = K1 * (1 - B + B * lengths / avgdl)
+            scores = np.zeros(n, dtype=np.float32)
+            for term, weight in query.items():
+                posting = postings.get(term)
+                if posting is None:
+                    continue
+                positions, tfs = posting
+                contribution = weight * self._idf(len(positions)) * tfs * (K1 + 1) / (tfs + norm[positions])
+                # a posting lists each applicant once, so plain fancy-index add is safe
+                scores[positions] += contribution
+            return scores
+
+        scores = defaultdict(float)
+        for term, weight in query.items():
+            positions, tfs = self.postings.get(term, ((), ()))
+            if not positions:
+                continue
+            idf = self._idf(len(positions))
+            for position, tf in zip(positions, tfs):
+                norm = K1 * (1 - B + B * self.lengths[position] / avgdl)
+                scores[position] += weight * idf * tf * (K1 + 1) / (tf + norm)
+        return scores
+
+    def top(self, query: Dict[str, float], k: int, allowed: Optional[Iterable[int]] = None) -> List[Tuple[int, float]]:
+        """
+        Best `k` applicants as [(application_id, score)], best first; ties go
+        to the earlier application. `allowed` restricts to those application ids.
+        """
+        with self._lock:
+            scores = self.scores(query)
+            ids = self.application_ids
+
+            np = numpy()
+            if np is not None:
+                if allowed is not None:
+                    keep = np.zeros(len(ids), dtype=bool)
+                    positions = {application_id: i for i, application_id in enumerate(ids)}
+                    keep[[positions[a] for a in allowed if a in positions]] = True
+                    scores = np.where(keep, scores, -np.inf)
+                    k = min(k, int(keep.sum()))
+                k = min(k, len(scores))
+                if k <= 0:
+                    return []
+                # O(n) selection of the k best, then sort only those
+                candidates = np.argpartition(-scores, k - 1)[:k]
+                best = sorted(candidates.tolist(), key=lambda p: (-scores[p], p))
+                return [(ids[p], round(float(scores[p]), 4)) for p in best]
+
+            allowed = None if allowed is None else set(allowed)
+            positions = (p for p in range(len(ids)) if allowed is None or ids[p] in allowed)
+            best = heapq.nsmallest(k, positions, key=lambda p: (-scores.get(p, 0.0), p))
+            return [(ids[p], round(scores.get(p, 0.0), 4)) for p in best]
+
+
+applicant_indexes = TTLCache(
+    maxsize=settings.MATCH_INDEX_CACHE_SIZE,
+    ttl=settings.MATCH_INDEX_TTL_SECONDS,
+)
+_indexes_lock = threading.Lock()
+
+
+def applicant_index(db: Session, job_id: int) -> ApplicantIndex:
+    """The job's applicant index, created or caught up to the latest application."""
+    with _indexes_lock:
+        index = applicant_indexes.get(job_id)
+        if index is None:
+            index = ApplicantIndex()
+            applicant_indexes.set(job_id, index)
+    index.catch_up(db, job_id)
+    return index
+
+
+def forget_jobs(job_ids: Sequence[int]) -> None:
+    """Drop indexes whose applicant texts changed (e.g. a profile edit)."""
+    for job_id in job_ids:
+        applicant_indexes.invalidate(job_id)
+
+
+def rank_applicants(db: Session, job, k: int, stage: Optional[str] = None) -> List[Tuple[int, float]]:
+    """Top `k` applications of `job` (optionally in `stage`) by profile match."""
+    index = applicant_index(db, job.id)
+    allowed = None
+    if stage is not None:
+        allowed = [
+            application_id for (application_id,) in
+            db.query(Application.id).filter(Application.job_id == job.id, Application.stage == stage)
+        ]
+    return index.top(job_vector(job.title, job.description), k, allowed)
@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+
+from app.models.outbox import OutboxMessage
+
+
+# Celery task names, so request code never has to import the Celery stack
+SEND_STAGE_CHANGE_EMAIL = "app.tasks.email_tasks.send_stage_change_email"
+SEND_STAGE_CHANGE_EMAILS = "app.tasks.email_tasks.send_stage_change_emails"
+NOTIFY_RECRUITERS_NEW_APPLICATION = "app.tasks.email_tasks.notify_recruiters_new_application"
+REFRESH_CANDIDATE_RECOMMENDATIONS = "app.tasks.recommendation_tasks.refresh_candidate_recommendations"
+ADD_NEW_JOBS_TO_RECOMMENDATIONS = "app.tasks.recommendation_tasks.add_new_jobs_to_recommendations"
+
+
+def enqueue(db: Session, task: str, *args) -> None:
+    """
+    Stage a Celery task in the outbox. It is only published once the caller's
+    transaction commits, and is never lost if the broker is unavailable.
+    """
+    db.add(OutboxMessage(task=task, payload={"args": list(args)}))
@@ -0,0 +1,137 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable, Iterator, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, inspect, tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.config import settings
+from app.database import SessionLocal
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+# ---------------------------------------------------------
+# 🔖 Opaque cursors
+# ---------------------------------------------------------
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: Sequence) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) else v
+            for col, v in zip(order_by, values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(query: Query, order_by: Sequence, values: Optional[list], descending: bool) -> Query:
+    if values is not None:
+        if len(order_by) == 1:
+            key, bound = order_by[0], values[0]
+        else:
+            key, bound = tuple_(*order_by), tuple_(*values)
+        query = query.filter(key < bound if descending else key > bound)
+
+    return query.order_by(*[c.desc() if descending else c.asc() for c in order_by])
+
+
+# ---------------------------------------------------------
+# 📄 Keyset pages
+# ---------------------------------------------------------
+def keyset_page(
+    query: Query,
+    order_by: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+):
+    """
+    Return one page of `query` ordered by `order_by` plus the cursor for the
+    next page (None on the last page). One extra row is fetched to detect
+    whether another page exists, so no COUNT(*) is needed.
+    """
+    values = decode_cursor(cursor, order_by) if cursor else None
+    rows = _after(query, order_by, values, descending).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], c.key) for c in order_by])
+
+    return rows, next_cursor
+
+
+# ---------------------------------------------------------
+# 🌊 NDJSON streaming
+# ---------------------------------------------------------
+def row_to_dict(obj) -> dict:
+    if hasattr(obj, "_asdict"):  # column projection (Row)
+        return obj._asdict()
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def ndjson_stream(
+    build_query: Callable[[Session], Query],
+    order_by: Sequence,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    chunk_size: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Yield every row matched by `build_query` as newline-delimited JSON.
+
+    Rows (ORM objects or column projections) are fetched with `yield_per`, so
+    only one chunk is alive at a time. The generator owns its session because it outlives the
+    request-scoped one from `get_db`.
+
+    The cursor is decoded here, before the caller builds its StreamingResponse:
+    once the response has started, an invalid cursor can no longer become a 400.
+    """
+    values = decode_cursor(cursor, order_by) if cursor else None
+    return _ndjson_lines(build_query, order_by, values, descending, chunk_size or settings.STREAM_CHUNK_SIZE)
+
+
+def _ndjson_lines(
+    build_query: Callable[[Session], Query],
+    order_by: Sequence,
+    values: Optional[list],
+    descending: bool,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    db = SessionLocal()
+    try:
+        query = _after(build_query(db), order_by, values, descending)
+        lines = []
+        for obj in query.yield_per(chunk_size):
+            lines.append(json.dumps(row_to_dict(obj), default=_json_default))
+            if len(lines) >= chunk_size:
+                yield ("\n".join(lines) + "\n").encode()
+                lines.clear()
+                db.expunge_all()
+        if lines:
+            yield ("\n".join(lines) + "\n").encode()
+    finally:
+        db.close()
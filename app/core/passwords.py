@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+
+def build_crypt_context(rounds: int) -> "CryptContext":
+    # passlib is imported here, not at module level: API processes only hash in
+    # the pool processes, so they never need it
+    from passlib.context import CryptContext
+
+    # min == max == default: any hash made with a different cost "needs update",
+    # which drives rehash-on-login when BCRYPT_ROUNDS changes.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+# Single crypt context for synchronous callers (CLIs, seeding, Celery tasks),
+# built on first use
+_pwd_context: Optional["CryptContext"] = None
+
+
+def pwd_context() -> "CryptContext":
+    global _pwd_context
+    if _pwd_context is None:
+        _pwd_context = build_crypt_context(settings.BCRYPT_ROUNDS)
+    return _pwd_context
+
+
+# ---------------------------------------------------------
+# ⚙️ Worker-process side
+# ---------------------------------------------------------
+_worker_context: Optional["CryptContext"] = None
+
+
+def _init_worker(rounds: int) -> None:
+    global _worker_context
+    _worker_context = build_crypt_context(rounds)
+
+
+def _hash(password: str) -> str:
+    return _worker_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    return _worker_context.verify_and_update(password, hashed)
+
+
+# ---------------------------------------------------------
+# 🔐 Request side
+# ---------------------------------------------------------
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so hashing uses every core and
+    never occupies the request threadpool or event loop.
+
+    At most `max_pending` operations may be queued or running; beyond that
+    callers get 503 instead of piling up behind a login burst. A pool whose
+    process died (OOM kill, crash) is unusable from then on, so it is
+    replaced and the operation retried once before answering 503.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # spawn: forking a process that already runs an event loop and
+                # threads is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.rounds,),
+            )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        try:
+            for attempt in (1, 2):
+                executor = self.executor
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+                except BrokenProcessPool:
+                    logger.warning("Password hashing pool is broken, starting a new one (attempt %d)", attempt)
+                    self._discard(executor)
+        finally:
+            self.pending -= 1
+
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Password hashing is unavailable, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        # Concurrent callers see the same broken pool: only the first replaces it
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored cost is outdated."""
+        return await self._run(_verify_and_update, password, hashed)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.BCRYPT_ROUNDS,
+)
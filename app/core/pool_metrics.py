@@ -0,0 +1,141 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core import request_metrics
+
+
+# Upper bounds (seconds) of the pool wait-time histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """Connection pool counters and wait-time histogram for one engine."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.checked_out = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # last bucket is +Inf
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = {
+                "checked_out": self.checked_out,
+                "checkouts_total": self.checkouts,
+                "connects_total": self.connects,
+                "invalidations_total": self.invalidations,
+                "timeouts_total": self.timeouts,
+                "wait_seconds_count": self.wait_count,
+                "wait_seconds_sum": round(self.wait_sum, 6),
+                "wait_seconds_buckets": {
+                    str(bound): count
+                    for bound, count in zip(WAIT_BUCKETS + ("+Inf",), _cumulative(self.wait_buckets))
+                },
+            }
+        if isinstance(self.pool, QueuePool):
+            data["size"] = self.pool.size()
+            data["overflow"] = max(self.pool.overflow(), 0)
+            data["idle"] = self.pool.checkedin()
+        return data
+
+
+def _cumulative(counts):
+    total = 0
+    for count in counts:
+        total += count
+        yield total
+
+
+registry: "dict[str, PoolMetrics]" = {}
+
+
+class _TimedGetMixin:
+    """Times how long callers wait for a connection (queue wait + connect)."""
+
+    _metrics: PoolMetrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            waited = time.perf_counter() - start
+            request_metrics.add_pool_wait(waited)
+            if self._metrics:
+                self._metrics.observe_wait(waited, timed_out=True)
+            raise
+        waited = time.perf_counter() - start
+        request_metrics.add_pool_wait(waited)
+        if self._metrics:
+            self._metrics.observe_wait(waited)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting into the same metrics
+        pool = super().recreate()
+        pool._metrics = self._metrics
+        if self._metrics:
+            self._metrics.pool = pool
+        return pool
+
+
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine, name: str) -> PoolMetrics:
+    """Attach pool event listeners to `engine` (sync engine) and register its metrics."""
+    metrics = registry[name] = PoolMetrics(name)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, _TimedGetMixin):
+        engine.pool._metrics = metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, record):
+        with metrics._lock:
+            metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_conn, record, proxy):
+        with metrics._lock:
+            metrics.checkouts += 1
+            metrics.checked_out += 1
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_conn, record):
+        with metrics._lock:
+            metrics.checked_out -= 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_conn, record, exception):
+        with metrics._lock:
+            metrics.invalidations += 1
+
+    return metrics
+
+
+def snapshot() -> dict:
+    return {name: metrics.snapshot() for name, metrics in registry.items()}
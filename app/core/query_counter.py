@@ -0,0 +1,53 @@
+"""
+Query counting for N+1 checks.
+
+    from app.core.query_counter import assert_num_queries
+
+    with assert_num_queries(1):
+        client.get("/applications/my", headers=headers)
+
+Counts every statement executed on any engine (sync or async) while the
+block runs, including work done on threadpool threads, so use it where no
+other traffic hits the database (tests, scripts).
+"""
+import threading
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    counter = QueryCounter()
+    event.listen(Engine, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(Engine, "before_cursor_execute", counter._on_execute)
+
+
+@contextmanager
+def assert_num_queries(expected: int):
+    """Fail unless exactly `expected` statements run inside the block."""
+    with count_queries() as counter:
+        yield counter
+
+    if counter.count != expected:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(counter.statements, 1))
+        raise AssertionError(f"Expected {expected} queries, got {counter.count}:\n{listing}")
@@ -1,16 +1,36 @@
 from fastapi import Depends, HTTPException
-from app.core.security import get_current_user
+from app.core.security import get_current_principal, get_current_user, Principal
 from app.models.user import User
 
 
 def require_role(*allowed_roles: str):
     """
     Dependency to ensure the logged-in user has the required role.
+    Resolves to a `Principal` built from the token, without loading the user.
     Example:
         Depends(require_role("candidate"))
         Depends(require_role("recruiter", "hiring_manager"))
     """
 
+    def role_checker(current_user: Principal = Depends(get_current_principal)) -> Principal:
+
+        if current_user.role not in allowed_roles:
+            raise HTTPException(
+                status_code=403,
+                detail=f"Access denied. Required roles: {allowed_roles}"
+            )
+
+        return current_user
+
+    return role_checker
+
+
+def require_user_role(*allowed_roles: str):
+    """
+    Same as `require_role`, but resolves to the full `User` row for endpoints
+    that need to read or modify it.
+    """
+
     def role_checker(current_user: User = Depends(get_current_user)) -> User:
 
         if current_user.role not in allowed_roles:
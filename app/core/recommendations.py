@@ -0,0 +1,327 @@
+"""
+Job recommendations for candidates.
+
+A candidate's interests are the term vectors of the jobs they applied to
+(title-weighted, as in search and applicant ranking) plus their profile
+text; open jobs are ranked by cosine similarity to that sum. Vectors are
+L2-normalised but not IDF-weighted, so a job's score does not depend on the
+rest of the corpus: the full batch refresh and the incremental refresh for
+newly posted jobs give the same numbers and their results can be merged.
+
+The best RECOMMENDATIONS_TOP_N (job id, score) pairs per candidate are
+stored as one JSON row in `job_recommendations` by the Celery tasks in
+app.tasks.recommendation_tasks. GET /jobs/recommended reads that row by
+primary key, drops jobs closed or applied to since, and caches the feed per
+candidate for RECOMMENDATIONS_CACHE_TTL_SECONDS.
+"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.lazy import numpy
+from app.core.matching import job_vector, text_vector
+from app.database import dialect_insert
+from app.models.application import Application
+from app.models.job import Job
+from app.models.job_recommendation import JobRecommendation
+from app.models.user import User
+
+
+recommendations_cache = TTLCache(
+    maxsize=settings.RECOMMENDATIONS_CACHE_SIZE,
+    ttl=settings.RECOMMENDATIONS_CACHE_TTL_SECONDS,
+)
+
+# Worker-side: the open-job corpus, reused by per-candidate refreshes while
+# the set of open jobs is unchanged (keyed by newest open id and count)
+_corpus_cache = TTLCache(maxsize=2, ttl=600)
+
+
+def normalized(vector: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {term: weight / norm for term, weight in vector.items()} if norm else {}
+
+
+# ---------------------------------------------------------
+# 🧮 Scoring
+# ---------------------------------------------------------
+class JobCorpus:
+    """Inverted index over the normalised vectors of a set of jobs."""
+
+    def __init__(self, rows: Sequence[Tuple[int, str, str]]):
+        self.job_ids: List[int] = []
+        postings = defaultdict(lambda: ([], []))
+        for position, (job_id, title, description) in enumerate(rows):
+            self.job_ids.append(job_id)
+            for term, weight in normalized(job_vector(title, description)).items():
+                positions, weights = postings[term]
+                positions.append(position)
+                weights.append(weight)
+
+        np = numpy()
+        if np is not None:
+            self._ids = np.asarray(self.job_ids, dtype=np.int64)
+            self.postings = {
+                term: (np.asarray(positions, dtype=np.int32), np.asarray(weights, dtype=np.float32))
+                for term, (positions, weights) in postings.items()
+            }
+        else:
+            self.postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def top(self, vector: Dict[str, float], n: int, exclude: Set[int] = frozenset(),
+            after_id: int = 0) -> List[Tuple[int, float]]:
+        """
+        Best `n` jobs as [(job_id, cosine)], best first (newer jobs win ties),
+        skipping `exclude` and jobs with id <= `after_id`. Zero scores are dropped.
+        """
+        if n <= 0 or not self.job_ids:
+            return []
+
+        np = numpy()
+        if np is not None:
+            scores = np.zeros(len(self.job_ids), dtype=np.float32)
+            for term, weight in vector.items():
+                posting = self.postings.get(term)
+                if posting is not None:
+                    positions, weights = posting
+                    scores[positions] += weight * weights  # each job once per posting
+            if exclude:
+                scores[np.isin(self._ids, list(exclude))] = 0
+            if after_id:
+                scores[self._ids <= after_id] = 0
+            matched = np.flatnonzero(scores > 0)
+            if matched.size > n:
+                matched = matched[np.argpartition(-scores[matched], n - 1)[:n]]
+            best = sorted(matched.tolist(), key=lambda p: (-scores[p], -p))
+            return [(self.job_ids[p], round(float(scores[p]), 4)) for p in best]
+
+        scores = defaultdict(float)
+        for term, weight in vector.items():
+            positions, weights = self.postings.get(term, ((), ()))
+            for position, job_weight in zip(positions, weights):
+                scores[position] += weight * job_weight
+        best = heapq.nsmallest(n, (
+            (-score, -position) for position, score in scores.items()
+            if score > 0 and self.job_ids[position] > after_id and self.job_ids[position] not in exclude
+        ))
+        return [(self.job_ids[-p], round(-s, 4)) for s, p in best]
+
+
+def candidate_vectors(db: Session, candidate_ids: Sequence[int]) -> Dict[int, Tuple[Dict[str, float], Set[int]]]:
+    """
+    Normalised interest vector and applied job ids of each candidate (two
+    queries for the whole batch). Each applied job and the profile count once.
+    """
+    applied, jobs = defaultdict(set), {}
+    rows = (
+        db.query(Application.candidate_id, Job.id, Job.title, Job.description)
+        .join(Job, Job.id == Application.job_id)
+        .filter(Application.candidate_id.in_(candidate_ids))
+    )
+    for candidate_id, job_id, title, description in rows:
+        applied[candidate_id].add(job_id)
+        if job_id not in jobs:
+            jobs[job_id] = normalized(job_vector(title, description))
+
+    profiles = dict(db.query(User.id, User.profile).filter(User.id.in_(candidate_ids)).all())
+
+    vectors = {}
+    for candidate_id in candidate_ids:
+        interest = defaultdict(float)
+        for job_id in applied[candidate_id]:
+            for term, weight in jobs[job_id].items():
+                interest[term] += weight
+        for term, weight in normalized(text_vector(profiles.get(candidate_id))).items():
+            interest[term] += weight
+        vectors[candidate_id] = (normalized(interest), applied[candidate_id])
+    return vectors
+
+
+# ---------------------------------------------------------
+# 🔁 Batch and incremental refresh (Celery)
+# ---------------------------------------------------------
+def _open_jobs(db: Session, after_id: int = 0) -> List[Tuple[int, str, str]]:
+    return (
+        db.query(Job.id, Job.title, Job.description)
+        .filter(Job.status == "open", Job.id > after_id)
+        .order_by(Job.id)
+        .all()
+    )
+
+
+def _open_corpus(db: Session) -> Tuple["JobCorpus", int]:
+    """Corpus of every open job and the newest id in it."""
+    key = tuple(db.query(func.max(Job.id), func.count(Job.id)).filter(Job.status == "open").one())
+    cached = _corpus_cache.get(key)
+    if cached is None:
+        jobs = _open_jobs(db)
+        cached = (JobCorpus(jobs), jobs[-1][0] if jobs else 0)
+        _corpus_cache.set(key, cached)
+    return cached
+
+
+def _active_candidates(db: Session, batch_size: int) -> Iterator[List[int]]:
+    """Candidates with a profile or a recent application, in id batches."""
+    since = datetime.utcnow() - timedelta(days=settings.RECOMMENDATIONS_ACTIVE_DAYS)
+    recent = db.query(Application.candidate_id).filter(Application.created_at >= since)
+    after = 0
+    while True:
+        batch = [
+            candidate_id for (candidate_id,) in
+            db.query(User.id)
+            .filter(
+                User.role == "candidate",
+                User.id > after,
+                or_(User.profile.isnot(None), User.id.in_(recent)),
+            )
+            .order_by(User.id)
+            .limit(batch_size)
+        ]
+        if not batch:
+            return
+        yield batch
+        after = batch[-1]
+
+
+def _store(db: Session, feeds: Dict[int, List[Tuple[int, float]]], last_job_id: int) -> None:
+    now = datetime.utcnow()
+    rows = [
+        {"candidate_id": candidate_id, "feed": [list(item) for item in feed],
+         "last_job_id": last_job_id, "computed_at": now}
+        for candidate_id, feed in sorted(feeds.items())
+    ]
+    if not rows:
+        return
+    insert = dialect_insert(db, JobRecommendation)
+    db.execute(
+        insert.on_conflict_do_update(
+            index_elements=["candidate_id"],
+            set_={column: insert.excluded[column] for column in ("feed", "last_job_id", "computed_at")},
+        ),
+        rows,
+    )
+
+
+def refresh(db: Session, candidate_ids: Optional[Sequence[int]] = None,
+            batch_size: Optional[int] = None) -> int:
+    """
+    Recompute the feeds of `candidate_ids` (default: every active candidate)
+    against all open jobs, committing per batch. Returns the number of feeds.
+    """
+    batch_size = batch_size or settings.RECOMMENDATIONS_BATCH_SIZE
+    corpus, last_job_id = _open_corpus(db)
+
+    if candidate_ids is None:
+        batches = _active_candidates(db, batch_size)
+    else:
+        ids = sorted(set(candidate_ids))
+        batches = (ids[i:i + batch_size] for i in range(0, len(ids), batch_size))
+
+    refreshed = 0
+    for batch in batches:
+        feeds = {
+            candidate_id: corpus.top(vector, settings.RECOMMENDATIONS_TOP_N, applied)
+            for candidate_id, (vector, applied) in candidate_vectors(db, batch).items()
+        }
+        _store(db, feeds, last_job_id)
+        db.commit()
+        refreshed += len(feeds)
+    return refreshed
+
+
+def add_new_jobs(db: Session, batch_size: Optional[int] = None) -> int:
+    """
+    Merge open jobs posted after each stored feed was computed into it,
+    scoring only those jobs. Returns the number of feeds updated.
+    """
+    batch_size = batch_size or settings.RECOMMENDATIONS_BATCH_SIZE
+    watermark = db.query(func.min(JobRecommendation.last_job_id)).scalar()
+    if watermark is None:
+        return 0
+    jobs = _open_jobs(db, after_id=watermark)
+    if not jobs:
+        return 0
+    corpus = JobCorpus(jobs)
+    newest = jobs[-1][0]
+
+    updated, after = 0, 0
+    while True:
+        stored = (
+            db.query(JobRecommendation.candidate_id, JobRecommendation.feed, JobRecommendation.last_job_id)
+            .filter(JobRecommendation.candidate_id > after, JobRecommendation.last_job_id < newest)
+            .order_by(JobRecommendation.candidate_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not stored:
+            return updated
+        after = stored[-1].candidate_id
+
+        vectors = candidate_vectors(db, [row.candidate_id for row in stored])
+        feeds = {}
+        for candidate_id, feed, last_job_id in stored:
+            vector, applied = vectors[candidate_id]
+            merged = {job_id: score for job_id, score in feed}
+            merged.update(corpus.top(vector, settings.RECOMMENDATIONS_TOP_N, applied, after_id=last_job_id))
+            feeds[candidate_id] = sorted(merged.items(), key=lambda item: (-item[1], -item[0]))[
+                :settings.RECOMMENDATIONS_TOP_N
+            ]
+        _store(db, feeds, newest)
+        db.commit()
+        updated += len(feeds)
+
+
+# ---------------------------------------------------------
+# 📬 Serving
+# ---------------------------------------------------------
+FEED_FIELDS = ("id", "title", "description", "status", "company_id")
+
+
+def feed(db: Session, candidate_id: int) -> Optional[List[dict]]:
+    """
+    The candidate's stored feed as job dicts with a `score`, best first,
+    without jobs closed or applied to since it was computed. None when it
+    has not been computed yet. Cached per candidate.
+    """
+    cached = recommendations_cache.get(candidate_id)
+    if cached is not None:
+        return cached
+
+    row = db.query(JobRecommendation.feed).filter(JobRecommendation.candidate_id == candidate_id).first()
+    if row is None:
+        return None
+
+    scores = {job_id: score for job_id, score in row.feed}
+    jobs = []
+    if scores:
+        jobs = (
+            db.query(*[getattr(Job, field) for field in FEED_FIELDS])
+            .outerjoin(Application, and_(Application.job_id == Job.id, Application.candidate_id == candidate_id))
+            .filter(Job.id.in_(list(scores)), Job.status == "open", Application.id.is_(None))
+            .all()
+        )
+    result = sorted(
+        ({**job._asdict(), "score": scores[job.id]} for job in jobs),
+        key=lambda job: (-job["score"], -job["id"]),
+    )
+    recommendations_cache.set(candidate_id, result)
+    return result
+
+
+def remember_pending(candidate_id: int) -> None:
+    """Serve an empty feed (without re-enqueueing) until the first refresh lands."""
+    recommendations_cache.set(candidate_id, [])
+
+
+def forget(candidate_id: int) -> None:
+    recommendations_cache.invalidate(candidate_id)
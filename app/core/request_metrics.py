@@ -0,0 +1,235 @@
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import event
+
+from app.config import settings
+
+logger = logging.getLogger("app.sql")
+
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestStats:
+    """SQL activity of one request; shared by every thread/greenlet serving it."""
+
+    __slots__ = ("route", "statements", "db_time", "pool_wait", "slow_queries", "_lock")
+
+    def __init__(self):
+        self.route = None
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.slow_queries = []  # (ms, statement) seen before the route was known
+        self._lock = threading.Lock()
+
+    def add_statement(self, seconds: float) -> None:
+        with self._lock:
+            self.statements += 1
+            self.db_time += seconds
+
+    def add_pool_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.pool_wait += seconds
+
+
+# Set by the middleware; copied into threadpool threads and run_sync greenlets
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def add_pool_wait(seconds: float) -> None:
+    stats = _current.get()
+    if stats is not None:
+        stats.add_pool_wait(seconds)
+
+
+# ---------------------------------------------------------
+# 🗄️ SQLAlchemy cursor hooks
+# ---------------------------------------------------------
+def instrument_engine(engine) -> None:
+    """Time every statement on `engine` (a sync Engine) into the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.add_statement(elapsed)
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            sample = (elapsed * 1000, " ".join(statement.split())[:1000])
+            if stats is None:
+                _log_slow_query("<no request>", *sample)
+            elif stats.route is None:
+                # The route template is only known once routing finished;
+                # the middleware logs these after the handler returns
+                stats.slow_queries.append(sample)
+            else:
+                _log_slow_query(stats.route, *sample)
+
+
+def _log_slow_query(route: str, ms: float, statement: str) -> None:
+    logger.warning("Slow query (%.1f ms) on %s: %s", ms, route, statement)
+
+
+# ---------------------------------------------------------
+# 📊 Per-route aggregates
+# ---------------------------------------------------------
+class RouteMetrics:
+    __slots__ = ("requests", "duration_sum", "duration_buckets", "statements", "db_time", "pool_wait")
+
+    def __init__(self):
+        self.requests = 0
+        self.duration_sum = 0.0
+        self.duration_buckets = [0] * (len(DURATION_BUCKETS) + 1)  # last bucket is +Inf
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+
+
+_routes: "dict[tuple[str, str, int], RouteMetrics]" = {}
+_routes_lock = threading.Lock()
+
+
+def _record(method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+    with _routes_lock:
+        metrics = _routes.get((method, route, status))
+        if metrics is None:
+            metrics = _routes[(method, route, status)] = RouteMetrics()
+        metrics.requests += 1
+        metrics.duration_sum += duration
+        metrics.duration_buckets[bisect.bisect_left(DURATION_BUCKETS, duration)] += 1
+        metrics.statements += stats.statements
+        metrics.db_time += stats.db_time
+        metrics.pool_wait += stats.pool_wait
+
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    # Unmatched paths are grouped so random URLs can't blow up label cardinality
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+async def middleware(request: Request, call_next):
+    stats = RequestStats()
+    token = _current.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    total = time.perf_counter() - start
+    stats.route = _route_template(request)
+    for sample in stats.slow_queries:
+        _log_slow_query(stats.route, *sample)
+    _record(request.method, stats.route, response.status_code, total, stats)
+
+    if settings.SERVER_TIMING:
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.db_time * 1000:.2f};desc="{stats.statements} queries", '
+            f"pool;dur={stats.pool_wait * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+    return response
+
+
+# ---------------------------------------------------------
+# 📈 Prometheus text exposition
+# ---------------------------------------------------------
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+def _cumulative(counts):
+    total = 0
+    for count in counts:
+        total += count
+        yield total
+
+
+def render_prometheus(pools: dict, caches: dict) -> str:
+    """
+    Metrics in the Prometheus text format: per-route request/SQL counters,
+    `pools` (pool_metrics.snapshot()) and `caches` ({name: TTLCache.stats()}).
+    """
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    with _routes_lock:
+        routes = []
+        for (method, route, status), m in sorted(_routes.items()):
+            routes.append((dict(method=method, route=route, status=status), {
+                "requests": m.requests,
+                "duration_sum": round(m.duration_sum, 6),
+                "duration_buckets": list(m.duration_buckets),
+                "statements": m.statements,
+                "db_time": round(m.db_time, 6),
+                "pool_wait": round(m.pool_wait, 6),
+            }))
+
+    family("http_request_duration_seconds", "histogram", "Request latency by route template.")
+    for labels, m in routes:
+        for bound, count in zip(DURATION_BUCKETS + ("+Inf",), _cumulative(m["duration_buckets"])):
+            lines.append(f"http_request_duration_seconds_bucket{_labels(**labels, le=bound)} {count}")
+        lines.append(f"http_request_duration_seconds_sum{_labels(**labels)} {m['duration_sum']}")
+        lines.append(f"http_request_duration_seconds_count{_labels(**labels)} {m['requests']}")
+
+    for name, key, help_text in (
+        ("db_statements_total", "statements", "SQL statements executed, by route template."),
+        ("db_time_seconds_total", "db_time", "Time spent executing SQL, by route template."),
+        ("db_pool_wait_seconds_total", "pool_wait", "Time spent waiting for a pooled connection, by route template."),
+    ):
+        family(name, "counter", help_text)
+        for labels, m in routes:
+            lines.append(f"{name}{_labels(**labels)} {m[key]}")
+
+    family("db_pool_checked_out", "gauge", "Connections currently checked out.")
+    for pool, data in pools.items():
+        lines.append(f"db_pool_checked_out{_labels(pool=pool)} {data['checked_out']}")
+    for key in ("size", "overflow", "idle"):
+        if any(key in data for data in pools.values()):
+            family(f"db_pool_{key}", "gauge", f"Pool {key}.")
+            for pool, data in pools.items():
+                if key in data:
+                    lines.append(f"db_pool_{key}{_labels(pool=pool)} {data[key]}")
+    for key in ("checkouts", "connects", "invalidations", "timeouts"):
+        family(f"db_pool_{key}_total", "counter", f"Pool {key}.")
+        for pool, data in pools.items():
+            lines.append(f"db_pool_{key}_total{_labels(pool=pool)} {data[f'{key}_total']}")
+    family("db_pool_wait_seconds", "histogram", "Time callers waited for a pooled connection.")
+    for pool, data in pools.items():
+        for bound, count in data["wait_seconds_buckets"].items():
+            lines.append(f"db_pool_wait_seconds_bucket{_labels(pool=pool, le=bound)} {count}")
+        lines.append(f"db_pool_wait_seconds_sum{_labels(pool=pool)} {data['wait_seconds_sum']}")
+        lines.append(f"db_pool_wait_seconds_count{_labels(pool=pool)} {data['wait_seconds_count']}")
+
+    for key, kind in (("size", "gauge"), ("hits", "counter"), ("misses", "counter")):
+        name = f"cache_{key}" + ("_total" if kind == "counter" else "")
+        family(name, kind, f"In-process cache {key}.")
+        for cache, data in caches.items():
+            lines.append(f"{name}{_labels(cache=cache)} {data[key]}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,244 @@
+"""
+Keyword search over jobs.
+
+PostgreSQL: `jobs.search_vector` is a generated tsvector column (title
+weighted above description, migration c3a9e4f17b05) with a GIN index; queries
+use websearch_to_tsquery and are ranked with ts_rank_cd.
+
+Other databases (SQLite test runs): an in-process inverted index over
+title/description, built on first use and rebuilt after any Job change.
+"""
+import bisect
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import REAL, cast, event, func, literal, literal_column, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.job import Job
+
+
+SEARCH_CONFIG = "english"
+
+# Generated column added by the full-text search migration (PostgreSQL only)
+SEARCH_VECTOR = literal_column("jobs.search_vector")
+
+# Title matches rank above description matches (weights A and B), as in
+# migration c3a9e4f17b05
+SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+# Search results are ordered by (rank, id), best first
+SEARCH_ORDER = [literal_column("rank", REAL), Job.id]
+
+# Same weights as setweight(..., 'A') / 'B' in the generated column
+TITLE_WEIGHT = 1.0
+DESCRIPTION_WEIGHT = 0.4
+
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this "
+    "to was were will with we you your our".split()
+)
+_WORD = re.compile(r"[a-z0-9]+(?:[+#]+|(?:\.[a-z0-9]+)*)")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lower-cased terms without stop words, with a light plural strip."""
+    terms = []
+    for word in _WORD.findall((text or "").lower()):
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+# ---------------------------------------------------------
+# 🐘 PostgreSQL: tsvector + GIN
+# ---------------------------------------------------------
+def create_search_vector(connection) -> None:
+    """
+    Add the generated column and its GIN index to a PostgreSQL database
+    built from the models (lifecycle.create_schema), which Base.metadata
+    does not cover. A no-op where they exist already.
+    """
+    connection.execute(text(
+        f"ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_DOCUMENT}) STORED"
+    ))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)"
+    ))
+
+
+def _postgres_search(db: Session, q: str, status: Optional[str], cursor, limit: int):
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = cast(func.ts_rank_cd(SEARCH_VECTOR, tsquery), REAL).label("rank")
+
+    ranked = db.query(Job.id.label("id"), rank).filter(SEARCH_VECTOR.op("@@")(tsquery))
+    if status:
+        ranked = ranked.filter(Job.status == status)
+    ranked = ranked.subquery()
+
+    query = db.query(Job, ranked.c.rank).join(ranked, ranked.c.id == Job.id)
+    if cursor:
+        last_rank, last_id = cursor
+        # Compare as REAL: a float8 literal would never equal the float4 rank
+        query = query.filter(
+            tuple_(ranked.c.rank, Job.id) < tuple_(cast(literal(last_rank), REAL), literal(last_id))
+        )
+
+    return query.order_by(ranked.c.rank.desc(), Job.id.desc()).limit(limit + 1).all()
+
+
+# ---------------------------------------------------------
+# 🗂️ Fallback: in-process inverted index
+# ---------------------------------------------------------
+class InvertedIndex:
+    """
+    term -> {job_id: log-scaled weighted term frequency}, scored with tf-idf.
+    Ranked hit lists are cached per query until the index is rebuilt.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[int, float]] = {}
+        self.doc_count = 0
+        self.dirty = True
+        self.results = TTLCache(maxsize=256, ttl=float("inf"))
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self.dirty = True
+
+    def build(self, rows) -> None:
+        postings = defaultdict(dict)
+        doc_count = 0
+        for job_id, title, description in rows:
+            doc_count += 1
+            weights = Counter()
+            for term in tokenize(title):
+                weights[term] += TITLE_WEIGHT
+            for term in tokenize(description):
+                weights[term] += DESCRIPTION_WEIGHT
+            for term, weight in weights.items():
+                postings[term][job_id] = 1 + math.log(weight)
+
+        self.postings = dict(postings)
+        self.doc_count = doc_count
+        self.results.clear()
+
+    def ensure_built(self, db: Session) -> None:
+        with self._lock:
+            if self.dirty:
+                # Cleared first so a change committed during the rebuild
+                # marks the index dirty again
+                self.dirty = False
+                try:
+                    self.build(db.query(Job.id, Job.title, Job.description).yield_per(10_000))
+                except Exception:
+                    self.dirty = True
+                    raise
+
+    def search(self, terms: Sequence[str]) -> List[Tuple[float, int]]:
+        """
+        Jobs containing every term as (-score, -job_id), ascending — i.e. best
+        match first, with ties broken by the newest id as in PostgreSQL.
+        """
+        key = tuple(sorted(set(terms)))
+        hits = self.results.get(key)
+        if hits is None:
+            hits = sorted((-score, -job_id) for score, job_id in self._score(key))
+            self.results.set(key, hits)
+        return hits
+
+    def _score(self, terms: Sequence[str]) -> List[Tuple[float, int]]:
+        postings = [self.postings.get(term) for term in terms]
+        if not postings or any(p is None for p in postings):
+            return []
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates.intersection_update(p)
+            if not candidates:
+                return []
+
+        idf = [math.log(1 + self.doc_count / len(p)) for p in postings]
+        if len(postings) == 1:
+            (p,), (w,) = postings, idf
+            return [(round(tf * w, 6), job_id) for job_id, tf in p.items()]
+        return [
+            (round(sum(p[job_id] * w for p, w in zip(postings, idf)), 6), job_id)
+            for job_id in candidates
+        ]
+
+
+search_index = InvertedIndex()
+
+
+@event.listens_for(Job, "after_insert")
+@event.listens_for(Job, "after_update")
+@event.listens_for(Job, "after_delete")
+def _job_changed(mapper, connection, target):
+    search_index.invalidate()
+
+
+def _fallback_search(db: Session, q: str, status: Optional[str], cursor, limit: int):
+    search_index.ensure_built(db)
+    hits = search_index.search(tokenize(q))
+    start = 0
+    if cursor:
+        last_rank, last_id = cursor
+        start = bisect.bisect_right(hits, (-last_rank, -last_id))
+
+    # Load page-sized slices; widen them when the status filter drops hits
+    rows, window = [], limit + 1
+    while start < len(hits) and len(rows) <= limit:
+        chunk = hits[start:start + window]
+        start += window
+        window *= 4
+
+        query = db.query(Job).filter(Job.id.in_([-neg_id for _, neg_id in chunk]))
+        if status:
+            query = query.filter(Job.status == status)
+        jobs = {job.id: job for job in query}
+        rows += [(jobs[-neg_id], -neg_score) for neg_score, neg_id in chunk if -neg_id in jobs]
+
+    return rows[:limit + 1]
+
+
+# ---------------------------------------------------------
+# 🔎 Entry point
+# ---------------------------------------------------------
+def search_jobs(db: Session, q: str, status: Optional[str], cursor: Optional[str], limit: int):
+    """
+    One page of jobs matching `q`, best match first, as [(job, rank)], plus
+    the cursor for the next page (None on the last page).
+    """
+    after = None
+    if cursor:
+        after = decode_cursor(cursor, SEARCH_ORDER)
+        if not all(isinstance(v, (int, float)) for v in after):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if db.get_bind().dialect.name == "postgresql":
+        rows = _postgres_search(db, q, status, after, limit)
+    else:
+        rows = _fallback_search(db, q, status, after, limit)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        job, rank = rows[-1]
+        next_cursor = encode_cursor([rank, job.id])
+
+    return rows, next_cursor
@@ -1,27 +1,37 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
 import jwt
 
-from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_session, run_db, DbSession
 from app.models.user import User
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.cache import TTLCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Requests stateless mode authorizes from token claims alone; everything else
+# (writes, and any admin request) is checked against the user's token version
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+# Detached User rows for endpoints that need the full ORM object
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+# Verified token claims keyed by the raw token bytes; entries never outlive
+# the token's own `exp`
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -38,45 +48,167 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-):
+def create_user_token(user: User, expires_delta: Optional[timedelta] = None):
+    """
+    Issue an access token whose claims carry everything RBAC needs, so
+    `get_current_principal` can authorize requests without touching the DB.
+    """
+    return create_access_token(
+        data={
+            "sub": str(user.id),
+            "email": user.email,
+            "role": getattr(user.role, "value", user.role),
+            "cid": user.company_id,
+            "tv": user.token_version or 0,
+        },
+        expires_delta=expires_delta,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated caller resolved from signed token claims."""
+
+    id: int
+    email: str
+    role: str
+    company_id: Optional[int]
+    token_version: int
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "Principal":
+        return cls(
+            id=int(payload["sub"]),
+            email=payload.get("email"),
+            role=payload["role"],
+            company_id=payload.get("cid"),
+            token_version=payload.get("tv", 0),
+        )
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=getattr(user.role, "value", user.role),
+            company_id=user.company_id,
+            token_version=user.token_version or 0,
+        )
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify `token` and return its claims. Successful verifications are cached
+    in `token_cache`, so a token presented repeatedly is only HMAC-checked and
+    JSON-parsed once (until it expires or is evicted).
+    """
+    key = token.encode()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-            )
-
     except jwt.PyJWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    if payload.get("sub") is None or payload.get("role") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+        )
+
+    token_cache.set(key, payload, expires_at=payload.get("exp"))
+    return payload
+
+
+def _fetch_user(db: Session, user_id: int) -> User:
+    user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-
+    # Keep a detached, clean copy; every request gets its own merged instance
+    db.expunge(user)
+    user_cache.set(user_id, user)
     return user
 
-def require_role(required_role: str):
-    def role_checker(current_user: User = Depends(get_current_user)):
-        if current_user.role != required_role:
-            raise HTTPException(
-                status_code=403,
-                detail="Not enough permissions"
-            )
-        return current_user
-    return role_checker
+
+def _load_user(db: Session, payload: dict) -> User:
+    user_id = int(payload["sub"])
+    token_version = payload.get("tv", 0)
+
+    cached = user_cache.get(user_id)
+    if cached is None or (cached.token_version or 0) < token_version:
+        # Miss, or the token is newer than our copy (revoked in another worker)
+        cached = _fetch_user(db, user_id)
+
+    if (cached.token_version or 0) != token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+
+    return db.merge(cached, load=False)
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: DbSession = Depends(get_session),
+):
+    """Full `User` row, served from `user_cache` when possible."""
+    return await run_db(db, _load_user, decode_access_token(token))
+
+
+async def get_current_principal(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: DbSession = Depends(get_session),
+) -> Principal:
+    """
+    Caller identity for RBAC. In "stateless" AUTH_MODE, reads (GET/HEAD/
+    OPTIONS) by non-admins are authorized from the signed claims alone (no
+    query), so a revoked token keeps read access until it expires
+    (ACCESS_TOKEN_EXPIRE_MINUTES). Writes and admin requests, and every
+    request in "database" mode, are checked against the (cached) user row:
+    a bumped token version is rejected and the current role/company is used.
+    """
+    payload = decode_access_token(token)
+
+    if (
+        settings.AUTH_MODE == "stateless"
+        and request.method in SAFE_METHODS
+        and payload["role"] != "admin"
+    ):
+        return Principal.from_claims(payload)
+
+    return Principal.from_user(await run_db(db, _load_user, payload))
+
+
+def auth_cache_stats() -> dict:
+    return {
+        "token_cache": token_cache.stats(),
+        "user_cache": user_cache.stats(),
+    }
+
+
+def invalidate_user(user_id: int) -> None:
+    user_cache.invalidate(user_id)
+
+
+def revoke_user_tokens(user: User, db: Session) -> None:
+    """
+    Bump the user's token version (role/company change, password reset) and
+    commit, so tokens issued before the change stop resolving to the user.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    invalidate_user(user.id)
@@ -0,0 +1,115 @@
+"""
+Per-job pipeline counters (`job_stage_counts`).
+
+Every write path that creates an application or moves it between stages
+calls `apply_deltas` in its own transaction, so the counters commit or roll
+back with the change. Each delta is one atomic upsert
+(`count = count + delta`); concurrent writers serialise on the counter row
+instead of on a read-modify-write in Python.
+"""
+from collections import Counter
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.database import dialect_insert
+from app.models.application import Application
+from app.models.job_stage_count import JobStageCount
+
+
+def apply_deltas(db: Session, deltas: Mapping[Tuple[int, str], int]) -> None:
+    """Add `delta` to the (job_id, stage) counter for every non-zero entry."""
+    rows = [
+        {"job_id": job_id, "stage": stage, "count": delta}
+        for (job_id, stage), delta in sorted(deltas.items())  # fixed order: no deadlocks
+        if delta
+    ]
+    if not rows:
+        return
+
+    insert = dialect_insert(db, JobStageCount)
+    db.execute(
+        insert.on_conflict_do_update(
+            index_elements=["job_id", "stage"],
+            set_={"count": JobStageCount.count + insert.excluded.count},
+        ),
+        rows,
+    )
+
+
+def moved(job_id: int, old_stage: Optional[str], new_stage: str) -> Counter:
+    """Deltas for one application entering `new_stage` (from `old_stage`, if any)."""
+    deltas = Counter({(job_id, new_stage): 1})
+    if old_stage is not None:
+        deltas[(job_id, old_stage)] -= 1
+    return deltas
+
+
+def counts_for_job(db: Session, job_id: int) -> List[Tuple[str, int]]:
+    return db.query(JobStageCount.stage, JobStageCount.count).filter(
+        JobStageCount.job_id == job_id
+    ).all()
+
+
+# ---------------------------------------------------------
+# 🔧 Reconciliation
+# ---------------------------------------------------------
+def actual_counts(db: Session, job_ids: Optional[Iterable[int]] = None):
+    """(job_id, stage) -> count straight from `applications`, in one grouped scan."""
+    query = (
+        db.query(Application.job_id, Application.stage, func.count())
+        .filter(Application.stage.isnot(None))
+        .group_by(Application.job_id, Application.stage)
+    )
+    if job_ids is not None:
+        query = query.filter(Application.job_id.in_(list(job_ids)))
+    return {(job_id, stage): count for job_id, stage, count in query}
+
+
+def stored_counts(db: Session, job_ids: Optional[Iterable[int]] = None):
+    query = db.query(JobStageCount.job_id, JobStageCount.stage, JobStageCount.count)
+    if job_ids is not None:
+        query = query.filter(JobStageCount.job_id.in_(list(job_ids)))
+    return {(job_id, stage): count for job_id, stage, count in query}
+
+
+def drift(db: Session, job_ids: Optional[Iterable[int]] = None):
+    """(job_id, stage) -> (stored, actual) for every counter that is off."""
+    job_ids = None if job_ids is None else list(job_ids)
+    actual = actual_counts(db, job_ids)
+    stored = stored_counts(db, job_ids)
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in sorted(actual.keys() | stored.keys())
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+
+def rebuild(db: Session, job_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    Replace the counters (all jobs, or `job_ids`) with a fresh grouped count
+    of `applications`. Runs in the caller's transaction; commit to publish.
+    """
+    job_ids = None if job_ids is None else list(job_ids)
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Hold off concurrent upserts until this transaction commits: writers
+        # that already bumped a counter are waited for (their applications are
+        # then visible to the scan), later ones add their delta on top
+        db.execute(text("LOCK TABLE job_stage_counts IN EXCLUSIVE MODE"))
+
+    delete = db.query(JobStageCount)
+    grouped = (
+        select(Application.job_id, Application.stage, func.count())
+        .where(Application.stage.isnot(None))
+        .group_by(Application.job_id, Application.stage)
+    )
+    if job_ids is not None:
+        delete = delete.filter(JobStageCount.job_id.in_(job_ids))
+        grouped = grouped.where(Application.job_id.in_(job_ids))
+
+    delete.delete(synchronize_session=False)
+    db.execute(
+        dialect_insert(db, JobStageCount).from_select(["job_id", "stage", "count"], grouped)
+    )
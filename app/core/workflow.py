@@ -1,15 +1,160 @@
 # app/core/workflow.py
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
 
-VALID_STAGES = [
-    "Applied",
-    "Screening",
-    "Interview",
-    "Offer",
-    "Hired",
-    "Rejected"
-]
+from sqlalchemy.orm import Session
 
-ALLOWED_TRANSITIONS = {
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.lazy import numpy  # optional: vectorised bulk validation
+
+
+# Stage code for strings that are not part of a pipeline
+UNKNOWN_STAGE = -1
+
+
+def _stage_key(stage: str) -> str:
+    return " ".join(stage.split()).casefold()
+
+
+class Pipeline:
+    """
+    A compiled, immutable workflow: stages are interned to small integers and
+    each stage's allowed next (and previous) stages are stored as bitsets, so
+    a transition check is two dict lookups and a bit test.
+    """
+
+    __slots__ = ("stages", "codes", "initial_stage", "_keys", "_next", "_prev", "_matrix")
+
+    def __init__(self, transitions: Mapping[str, Sequence[str]]):
+        stages = tuple(transitions)
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+
+        keys = {}
+        for code, stage in enumerate(stages):
+            if not isinstance(stage, str) or not stage.strip():
+                raise ValueError(f"Invalid stage name: {stage!r}")
+            if _stage_key(stage) in keys:
+                raise ValueError(f"Duplicate stage: {stage}")
+            keys[_stage_key(stage)] = code
+
+        next_bits = [0] * len(stages)
+        prev_bits = [0] * len(stages)
+        for code, stage in enumerate(stages):
+            for target in transitions[stage]:
+                if target not in transitions:
+                    raise ValueError(f"Unknown stage {target!r} in transitions of {stage!r}")
+                target_code = keys[_stage_key(target)]
+                next_bits[code] |= 1 << target_code
+                prev_bits[target_code] |= 1 << code
+
+        self.stages = stages
+        self.codes = MappingProxyType({stage: code for code, stage in enumerate(stages)})
+        self.initial_stage = stages[0]
+        self._keys = MappingProxyType(keys)
+        self._next = tuple(next_bits)
+        self._prev = tuple(prev_bits)
+
+        self._matrix = None  # numpy transition matrix, built by the first bulk check
+
+    def __repr__(self) -> str:
+        return f"Pipeline({list(self.stages)!r})"
+
+    @staticmethod
+    def _decode(bits: int) -> List[int]:
+        codes = []
+        while bits:
+            low = bits & -bits
+            codes.append(low.bit_length() - 1)
+            bits ^= low
+        return codes
+
+    # --- single lookups ---------------------------------------------------
+    def code(self, stage: Optional[str]) -> int:
+        code = self.codes.get(stage)
+        if code is None and isinstance(stage, str):
+            code = self._keys.get(_stage_key(stage))
+        return UNKNOWN_STAGE if code is None else code
+
+    def normalize(self, stage: str) -> Optional[str]:
+        """Canonical spelling of `stage` ("  screening " -> "Screening"), or None."""
+        code = self.code(stage)
+        return None if code == UNKNOWN_STAGE else self.stages[code]
+
+    def is_valid_transition(self, current_stage: str, next_stage: str) -> bool:
+        current, target = self.code(current_stage), self.code(next_stage)
+        if current == UNKNOWN_STAGE or target == UNKNOWN_STAGE:
+            return False
+        return bool(self._next[current] >> target & 1)
+
+    def allowed_transitions(self, stage: str) -> List[str]:
+        code = self.code(stage)
+        if code == UNKNOWN_STAGE:
+            return []
+        return [self.stages[c] for c in self._decode(self._next[code])]
+
+    def allowed_sources(self, stage: str) -> List[str]:
+        code = self.code(stage)
+        if code == UNKNOWN_STAGE:
+            return []
+        return [self.stages[c] for c in self._decode(self._prev[code])]
+
+    # --- bulk validation --------------------------------------------------
+    def _transition_matrix(self):
+        np = numpy()
+        if self._matrix is None and np is not None:
+            # (n + 1) x (n + 1): the last row/column absorbs UNKNOWN_STAGE (-1)
+            matrix = np.zeros((len(self.stages) + 1, len(self.stages) + 1), dtype=bool)
+            for code, bits in enumerate(self._next):
+                matrix[code, self._decode(bits)] = True
+            matrix.setflags(write=False)
+            self._matrix = matrix
+        return self._matrix
+
+    def encode(self, stages: Iterable[str]):
+        """Stage names -> codes (UNKNOWN_STAGE for unknown names)."""
+        codes = [self.code(stage) for stage in stages]
+        np = numpy()
+        return np.asarray(codes, dtype=np.int16) if np is not None else codes
+
+    def validate_codes(self, current_codes, next_codes):
+        """
+        Vectorised transition check over two equal-length code arrays (or one
+        array and a single target code). Returns a boolean array (numpy) or list.
+        """
+        matrix = self._transition_matrix()
+        if matrix is not None:
+            np = numpy()
+            return matrix[np.asarray(current_codes), np.asarray(next_codes)]
+
+        if isinstance(next_codes, int):
+            next_codes = [next_codes] * len(current_codes)
+        next_bits = self._next
+        return [
+            current >= 0 and target >= 0 and bool(next_bits[current] >> target & 1)
+            for current, target in zip(current_codes, next_codes)
+        ]
+
+    def validate_many(self, current_stages: Iterable[str], next_stages) -> List[bool]:
+        """`is_valid_transition` over many pairs; `next_stages` may be a single stage."""
+        current_codes = self.encode(current_stages)
+        if isinstance(next_stages, str):
+            next_codes = self.code(next_stages)
+        else:
+            next_codes = self.encode(next_stages)
+        return list(self.validate_codes(current_codes, next_codes))
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {stage: self.allowed_transitions(stage) for stage in self.stages}
+
+
+# ---------------------------------------------------------
+# ⚙️ Default pipeline
+# ---------------------------------------------------------
+DEFAULT_TRANSITIONS = {
     "Applied": ["Screening", "Rejected"],
     "Screening": ["Interview", "Rejected"],
     "Interview": ["Offer", "Rejected"],
@@ -18,12 +163,64 @@ ALLOWED_TRANSITIONS = {
     "Rejected": []
 }
 
-def is_valid_transition(current_stage: str, next_stage: str) -> bool:
-    # Validate both stages exist
-    if current_stage not in VALID_STAGES or next_stage not in VALID_STAGES:
-        return False
-    # Check allowed transitions
-    return next_stage in ALLOWED_TRANSITIONS.get(current_stage, [])
+DEFAULT_PIPELINE = Pipeline(DEFAULT_TRANSITIONS)
+
+
+# ---------------------------------------------------------
+# 🏢 Per-company pipelines (companies.pipeline JSON column)
+# ---------------------------------------------------------
+@lru_cache(maxsize=256)
+def _compile(definition: str) -> Pipeline:
+    return Pipeline(json.loads(definition))
+
+
+def compile_pipeline(transitions: Mapping[str, Sequence[str]]) -> Pipeline:
+    """
+    Compile a `{stage: [next stages]}` definition; identical definitions share
+    one compiled Pipeline. Raises ValueError for invalid definitions.
+    """
+    if not isinstance(transitions, Mapping) or not all(
+        isinstance(targets, (list, tuple)) for targets in transitions.values()
+    ):
+        raise ValueError("Pipeline must map each stage to a list of next stages")
+
+    pipeline = _compile(json.dumps(transitions))
+    if pipeline.initial_stage != DEFAULT_PIPELINE.initial_stage:
+        # apply_to_job always files new applications under "Applied"
+        raise ValueError(f"Pipeline must start with {DEFAULT_PIPELINE.initial_stage!r}")
+    return pipeline
+
+
+pipeline_cache = TTLCache(
+    maxsize=settings.PIPELINE_CACHE_SIZE,
+    ttl=settings.PIPELINE_CACHE_TTL_SECONDS,
+)
+
+
+def pipelines_for_companies(db: Session, company_ids: Iterable[int]) -> Dict[int, Pipeline]:
+    """Pipeline per company, loading all cache misses with one query."""
+    from app.models.company import Company
+
+    pipelines, missing = {}, []
+    for company_id in set(company_ids):
+        pipeline = pipeline_cache.get(company_id)
+        if pipeline is None:
+            missing.append(company_id)
+        else:
+            pipelines[company_id] = pipeline
+
+    if missing:
+        rows = dict(db.query(Company.id, Company.pipeline).filter(Company.id.in_(missing)))
+        for company_id in missing:
+            definition = rows.get(company_id)
+            pipeline = compile_pipeline(definition) if definition else DEFAULT_PIPELINE
+            pipeline_cache.set(company_id, pipeline)
+            pipelines[company_id] = pipeline
+
+    return pipelines
+
 
-def get_allowed_transitions(stage: str):
-    return ALLOWED_TRANSITIONS.get(stage, [])
+def pipeline_for_company(db: Session, company_id: Optional[int]) -> Pipeline:
+    if company_id is None:
+        return DEFAULT_PIPELINE
+    return pipelines_for_companies(db, [company_id])[company_id]
@@ -1,8 +1,52 @@
+from typing import Union
+from uuid import uuid4
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+
 from app.config import settings
+from app.core import pool_metrics, request_metrics
+
+
+def _engine_options(url: str, is_async: bool = False) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns pooling; prepared statements don't survive
+        # transaction-pooled server connections.
+        options = {"poolclass": NullPool}
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": (
+            pool_metrics.TimedAsyncAdaptedQueuePool if is_async else pool_metrics.TimedQueuePool
+        ),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
-engine = create_engine(settings.DATABASE_URL, future=True)
+engine = create_engine(
+    settings.DATABASE_URL,
+    future=True,
+    **_engine_options(settings.DATABASE_URL)
+)
+pool_metrics.instrument(engine, "sync")
+request_metrics.instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -10,11 +54,81 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine (asyncpg / aiosqlite), only built when DB_ASYNC is enabled.
+# The sync engine above is always available for Celery tasks, CLIs and
+# streaming responses.
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        **_engine_options(settings.ASYNC_DATABASE_URL, is_async=True)
+    )
+    pool_metrics.instrument(async_engine.sync_engine, "async")
+    request_metrics.instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        # Objects are returned to FastAPI for serialization after the unit of
+        # work; expiring them would force lazy loads outside the greenlet.
+        expire_on_commit=False
+    )
+
 Base = declarative_base()
 
+DbSession = Union[Session, AsyncSession]
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_session():
+    """
+    Request-scoped session for `async def` handlers: an `AsyncSession` when
+    DB_ASYNC is enabled, otherwise a regular `Session`. Use it with `run_db`.
+    """
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def run_db(db: DbSession, fn, *args, **kwargs):
+    """
+    Run `fn(session, *args, **kwargs)` — plain synchronous ORM code — against
+    the request session without blocking the event loop.
+
+    With an `AsyncSession` the function runs through `run_sync`, so its I/O
+    is awaited on the event loop via asyncpg; with a sync `Session` it runs
+    on the threadpool exactly as a `def` endpoint would.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def dialect_insert(db: Session, model):
+    """
+    INSERT construct for the session's dialect, exposing
+    `on_conflict_do_nothing` / `on_conflict_do_update` (PostgreSQL and SQLite).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
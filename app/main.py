@@ -1,21 +1,33 @@
 from app.models.application_history import ApplicationHistory
 from app.models.application import Application
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy.orm import Session
 
-from app.database import Base, engine
+from app.database import engine
 from app.models.user import User
 from app.models.company import Company
 from app.models.job import Job   # ✅ JOB MODEL ADDED
+from app.models.outbox import OutboxMessage
+from app.models.job_stage_count import JobStageCount
+from app.models.job_recommendation import JobRecommendation
 
 from app.routers import auth, company, jobs  # ✅ JOB ROUTER ADDED
-from app.core.security import get_current_user
+from app.core.security import get_current_principal, Principal, auth_cache_stats
+from app.core import pool_metrics, request_metrics, listing_cache
+from app.core.workflow import pipeline_cache
+from app.core.analytics import analytics_cache
+from app.core.matching import applicant_indexes
+from app.core.recommendations import recommendations_cache
 from app.core.rbac import require_role
+from app.core.lifecycle import lifespan
 
-app = FastAPI(title="ATS Job Application API")
+# Tables come from Alembic (`alembic upgrade head`, or `python -m app.server
+# --migrate`); lifespan warms pools/caches and closes them on shutdown
+app = FastAPI(title="ATS Job Application API", lifespan=lifespan)
 
-# ✅ CREATE ALL DATABASE TABLES
-Base.metadata.create_all(bind=engine)
+# ✅ PER-REQUEST SQL COUNT / DB TIME (Server-Timing header + /metrics)
+app.middleware("http")(request_metrics.middleware)
 
 # ✅ REGISTER ALL ROUTERS
 app.include_router(auth.router)
@@ -27,9 +39,25 @@ app.include_router(jobs.router)   # ✅ IMPORTANT
 def root():
     return {"message": "ATS API is running successfully"}
 
+# ✅ HEALTH (liveness / readiness for load balancers and orchestrators)
+@app.get("/health", include_in_schema=False)
+def health():
+    return {"status": "ok"}
+
+@app.get("/health/ready", include_in_schema=False)
+def ready(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse({"status": "starting"}, status_code=503)
+    try:
+        with engine.connect() as connection:
+            connection.exec_driver_sql("SELECT 1")
+    except Exception:
+        return JSONResponse({"status": "database unavailable"}, status_code=503)
+    return {"status": "ready"}
+
 # ✅ AUTH TEST
 @app.get("/protected")
-def protected_route(current_user: User = Depends(get_current_user)):
+def protected_route(current_user: Principal = Depends(get_current_principal)):
     return {
         "message": "You are authenticated",
         "user_id": current_user.id,
@@ -38,12 +66,40 @@ def protected_route(current_user: User = Depends(get_current_user)):
 
 # ✅ ROLE TESTS
 @app.get("/candidate-only")
-def candidate_only(user: User = Depends(require_role("candidate"))):
+def candidate_only(user: Principal = Depends(require_role("candidate"))):
     return {"message": "Hello Candidate"}
 
 @app.get("/recruiter-only")
-def recruiter_only(user: User = Depends(require_role("recruiter"))):
+def recruiter_only(user: Principal = Depends(require_role("recruiter"))):
     return {"message": "Hello Recruiter"}
 
+# ✅ AUTH CACHE SIZING (hit/miss counters)
+@app.get("/admin/auth-cache")
+def auth_cache(user: Principal = Depends(require_role("admin"))):
+    return auth_cache_stats()
+
+# ✅ DB POOL TELEMETRY (checked-out, overflow, wait-time histogram)
+@app.get("/admin/db-pool")
+def db_pool(user: Principal = Depends(require_role("admin"))):
+    return pool_metrics.snapshot()
+
+# ✅ PROMETHEUS METRICS (per-route latency + SQL, pools, caches)
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    caches = auth_cache_stats()
+    caches["pipeline"] = pipeline_cache.stats()
+    caches["analytics"] = analytics_cache.stats()
+    caches["applicant_index"] = applicant_indexes.stats()
+    caches["recommendations"] = recommendations_cache.stats()
+    if listing_cache.cache_stats():
+        caches["listing"] = listing_cache.cache_stats()
+    return PlainTextResponse(
+        request_metrics.render_prometheus(pool_metrics.snapshot(), caches),
+        media_type="text/plain; version=0.0.4"
+    )
+
 from app.routers import applications
 app.include_router(applications.router)
+
+from app.routers import analytics
+app.include_router(analytics.router)
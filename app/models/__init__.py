@@ -1,3 +1,8 @@
 from .user import User
 from .company import Company
 from .job import Job
+from .application import Application
+from .application_history import ApplicationHistory
+from .outbox import OutboxMessage
+from .job_stage_count import JobStageCount
+from .job_recommendation import JobRecommendation
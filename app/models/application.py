@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -18,4 +18,13 @@ class Application(Base):
     candidate = relationship("User")
     job = relationship("Job")
 
-    history = relationship("ApplicationHistory", back_populates="application")
+    history = relationship(
+        "ApplicationHistory", back_populates="application", order_by="ApplicationHistory.id"
+    )
+
+    __table_args__ = (
+        # One application per candidate per job (duplicate check in apply_to_job)
+        Index("uq_applications_candidate_job", "candidate_id", "job_id", unique=True),
+        # job_applications: filter by job (+ stage), newest first
+        Index("ix_applications_job_stage_created", "job_id", "stage", "created_at"),
+    )
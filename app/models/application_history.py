@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -10,7 +10,7 @@ class ApplicationHistory(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     application_id = Column(Integer, ForeignKey("applications.id"), nullable=False)
-    old_stage = Column(String, nullable=False)
+    old_stage = Column(String, nullable=True)  # NULL for the initial "Applied" entry
     new_stage = Column(String, nullable=False)
 
     changed_by = Column(Integer, ForeignKey("users.id"))
@@ -19,3 +19,7 @@ class ApplicationHistory(Base):
     # ✅ BIDIRECTIONAL LINKS
     application = relationship("Application", back_populates="history")
     user = relationship("User")
+
+    __table_args__ = (
+        Index("ix_application_history_application_changed", "application_id", "changed_at"),
+    )
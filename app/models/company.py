@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, JSON
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -10,5 +10,8 @@ class Company(Base):
     name = Column(String, unique=True, nullable=False)
     domain = Column(String, nullable=True)
 
+    # Custom hiring pipeline {stage: [next stages]}; NULL = default pipeline
+    pipeline = Column(JSON, nullable=True)
+
     users = relationship("User", back_populates="company")
     jobs = relationship("Job", back_populates="company")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -13,3 +13,8 @@ class Job(Base):
     company_id = Column(Integer, ForeignKey("companies.id"))
 
     company = relationship("Company", back_populates="jobs")
+
+    __table_args__ = (
+        # company_applications join + company_jobs listing
+        Index("ix_jobs_company_status", "company_id", "status"),
+    )
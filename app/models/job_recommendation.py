@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from app.database import Base
+
+
+class JobRecommendation(Base):
+    """
+    A candidate's precomputed job feed: the top (job_id, score) pairs, best
+    first, written by app.tasks.recommendation_tasks and read by primary key.
+    """
+    __tablename__ = "job_recommendations"
+
+    candidate_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    feed = Column(JSON, nullable=False)  # [[job_id, score], ...]
+
+    # Newest job id the feed has considered; jobs above it are merged in incrementally
+    last_job_id = Column(Integer, nullable=False, default=0)
+
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
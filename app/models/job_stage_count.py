@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, ForeignKey
+from app.database import Base
+
+
+class JobStageCount(Base):
+    """
+    Number of applications per (job, stage), kept in step with `applications`
+    by app.core.stage_counts in the same transaction as every stage change.
+    """
+    __tablename__ = "job_stage_counts"
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    stage = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from datetime import datetime
+from app.database import Base
+
+
+class OutboxMessage(Base):
+    """
+    A Celery task to publish, written in the same transaction as the change
+    that triggered it and relayed to the broker by app.tasks.outbox_relay.
+    """
+    __tablename__ = "outbox_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    task = Column(String, nullable=False)  # registered Celery task name
+    payload = Column(JSON, nullable=False)  # {"args": [...]}
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    claimed_at = Column(DateTime, nullable=True)  # in flight since, see the relay
+    dispatched_at = Column(DateTime, nullable=True, index=True)
+    failed_at = Column(DateTime, nullable=True)  # dead-lettered after OUTBOX_MAX_ATTEMPTS
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(String, nullable=True)
+
+    __table_args__ = (
+        # The relay only ever scans undispatched rows in id order
+        Index(
+            "ix_outbox_messages_pending",
+            "id",
+            postgresql_where=dispatched_at.is_(None),
+            sqlite_where=dispatched_at.is_(None),
+        ),
+        # Dead letters are rare: index only them, for the purge
+        Index(
+            "ix_outbox_messages_failed_at",
+            "failed_at",
+            postgresql_where=failed_at.isnot(None),
+            sqlite_where=failed_at.isnot(None),
+        ),
+    )
@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, Text, Enum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -22,4 +22,18 @@ class User(Base):
 
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=True)
 
+    # Candidate résumé / skills text, matched against jobs to rank applicants
+    profile = Column(Text, nullable=True)
+
+    # Bumped on role/company change or password reset to revoke issued tokens
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Recruiter digest watermark: applications created before this were emailed
+    digest_sent_until = Column(DateTime, nullable=True)
+
     company = relationship("Company", back_populates="users")
+
+    __table_args__ = (
+        # Recruiter fan-out: users of a company with a given role
+        Index("ix_users_company_role", "company_id", "role"),
+    )
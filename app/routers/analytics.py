@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_session, run_db, DbSession
+from app.models.job import Job
+from app.schemas.analytics import HiringReport
+from app.core.analytics import hiring_report, BUCKETS
+from app.core.rbac import require_role
+from app.core.security import Principal
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def _check_company(current_user: Principal, company_id: int):
+    # Admins see every company; recruiters and hiring managers their own
+    if current_user.role != "admin" and current_user.company_id != company_id:
+        raise HTTPException(status_code=403, detail="Not allowed to view this company's analytics")
+
+
+def _check_bucket(bucket: str) -> str:
+    bucket = bucket.lower()
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Bucket must be one of {list(BUCKETS)}")
+    return bucket
+
+
+# ---------------------------------------------------------
+# ✅ 1. COMPANY HIRING FUNNEL
+# ---------------------------------------------------------
+@router.get("/company/{company_id}", response_model=HiringReport)
+async def company_report(
+    company_id: int,
+    days: int = Query(90, ge=1, le=settings.ANALYTICS_MAX_DAYS),
+    bucket: str = "week",
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "hiring_manager", "admin"))
+):
+    _check_company(current_user, company_id)
+    bucket = _check_bucket(bucket)
+
+    return await run_db(db, hiring_report, company_id, None, days, bucket)
+
+
+# ---------------------------------------------------------
+# ✅ 2. JOB HIRING FUNNEL
+# ---------------------------------------------------------
+@router.get("/job/{job_id}", response_model=HiringReport)
+async def job_report(
+    job_id: int,
+    days: int = Query(90, ge=1, le=settings.ANALYTICS_MAX_DAYS),
+    bucket: str = "week",
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "hiring_manager", "admin"))
+):
+    bucket = _check_bucket(bucket)
+
+    def report(db: Session):
+        job = db.query(Job.id, Job.company_id).filter(Job.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        _check_company(current_user, job.company_id)
+        return hiring_report(db, job.company_id, job_id, days, bucket)
+
+    return await run_db(db, report)
@@ -1,89 +1,160 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import List, Optional
 
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.config import settings
+from app.database import get_session, run_db, DbSession, dialect_insert
 from app.models.application import Application
 from app.models.application_history import ApplicationHistory
 from app.models.job import Job
 from app.models.user import User
-
-from app.core.workflow import is_valid_transition, get_allowed_transitions, VALID_STAGES
+from app.schemas.application import (
+    ApplicationDetail,
+    ApplicationListItem,
+    BulkStageChange,
+    BulkStageChangeResult,
+    SkippedApplication,
+)
+
+from app.core import export, recommendations, stage_counts
+from app.core.workflow import pipeline_for_company, pipelines_for_companies
 from app.core.rbac import require_role
-from app.tasks.email_tasks import send_stage_change_email, notify_recruiter_new_application
-from app.core.security import get_current_user
+from app.core.outbox import (
+    enqueue,
+    SEND_STAGE_CHANGE_EMAIL,
+    SEND_STAGE_CHANGE_EMAILS,
+    NOTIFY_RECRUITERS_NEW_APPLICATION,
+)
+from app.core.security import get_current_principal, Principal
+from app.core.pagination import (
+    keyset_page,
+    ndjson_stream,
+    NEXT_CURSOR_HEADER,
+    NDJSON_MEDIA_TYPE,
+)
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
+# Newest applications first; id breaks ties between equal timestamps
+APPLICATION_ORDER = [Application.created_at, Application.id]
+
+# List endpoints select exactly the ApplicationListItem columns: one query per
+# page whatever its size, and no ORM objects to build
+APPLICATION_LIST_COLUMNS = (
+    Application.id,
+    Application.candidate_id,
+    Application.job_id,
+    Application.stage,
+    Application.created_at,
+    Job.title.label("job_title"),
+    User.email.label("candidate_email"),
+)
+
+
+def _application_rows(session: Session):
+    return (
+        session.query(*APPLICATION_LIST_COLUMNS)
+        .join(Job, Job.id == Application.job_id)
+        .join(User, User.id == Application.candidate_id)
+    )
+
+
+async def _list_applications(build_query, db: DbSession, response: Response, cursor, limit, stream):
+    if stream:
+        return StreamingResponse(
+            ndjson_stream(build_query, APPLICATION_ORDER, cursor, descending=True),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    applications, next_cursor = await run_db(
+        db,
+        lambda db: keyset_page(build_query(db), APPLICATION_ORDER, cursor, limit, descending=True)
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return applications
+
 
 # ---------------------------------------------------------
 # ✅ 1. CANDIDATE APPLIES TO A JOB
 # ---------------------------------------------------------
 @router.post("/apply/{job_id}")
-def apply_to_job(
+async def apply_to_job(
     job_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("candidate"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("candidate"))
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    # Prevent duplicate applications
-    existing = (
-        db.query(Application)
-        .filter(
-            Application.candidate_id == current_user.id,
-            Application.job_id == job_id
+    now = datetime.utcnow()
+    candidate_id, candidate_email = current_user.id, current_user.email
+
+    def apply(db: Session):
+        # Single statement: the job lookup, the duplicate check (unique index on
+        # candidate_id + job_id) and the insert all happen inside the database,
+        # so concurrent submissions cannot create duplicates.
+        insert_application = (
+            dialect_insert(db, Application)
+            .from_select(
+                ["candidate_id", "job_id", "stage", "created_at"],
+                select(
+                    literal(candidate_id), Job.id, literal("Applied"), literal(now)
+                ).where(Job.id == job_id)
+            )
+            .on_conflict_do_nothing(index_elements=["candidate_id", "job_id"])
+            .returning(
+                Application.id,
+                select(Job.title).where(Job.id == job_id).scalar_subquery(),
+            )
         )
-        .first()
-    )
+        inserted = db.execute(insert_application).first()
 
-    if existing:
-        raise HTTPException(status_code=400, detail="Already applied to this job")
+        if inserted is None:
+            # Nothing inserted: either the job does not exist or this is a duplicate
+            db.rollback()
+            if db.query(Job.id).filter(Job.id == job_id).first() is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+            raise HTTPException(status_code=400, detail="Already applied to this job")
 
-    # Create new application
-    application = Application(
-        candidate_id=current_user.id,
-        job_id=job_id,
-        stage="Applied"
-    )
-    db.add(application)
-    db.commit()
-    db.refresh(application)
-
-    # History entry
-    history = ApplicationHistory(
-        application_id=application.id,
-        old_stage=None,
-        new_stage="Applied",
-        changed_by=current_user.id
-    )
-    db.add(history)
-    db.commit()
-
-    # 📩 Email to candidate (Async)
-    send_stage_change_email.delay(
-        current_user.email,
-        job.title,
-        "Applied"
-    )
+        application_id, job_title = inserted
 
-    # 📩 Email to all company recruiters (Async)
-    recruiters = db.query(User).filter(
-        User.role == "recruiter",
-        User.company_id == job.company_id
-    ).all()
-
-    for r in recruiters:
-        notify_recruiter_new_application.delay(
-            r.email,
-            job.title,
-            current_user.email
-        )
+        # Pipeline counter, committed with the application
+        stage_counts.apply_deltas(db, stage_counts.moved(job_id, None, "Applied"))
+
+        # History entry, flushed and committed with the application
+        db.add(ApplicationHistory(
+            application_id=application_id,
+            old_stage=None,
+            new_stage="Applied",
+            changed_by=candidate_id,
+            changed_at=now
+        ))
+
+        # 📩 Email to candidate (Async, via the outbox relay)
+        enqueue(db, SEND_STAGE_CHANGE_EMAIL, candidate_email, job_title, "Applied")
+
+        # 📩 Email to company recruiters: one task per application, recipients
+        # resolved in the worker. In digest mode the periodic digest task
+        # picks the application up instead.
+        if settings.RECRUITER_DIGEST_MINUTES <= 0:
+            enqueue(db, NOTIFY_RECRUITERS_NEW_APPLICATION, application_id)
+
+        db.commit()
+
+        return application_id
+
+    application_id = await run_db(db, apply)
+
+    # The cached feed may still list this job
+    recommendations.forget(candidate_id)
 
     return {
         "message": "Application submitted successfully",
-        "application_id": application.id
+        "application_id": application_id
     }
 
 
@@ -91,103 +162,284 @@ def apply_to_job(
 # ✅ 2. RECRUITER OR HIRING MANAGER CHANGES STAGE
 # ---------------------------------------------------------
 @router.put("/{application_id}/stage")
-def change_stage(
+async def change_stage(
     application_id: int,
     new_stage: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter", "hiring_manager"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "hiring_manager"))
 ):
-    new_stage = new_stage.strip().title()  # Normalize stage input
-
-    if new_stage not in VALID_STAGES:
-        raise HTTPException(status_code=400, detail=f"Invalid stage: {new_stage}")
-
-    application = db.query(Application).filter(Application.id == application_id).first()
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
+    def change(db: Session):
+        # Lock the row so the transition validated below is the one applied
+        # (concurrent changes to the same application wait for this one)
+        row = (
+            db.query(Application, Job.company_id, Job.title, User.email)
+            .join(Job, Job.id == Application.job_id)
+            .join(User, User.id == Application.candidate_id)
+            .filter(Application.id == application_id)
+            .with_for_update(of=Application)
+            .first()
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Application not found")
+
+        application, company_id, job_title, candidate_email = row
+        current_stage = application.stage
+
+        # The company's pipeline (compiled and cached) decides valid stages
+        pipeline = pipeline_for_company(db, company_id)
+        target = pipeline.normalize(new_stage)  # Normalize stage input
+        if target is None:
+            raise HTTPException(status_code=400, detail=f"Invalid stage: {new_stage.strip()}")
+
+        # Validate workflow transition
+        if not pipeline.is_valid_transition(current_stage, target):
+            allowed = pipeline.allowed_transitions(current_stage)
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid transition {current_stage} → {target}. Allowed: {allowed}"
+            )
+
+        # Update stage (and the job's pipeline counters, atomically). The stage
+        # guard covers databases without FOR UPDATE (SQLite): if another
+        # request moved the application since the read, nothing matches
+        moved = db.execute(
+            update(Application)
+            .where(Application.id == application.id, Application.stage == current_stage)
+            .values(stage=target)
+            .returning(Application.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if moved is None:
+            raise HTTPException(status_code=409, detail="Application stage was changed concurrently, please retry")
+        stage_counts.apply_deltas(db, stage_counts.moved(application.job_id, current_stage, target))
+
+        # Save history entry
+        history = ApplicationHistory(
+            application_id=application.id,
+            old_stage=current_stage,
+            new_stage=target,
+            changed_by=current_user.id
+        )
+        db.add(history)
 
-    current_stage = application.stage
+        # 📩 Notify candidate asynchronously: the outbox row commits (or rolls
+        # back) together with the stage change
+        enqueue(db, SEND_STAGE_CHANGE_EMAIL, candidate_email, job_title, target)
+        db.commit()
 
-    # Validate workflow transition
-    if not is_valid_transition(current_stage, new_stage):
-        allowed = get_allowed_transitions(current_stage)
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid transition {current_stage} → {new_stage}. Allowed: {allowed}"
-        )
+        return current_stage, target
 
-    # Update stage
-    application.stage = new_stage
-    db.commit()
-    db.refresh(application)
-
-    # Save history entry
-    history = ApplicationHistory(
-        application_id=application.id,
-        old_stage=current_stage,
-        new_stage=new_stage,
-        changed_by=current_user.id
-    )
-    db.add(history)
-    db.commit()
-
-    # 📩 Notify candidate asynchronously
-    send_stage_change_email.delay(
-        application.candidate.email,
-        application.job.title,
-        new_stage
-    )
+    current_stage, new_stage = await run_db(db, change)
 
     return {
         "message": "Stage updated successfully",
-        "application_id": application.id,
+        "application_id": application_id,
         "old_stage": current_stage,
         "new_stage": new_stage
     }
 
 
 # ---------------------------------------------------------
-# ✅ 3. Candidate views their own applications
+# ✅ 3. BULK STAGE CHANGE (e.g. reject everyone left after screening)
+# ---------------------------------------------------------
+@router.put("/stage", response_model=BulkStageChangeResult)
+async def bulk_change_stage(
+    data: BulkStageChange,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "hiring_manager"))
+):
+    application_ids = list(dict.fromkeys(data.application_ids))
+    changed_by = current_user.id
+    company_id = current_user.company_id
+
+    def change(db: Session):
+        # One read: current stage plus what the notifications need, locking
+        # the rows so the validation below still holds at UPDATE time. Only
+        # the caller's company: other companies' applications are "not found".
+        # Locked in id order, so overlapping batches can't deadlock.
+        rows = (
+            db.query(
+                Application.id, Application.job_id, Application.stage,
+                Job.company_id, User.email, Job.title
+            )
+            .join(User, User.id == Application.candidate_id)
+            .join(Job, Job.id == Application.job_id)
+            .filter(Application.id.in_(application_ids), Job.company_id == company_id)
+            .order_by(Application.id)
+            .with_for_update(of=Application)
+            .all()
+        )
+        found = {row.id: row for row in rows}
+        pipelines = pipelines_for_companies(db, {row.company_id for row in rows})
+
+        # Validate each pipeline's rows in one vectorised pass
+        by_pipeline = defaultdict(list)
+        for row in rows:
+            by_pipeline[pipelines[row.company_id]].append(row)
+
+        skipped = []
+        targets = {}        # application id -> canonical target stage
+        for pipeline, group in by_pipeline.items():
+            target = pipeline.normalize(data.new_stage)
+            valid = pipeline.validate_many([row.stage for row in group], target or "")
+            for row, ok in zip(group, valid):
+                if ok:
+                    targets[row.id] = target
+                else:
+                    skipped.append(SkippedApplication(
+                        application_id=row.id,
+                        current_stage=row.stage,
+                        reason=(
+                            f"Invalid transition {row.stage} → {target}. "
+                            f"Allowed: {pipeline.allowed_transitions(row.stage)}"
+                            if target else f"Invalid stage: {data.new_stage.strip()}"
+                        )
+                    ))
+
+        if rows and not targets and all(p.normalize(data.new_stage) is None for p in by_pipeline):
+            raise HTTPException(status_code=400, detail=f"Invalid stage: {data.new_stage.strip()}")
+
+        skipped.extend(
+            SkippedApplication(application_id=application_id, reason="Application not found")
+            for application_id in application_ids if application_id not in found
+        )
+
+        # One UPDATE per target spelling (a single one unless companies spell
+        # the stage differently). Each row is guarded by the stage it was
+        # validated from, which keeps it safe without locks (SQLite)
+        ids_by_target = defaultdict(list)
+        for application_id, target in targets.items():
+            ids_by_target[target].append(application_id)
+
+        updated = []
+        for target, ids in ids_by_target.items():
+            updated += db.execute(
+                update(Application)
+                .where(tuple_(Application.id, Application.stage).in_(
+                    [(application_id, found[application_id].stage) for application_id in ids]
+                ))
+                .values(stage=target)
+                .returning(Application.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+
+        # Rows another request moved between the read and the UPDATE
+        moved = set(updated)
+        skipped.extend(
+            SkippedApplication(
+                application_id=application_id,
+                current_stage=found[application_id].stage,
+                reason="Application stage was changed concurrently, please retry"
+            )
+            for application_id in targets if application_id not in moved
+        )
+        position = {application_id: i for i, application_id in enumerate(application_ids)}
+        skipped.sort(key=lambda item: position[item.application_id])
+
+        if updated:
+            deltas = Counter()
+            for application_id in updated:
+                row = found[application_id]
+                deltas.update(stage_counts.moved(row.job_id, row.stage, targets[application_id]))
+            stage_counts.apply_deltas(db, deltas)
+
+            now = datetime.utcnow()
+            db.execute(insert(ApplicationHistory), [
+                {
+                    "application_id": application_id,
+                    "old_stage": found[application_id].stage,
+                    "new_stage": targets[application_id],
+                    "changed_by": changed_by,
+                    "changed_at": now,
+                }
+                for application_id in updated
+            ])
+
+            # 📩 One outbox message (one Celery task) for the whole batch
+            enqueue(db, SEND_STAGE_CHANGE_EMAILS, [
+                [found[application_id].email, found[application_id].title, targets[application_id]]
+                for application_id in updated
+            ])
+
+        db.commit()
+
+        new_stage = next(iter(ids_by_target), None) or data.new_stage.strip()
+        return new_stage, sorted(updated), skipped
+
+    new_stage, updated, skipped = await run_db(db, change)
+
+    return BulkStageChangeResult(new_stage=new_stage, updated=updated, skipped=skipped)
+
+
+# ---------------------------------------------------------
+# ✅ 4. Candidate views their own applications
 # ---------------------------------------------------------
-@router.get("/my")
-def my_applications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("candidate"))
+@router.get("/my", response_model=List[ApplicationListItem])
+async def my_applications(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    stream: bool = False,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("candidate"))
 ):
-    return db.query(Application).filter(
-        Application.candidate_id == current_user.id
-    ).all()
+    candidate_id = current_user.id
+
+    def build_query(session: Session):
+        return _application_rows(session).filter(
+            Application.candidate_id == candidate_id
+        )
+
+    return await _list_applications(build_query, db, response, cursor, limit, stream)
 
 
 # ---------------------------------------------------------
-# ✅ 4. Recruiter views applications for a job
+# ✅ 5. Recruiter views applications for a job
 # ---------------------------------------------------------
-@router.get("/job/{job_id}")
-def job_applications(
+@router.get("/job/{job_id}", response_model=List[ApplicationListItem])
+async def job_applications(
     job_id: int,
+    response: Response,
     stage: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    stream: bool = False,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
 ):
-    query = db.query(Application).filter(Application.job_id == job_id)
-
     if stage:
         stage = stage.strip().title()
-        query = query.filter(Application.stage == stage)
 
-    return query.all()
+    def build_query(session: Session):
+        query = _application_rows(session).filter(Application.job_id == job_id)
+        if stage:
+            query = query.filter(Application.stage == stage)
+        return query
+
+    return await _list_applications(build_query, db, response, cursor, limit, stream)
 
 
 # ---------------------------------------------------------
-# ✅ 5. View application by ID
+# ✅ 6. View application by ID
 # ---------------------------------------------------------
-@router.get("/{application_id}")
-def get_application(
+@router.get("/{application_id}", response_model=ApplicationDetail)
+async def get_application(
     application_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    application = db.query(Application).filter(Application.id == application_id).first()
+    # Two queries: application + job + candidate joined, history via selectin
+    application = await run_db(
+        db,
+        lambda db: db.query(Application)
+        .options(
+            joinedload(Application.job),
+            joinedload(Application.candidate),
+            selectinload(Application.history),
+        )
+        .filter(Application.id == application_id)
+        .first()
+    )
 
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
@@ -200,17 +452,48 @@ def get_application(
 
 
 # ---------------------------------------------------------
-# ✅ 6. Hiring manager views all company applications
+# ✅ 7. Hiring manager views all company applications
 # ---------------------------------------------------------
-@router.get("/company/{company_id}")
-def company_applications(
+@router.get("/company/{company_id}", response_model=List[ApplicationListItem])
+async def company_applications(
     company_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager"))
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    stream: bool = False,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("hiring_manager"))
 ):
-    return (
-        db.query(Application)
-        .join(Job)
-        .filter(Job.company_id == company_id)
-        .all()
+    def build_query(session: Session):
+        return _application_rows(session).filter(Job.company_id == company_id)
+
+    return await _list_applications(build_query, db, response, cursor, limit, stream)
+
+
+# ---------------------------------------------------------
+# ✅ 8. Compliance export of all company applications (+ history)
+# ---------------------------------------------------------
+@router.get("/company/{company_id}/export")
+async def export_company_applications(
+    company_id: int,
+    format: str = "csv",
+    gzip: bool = False,
+    after_id: Optional[int] = Query(None, ge=0),
+    current_user: Principal = Depends(require_role("hiring_manager", "admin"))
+):
+    fmt = format.lower()
+    if fmt not in export.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of {list(export.FORMATS)}")
+
+    if current_user.role != "admin" and current_user.company_id != company_id:
+        raise HTTPException(status_code=403, detail="Not allowed to export this company's applications")
+
+    # Streamed through a server-side cursor in application id order; resume
+    # an interrupted download with ?after_id=<last complete application_id>
+    return StreamingResponse(
+        export.export_stream(company_id, fmt, after_id, gzip),
+        media_type="application/gzip" if gzip else export.MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export.filename(company_id, fmt, after_id, gzip)}"'
+        },
     )
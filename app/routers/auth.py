@@ -1,64 +1,56 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
 from datetime import timedelta
 
-from app.database import get_db
+from app.database import get_session, run_db, DbSession
 from app.models.user import User
-from app.schemas.user import UserCreate, UserLogin
+from app.models.application import Application
+from app.schemas.user import ProfileUpdate, UserCreate, UserLogin
 from app.core.security import (
-    create_access_token,
+    create_user_token,
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    Principal,
 )
+from app.core.passwords import password_hasher
+from app.core.rbac import require_role
+from app.core import matching
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-# ---------------------------------------------------------
-# 🔐 Hash Password
-# ---------------------------------------------------------
-def hash_password(password: str):
-    return pwd_context.hash(password)
-
-
-# ---------------------------------------------------------
-# 🔐 Verify Password
-# ---------------------------------------------------------
-def verify_password(plain: str, hashed: str):
-    return pwd_context.verify(plain, hashed)
-
 
 # ---------------------------------------------------------
 # ✅ 1. REGISTER USER (Candidate / Recruiter / Hiring Manager)
 # ---------------------------------------------------------
 @router.post("/register")
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: DbSession = Depends(get_session)):
 
     # Check if email exists
-    existing = db.query(User).filter(User.email == user.email).first()
+    existing = await run_db(db, lambda db: db.query(User.id).filter(User.email == user.email).first())
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    # Hash password
-    hashed_pw = hash_password(user.password)
+    # Hash password in the bcrypt process pool (503 when saturated)
+    hashed_pw = await password_hasher.hash(user.password)
 
     new_user = User(
         full_name=user.full_name,
         email=user.email,
         password_hash=hashed_pw,
         role=user.role,
-        company_id=user.company_id  # recruiter/hiring_manager can belong to a company
+        # No company at sign-up: recruiters create one (POST /company/) or are
+        # added by a member of it (POST /company/{id}/members)
+        profile=user.profile
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    def save(db: Session):
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+        return new_user.id
 
     return {
         "message": "User registered successfully",
-        "user_id": new_user.id
+        "user_id": await run_db(db, save)
     }
 
 
@@ -66,26 +58,58 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
 # ✅ 2. LOGIN & GET JWT TOKEN
 # ---------------------------------------------------------
 @router.post("/login")
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: DbSession = Depends(get_session)):
 
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await run_db(db, lambda db: db.query(User).filter(User.email == user.email).first())
 
     if not db_user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
-    if not verify_password(user.password, db_user.password_hash):
+    valid, new_hash = await password_hasher.verify_and_update(user.password, db_user.password_hash)
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     # Create token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    token = create_access_token(
-        data={"user_id": db_user.id, "role": db_user.role},
-        expires_delta=access_token_expires
-    )
+    token = create_user_token(db_user, expires_delta=access_token_expires)
 
-    return {
+    response = {
         "access_token": token,
         "token_type": "bearer",
         "role": db_user.role,
         "user_id": db_user.id
     }
+
+    # Stored hash uses an outdated cost factor: upgrade it transparently
+    if new_hash:
+        def rehash(db: Session):
+            db_user.password_hash = new_hash
+            db.commit()
+
+        await run_db(db, rehash)
+
+    return response
+
+
+# ---------------------------------------------------------
+# ✅ 3. CANDIDATE UPDATES THEIR PROFILE (used to rank applicants)
+# ---------------------------------------------------------
+@router.put("/me/profile")
+async def update_profile(
+    data: ProfileUpdate,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("candidate"))
+):
+    def update(db: Session):
+        db.query(User).filter(User.id == current_user.id).update(
+            {User.profile: data.profile}, synchronize_session=False
+        )
+        db.commit()
+        return [job_id for (job_id,) in db.query(Application.job_id).filter(
+            Application.candidate_id == current_user.id
+        )]
+
+    # Applicant indexes of the jobs applied to hold the old text
+    matching.forget_jobs(await run_db(db, update))
+
+    return {"message": "Profile updated successfully"}
@@ -1,11 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_session, run_db, DbSession
 from app.models.company import Company
 from app.models.user import User
-from app.core.security import get_current_user
-from app.core.rbac import require_role
+from app.schemas.company import CompanyMemberAdd, CompanyOut
+from app.core.security import get_current_principal, Principal, create_user_token, revoke_user_tokens
+from app.core.rbac import require_role, require_user_role
+from app.core import listing_cache
+from app.core.workflow import (
+    DEFAULT_PIPELINE,
+    compile_pipeline,
+    pipeline_cache,
+    pipeline_for_company,
+)
+from app.core.pagination import (
+    keyset_page,
+    ndjson_stream,
+    NEXT_CURSOR_HEADER,
+    NDJSON_MEDIA_TYPE,
+)
 
 router = APIRouter(prefix="/company", tags=["Company"])
 
@@ -14,68 +32,83 @@ router = APIRouter(prefix="/company", tags=["Company"])
 # ✅ 1. CREATE COMPANY — Recruiter Only
 # ---------------------------------------------------------
 @router.post("/")
-def create_company(
+async def create_company(
     data: dict,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    db: DbSession = Depends(get_session),
+    current_user: User = Depends(require_user_role("recruiter"))
 ):
     name = data.get("name")
-    description = data.get("description")
+    domain = data.get("domain")
 
     if not name:
         raise HTTPException(status_code=400, detail="Company name is required")
 
-    # Check if company already exists
-    existing = db.query(Company).filter(Company.name == name).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Company already exists")
+    def create(db: Session):
+        # Check if company already exists
+        existing = db.query(Company).filter(Company.name == name).first()
+        if existing:
+            raise HTTPException(status_code=400, detail="Company already exists")
 
-    company = Company(
-        name=name,
-        description=description
-    )
+        company = Company(
+            name=name,
+            domain=domain
+        )
 
-    db.add(company)
-    db.commit()
-    db.refresh(company)
+        db.add(company)
+        db.commit()
+        db.refresh(company)
 
-    # Assign recruiter to this company (useful for ATS workflow)
-    current_user.company_id = company.id
-    db.commit()
+        # Assign recruiter to this company (useful for ATS workflow).
+        # The recruiter's company lives in their token claims, so revoke the old
+        # token and hand back one that carries the new company.
+        current_user.company_id = company.id
+        revoke_user_tokens(current_user, db)
 
-    return {
-        "message": "Company created successfully",
-        "company_id": company.id
-    }
+        return {
+            "message": "Company created successfully",
+            "company_id": company.id,
+            "access_token": create_user_token(current_user),
+            "token_type": "bearer"
+        }
+
+    result = await run_db(db, create)
+    await listing_cache.invalidate(listing_cache.COMPANIES)
+
+    return result
 
 
 # ---------------------------------------------------------
 # ✅ 2. UPDATE COMPANY — Recruiter Only (same company)
 # ---------------------------------------------------------
 @router.put("/{company_id}")
-def update_company(
+async def update_company(
     company_id: int,
     updates: dict,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
 ):
-    company = db.query(Company).filter(Company.id == company_id).first()
+    def update(db: Session):
+        company = db.query(Company).filter(Company.id == company_id).first()
 
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
 
-    # Recruiter must belong to same company
-    if company.id != current_user.company_id:
-        raise HTTPException(status_code=403, detail="Not allowed to modify this company")
+        # Recruiter must belong to same company
+        if company.id != current_user.company_id:
+            raise HTTPException(status_code=403, detail="Not allowed to modify this company")
 
-    if "name" in updates:
-        company.name = updates["name"]
+        if "name" in updates:
+            company.name = updates["name"]
 
-    if "description" in updates:
-        company.description = updates["description"]
+        if "domain" in updates:
+            company.domain = updates["domain"]
 
-    db.commit()
-    db.refresh(company)
+        db.commit()
+        db.refresh(company)
+        return company
+
+    company = await run_db(db, update)
+    await listing_cache.invalidate(listing_cache.COMPANIES)
 
     return {
         "message": "Company updated successfully",
@@ -87,21 +120,25 @@ def update_company(
 # ✅ 3. DELETE COMPANY — Recruiter Only (same company)
 # ---------------------------------------------------------
 @router.delete("/{company_id}")
-def delete_company(
+async def delete_company(
     company_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
 ):
-    company = db.query(Company).filter(Company.id == company_id).first()
+    def delete(db: Session):
+        company = db.query(Company).filter(Company.id == company_id).first()
+
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
 
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
+        if company.id != current_user.company_id:
+            raise HTTPException(status_code=403, detail="Not allowed to delete this company")
 
-    if company.id != current_user.company_id:
-        raise HTTPException(status_code=403, detail="Not allowed to delete this company")
+        db.delete(company)
+        db.commit()
 
-    db.delete(company)
-    db.commit()
+    await run_db(db, delete)
+    await listing_cache.invalidate(listing_cache.COMPANIES, listing_cache.JOBS)
 
     return {"message": "Company deleted successfully"}
 
@@ -109,25 +146,135 @@ def delete_company(
 # ---------------------------------------------------------
 # ✅ 4. GET COMPANY BY ID — Everyone Can View
 # ---------------------------------------------------------
-@router.get("/{company_id}")
-def get_company(
+@router.get("/{company_id}", response_model=CompanyOut)
+async def get_company(
     company_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    company = db.query(Company).filter(Company.id == company_id).first()
+    async def load():
+        company = await run_db(db, lambda db: db.query(Company).filter(Company.id == company_id).first())
+
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
 
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
+        return CompanyOut.model_validate(company), {}
 
-    return company
+    return await listing_cache.cached(request, listing_cache.COMPANIES, load)
 
 
 # ---------------------------------------------------------
 # ✅ 5. LIST ALL COMPANIES — Anyone Can View
 # ---------------------------------------------------------
-@router.get("/")
-def list_companies(
-    db: Session = Depends(get_db)
+@router.get("/", response_model=List[CompanyOut])
+async def list_companies(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    stream: bool = False,
+    db: DbSession = Depends(get_session)
+):
+    if stream:
+        return StreamingResponse(
+            ndjson_stream(lambda session: session.query(Company), [Company.id], cursor),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    async def load():
+        companies, next_cursor = await run_db(
+            db, lambda db: keyset_page(db.query(Company), [Company.id], cursor, limit)
+        )
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return [CompanyOut.model_validate(company) for company in companies], headers
+
+    return await listing_cache.cached(request, listing_cache.COMPANIES, load)
+
+
+# ---------------------------------------------------------
+# ✅ 6. GET COMPANY HIRING PIPELINE — Everyone Can View
+# ---------------------------------------------------------
+@router.get("/{company_id}/pipeline")
+async def get_company_pipeline(
+    company_id: int,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    return db.query(Company).all()
+    pipeline = await run_db(db, pipeline_for_company, company_id)
+
+    return {"company_id": company_id, "stages": list(pipeline.stages), "transitions": pipeline.to_dict()}
+
+
+# ---------------------------------------------------------
+# ✅ 7. SET COMPANY HIRING PIPELINE — Recruiter Only (same company)
+# ---------------------------------------------------------
+@router.put("/{company_id}/pipeline")
+async def set_company_pipeline(
+    company_id: int,
+    transitions: Optional[Dict[str, List[str]]] = Body(None),
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
+):
+    if company_id != current_user.company_id:
+        raise HTTPException(status_code=403, detail="Not allowed to modify this company")
+
+    # null/empty body resets the company to the default pipeline
+    pipeline = DEFAULT_PIPELINE
+    if transitions:
+        try:
+            pipeline = compile_pipeline(transitions)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid pipeline: {e}")
+
+    def update(db: Session):
+        company = db.query(Company).filter(Company.id == company_id).first()
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+
+        company.pipeline = pipeline.to_dict() if transitions else None
+        db.commit()
+
+    await run_db(db, update)
+    pipeline_cache.invalidate(company_id)
+    await listing_cache.invalidate(listing_cache.COMPANIES)
+
+    return {"company_id": company_id, "stages": list(pipeline.stages), "transitions": pipeline.to_dict()}
+
+
+# ---------------------------------------------------------
+# ✅ 8. ADD COMPANY MEMBER — Recruiter (same company) or Admin
+# ---------------------------------------------------------
+@router.post("/{company_id}/members")
+async def add_company_member(
+    company_id: int,
+    member: CompanyMemberAdd,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "admin"))
+):
+    if current_user.role != "admin" and company_id != current_user.company_id:
+        raise HTTPException(status_code=403, detail="Not allowed to modify this company")
+
+    def add(db: Session):
+        if not db.query(Company.id).filter(Company.id == company_id).first():
+            raise HTTPException(status_code=404, detail="Company not found")
+
+        user = db.query(User).filter(User.email == member.email).first()
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        if getattr(user.role, "value", user.role) not in ("recruiter", "hiring_manager"):
+            raise HTTPException(status_code=400, detail="Only recruiters and hiring managers can join a company")
+        if user.company_id is not None and current_user.role != "admin":
+            raise HTTPException(status_code=409, detail="User already belongs to a company")
+
+        # Role and company live in token claims: revoke the member's old tokens
+        user.company_id = company_id
+        user.role = member.role
+        revoke_user_tokens(user, db)
+        return user.id
+
+    return {
+        "message": "Member added successfully",
+        "company_id": company_id,
+        "user_id": await run_db(db, add),
+        "role": member.role
+    }
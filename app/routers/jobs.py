@@ -1,11 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
+import io
+import tempfile
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_session, run_db, DbSession, SessionLocal
+from app.models.application import Application
 from app.models.job import Job
 from app.models.user import User
+from app.schemas.job import (
+    JobImportResult,
+    JobOut,
+    JobPipeline,
+    JobSearchResult,
+    RankedApplicant,
+    RecommendedJob,
+    StageCount,
+)
 from app.core.rbac import require_role
-from app.core.security import get_current_user
+from app.core.security import get_current_principal, Principal
+from app.core.search import search_index, search_jobs
+from app.core.stage_counts import counts_for_job
+from app.core.workflow import pipeline_for_company
+from app.core import job_import, listing_cache, matching, recommendations
+from app.core.outbox import (
+    enqueue,
+    ADD_NEW_JOBS_TO_RECOMMENDATIONS,
+    REFRESH_CANDIDATE_RECOMMENDATIONS,
+)
+from app.core.pagination import (
+    keyset_page,
+    ndjson_stream,
+    NEXT_CURSOR_HEADER,
+    NDJSON_MEDIA_TYPE,
+)
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
@@ -14,10 +46,10 @@ router = APIRouter(prefix="/jobs", tags=["Jobs"])
 # ✅ 1. CREATE JOB — Recruiter Only
 # ---------------------------------------------------------
 @router.post("/")
-def create_job(
+async def create_job(
     job_data: dict,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
 ):
     # Recruiter must belong to a company
     if not current_user.company_id:
@@ -33,13 +65,21 @@ def create_job(
     if job.status not in ["open", "closed"]:
         raise HTTPException(status_code=400, detail="Status must be 'open' or 'closed'")
 
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    def save(db: Session):
+        db.add(job)
+        if job.status == "open":
+            # Merged into stored candidate feeds by a Celery task
+            enqueue(db, ADD_NEW_JOBS_TO_RECOMMENDATIONS)
+        db.commit()
+        db.refresh(job)
+        return job.id
+
+    job_id = await run_db(db, save)
+    await listing_cache.invalidate(listing_cache.JOBS)
 
     return {
         "message": "Job created successfully",
-        "job_id": job.id
+        "job_id": job_id
     }
 
 
@@ -47,37 +87,42 @@ def create_job(
 # ✅ 2. UPDATE JOB — Recruiter Only (same company)
 # ---------------------------------------------------------
 @router.put("/{job_id}")
-def update_job(
+async def update_job(
     job_id: int,
     updates: dict,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-
-    # Recruiter must belong to same company
-    if job.company_id != current_user.company_id:
-        raise HTTPException(status_code=403, detail="Not allowed to modify this job")
-
-    # Update fields
-    if "title" in updates:
-        job.title = updates["title"]
-    if "description" in updates:
-        job.description = updates["description"]
-    if "status" in updates:
-        status = updates["status"].lower()
-        if status not in ["open", "closed"]:
-            raise HTTPException(status_code=400, detail="Status must be 'open' or 'closed'")
-        job.status = status
+    def update(db: Session):
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
 
-    db.commit()
-    db.refresh(job)
+        # Recruiter must belong to same company
+        if job.company_id != current_user.company_id:
+            raise HTTPException(status_code=403, detail="Not allowed to modify this job")
+
+        # Update fields
+        if "title" in updates:
+            job.title = updates["title"]
+        if "description" in updates:
+            job.description = updates["description"]
+        if "status" in updates:
+            status = updates["status"].lower()
+            if status not in ["open", "closed"]:
+                raise HTTPException(status_code=400, detail="Status must be 'open' or 'closed'")
+            job.status = status
+
+        db.commit()
+        db.refresh(job)
+        return job
+
+    updated_job = await run_db(db, update)
+    await listing_cache.invalidate(listing_cache.JOBS)
 
     return {
         "message": "Job updated successfully",
-        "updated_job": job
+        "updated_job": updated_job
     }
 
 
@@ -85,68 +130,284 @@ def update_job(
 # ✅ 3. DELETE JOB — Recruiter Only (same company)
 # ---------------------------------------------------------
 @router.delete("/{job_id}")
-def delete_job(
+async def delete_job(
     job_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("recruiter"))
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter"))
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    def delete(db: Session):
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        if job.company_id != current_user.company_id:
+            raise HTTPException(status_code=403, detail="Not allowed to delete this job")
 
-    if job.company_id != current_user.company_id:
-        raise HTTPException(status_code=403, detail="Not allowed to delete this job")
+        db.delete(job)
+        db.commit()
 
-    db.delete(job)
-    db.commit()
+    await run_db(db, delete)
+    await listing_cache.invalidate(listing_cache.JOBS)
 
     return {"message": "Job deleted successfully"}
 
 
 # ---------------------------------------------------------
-# ✅ 4. GET JOB BY ID — Everyone Can View
+# ✅ 4. SEARCH JOBS BY KEYWORD — Everyone Can Search
+# ---------------------------------------------------------
+@router.get("/search", response_model=List[JobSearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    status: str = "open",
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: DbSession = Depends(get_session)
+):
+    status = status.lower()
+    if status not in ["open", "closed", "all"]:
+        raise HTTPException(status_code=400, detail="Status must be 'open', 'closed' or 'all'")
+
+    # Ranked best match first; X-Next-Cursor continues after the last result
+    rows, next_cursor = await run_db(
+        db, search_jobs, q, None if status == "all" else status, cursor, limit
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return [
+        JobSearchResult(
+            id=job.id,
+            title=job.title,
+            description=job.description,
+            status=job.status,
+            company_id=job.company_id,
+            rank=rank
+        )
+        for job, rank in rows
+    ]
+
+
+# ---------------------------------------------------------
+# ✅ 11. RECOMMENDED JOBS — Candidate's precomputed feed
+# (declared before /{job_id} so the path is not parsed as an id)
 # ---------------------------------------------------------
-@router.get("/{job_id}")
-def get_job(
+@router.get("/recommended", response_model=List[RecommendedJob])
+async def recommended_jobs(
+    limit: int = Query(20, ge=1, le=settings.RECOMMENDATIONS_TOP_N),
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("candidate"))
+):
+    def load(db: Session):
+        feed = recommendations.feed(db, current_user.id)
+        if feed is None:
+            # Never computed (new candidate): compute in the background
+            enqueue(db, REFRESH_CANDIDATE_RECOMMENDATIONS, current_user.id)
+            db.commit()
+            recommendations.remember_pending(current_user.id)
+            return []
+        return feed[:limit]
+
+    return await run_db(db, load)
+
+
+# ---------------------------------------------------------
+# ✅ 5. GET JOB BY ID — Everyone Can View
+# ---------------------------------------------------------
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(
     job_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    async def load():
+        job = await run_db(db, lambda db: db.query(Job).filter(Job.id == job_id).first())
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return JobOut.model_validate(job), {}
 
-    return job
+    return await listing_cache.cached(request, listing_cache.JOBS, load)
 
 
 # ---------------------------------------------------------
-# ✅ 5. LIST ALL JOBS — Everyone Can View
+# ✅ 6. LIST ALL JOBS — Everyone Can View
 # ---------------------------------------------------------
-@router.get("/")
-def list_jobs(
+@router.get("/", response_model=List[JobOut])
+async def list_jobs(
+    request: Request,
     status: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    stream: bool = False,
+    db: DbSession = Depends(get_session)
 ):
-    query = db.query(Job)
-
     if status:
         status = status.lower()
         if status not in ["open", "closed"]:
             raise HTTPException(status_code=400, detail="Status must be 'open' or 'closed'")
-        query = query.filter(Job.status == status)
 
-    return query.all()
+    def build_query(session: Session):
+        query = session.query(Job)
+        if status:
+            query = query.filter(Job.status == status)
+        return query
+
+    if stream:
+        return StreamingResponse(
+            ndjson_stream(build_query, [Job.id], cursor),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
+    async def load():
+        jobs, next_cursor = await run_db(
+            db, lambda db: keyset_page(build_query(db), [Job.id], cursor, limit)
+        )
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return [JobOut.model_validate(job) for job in jobs], headers
+
+    # Cached per query string; job writes invalidate, ETag gives 304s
+    return await listing_cache.cached(request, listing_cache.JOBS, load)
 
 
 # ---------------------------------------------------------
-# ✅ 6. HIRING MANAGER — View all jobs in their company
+# ✅ 7. HIRING MANAGER — View all jobs in their company
 # ---------------------------------------------------------
 @router.get("/company/all")
-def company_jobs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_role("hiring_manager"))
+async def company_jobs(
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("hiring_manager"))
 ):
     if not current_user.company_id:
         raise HTTPException(status_code=400, detail="Hiring manager is not assigned to any company")
 
-    return db.query(Job).filter(Job.company_id == current_user.company_id).all()
+    return await run_db(
+        db, lambda db: db.query(Job).filter(Job.company_id == current_user.company_id).all()
+    )
+
+
+# ---------------------------------------------------------
+# ✅ 8. JOB PIPELINE — Applicants per stage (same company)
+# ---------------------------------------------------------
+@router.get("/{job_id}/pipeline", response_model=JobPipeline)
+async def job_pipeline(
+    job_id: int,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "hiring_manager"))
+):
+    def load(db: Session):
+        company_id = db.query(Job.company_id).filter(Job.id == job_id).scalar()
+        if company_id is None and not db.query(Job.id).filter(Job.id == job_id).first():
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        if company_id != current_user.company_id:
+            raise HTTPException(status_code=403, detail="Not allowed to view this job")
+
+        # Precomputed counters: one row per stage, however many applicants
+        return pipeline_for_company(db, company_id), dict(counts_for_job(db, job_id))
+
+    pipeline, counts = await run_db(db, load)
+
+    # Every pipeline stage in order (zero if empty), then any stage the
+    # pipeline no longer has but applications still sit in
+    stages = [StageCount(stage=stage, count=counts.pop(stage, 0)) for stage in pipeline.stages]
+    stages += [StageCount(stage=stage, count=count) for stage, count in sorted(counts.items()) if count]
+
+    return JobPipeline(job_id=job_id, total=sum(s.count for s in stages), stages=stages)
+
+
+# ---------------------------------------------------------
+# ✅ 9. BULK IMPORT JOBS (CSV / NDJSON body) — Recruiter Only
+# ---------------------------------------------------------
+@router.post("/import", response_model=JobImportResult)
+async def bulk_import_jobs(
+    request: Request,
+    format: Optional[str] = None,
+    current_user: Principal = Depends(require_role("recruiter"))
+):
+    if not current_user.company_id:
+        raise HTTPException(status_code=400, detail="Recruiter is not assigned to any company")
+
+    fmt = (format or ("ndjson" if "json" in request.headers.get("content-type", "") else "csv")).lower()
+    if fmt not in job_import.FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of {list(job_import.FORMATS)}")
+
+    # Spool the body (in memory up to 1 MB, then on disk) instead of holding it
+    upload = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > settings.IMPORT_MAX_BYTES:
+            upload.close()
+            raise HTTPException(status_code=413, detail=f"Import file exceeds {settings.IMPORT_MAX_BYTES} bytes")
+        upload.write(chunk)
+    upload.seek(0)
+
+    company_id = current_user.company_id
+
+    def run():
+        # COPY needs the sync (psycopg2) connection, even when DB_ASYNC is on
+        db = SessionLocal()
+        try:
+            text = io.TextIOWrapper(upload, encoding="utf-8-sig", errors="replace", newline="")
+            result = job_import.import_jobs(db, text, fmt, company_id)
+            if result["imported"]:
+                enqueue(db, ADD_NEW_JOBS_TO_RECOMMENDATIONS)
+                db.commit()
+            return result
+        finally:
+            db.close()
+            upload.close()
+
+    result = await run_in_threadpool(run)
+
+    if result["imported"]:
+        # Rows went in through Core, past the ORM events
+        search_index.invalidate()
+        await listing_cache.invalidate(listing_cache.JOBS)
+
+    return result
+
+
+# ---------------------------------------------------------
+# ✅ 10. APPLICANTS RANKED BY PROFILE MATCH (same company)
+# ---------------------------------------------------------
+@router.get("/{job_id}/applications/ranked", response_model=List[RankedApplicant])
+async def ranked_applications(
+    job_id: int,
+    limit: int = Query(20, ge=1, le=settings.RANKED_APPLICANTS_MAX),
+    stage: Optional[str] = None,
+    db: DbSession = Depends(get_session),
+    current_user: Principal = Depends(require_role("recruiter", "hiring_manager"))
+):
+    if stage:
+        stage = stage.strip().title()
+
+    def rank(db: Session):
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+
+        if job.company_id != current_user.company_id:
+            raise HTTPException(status_code=403, detail="Not allowed to view this job")
+
+        # Top-k from the job's applicant index; details for those k only
+        top = matching.rank_applicants(db, job, limit, stage)
+        rows = {
+            row.application_id: row
+            for row in db.query(
+                Application.id.label("application_id"),
+                Application.candidate_id,
+                User.email.label("candidate_email"),
+                User.full_name.label("candidate_name"),
+                Application.stage,
+            )
+            .join(User, User.id == Application.candidate_id)
+            .filter(Application.id.in_([application_id for application_id, _ in top]))
+        }
+        return [
+            RankedApplicant(**rows[application_id]._asdict(), score=score)
+            for application_id, score in top if application_id in rows
+        ]
+
+    return await run_db(db, rank)
@@ -0,0 +1,36 @@
+from datetime import datetime
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class FunnelStage(BaseModel):
+    stage: str
+    reached: int  # applications in the window that ever entered the stage
+    rate: Optional[float]  # reached / applications that entered the pipeline
+    step_rate: Optional[float]  # reached / reached of the previous stage, when it feeds this one
+
+
+class StageDuration(BaseModel):
+    stage: str
+    stints: int  # completed stays in the stage
+    mean_hours: float
+    median_hours: float
+    p90_hours: float
+
+
+class ThroughputPoint(BaseModel):
+    period: str  # first day of the period (ISO date)
+    stage: str
+    count: int
+
+
+class HiringReport(BaseModel):
+    company_id: int
+    job_id: Optional[int] = None
+    since: datetime
+    until: datetime
+    bucket: str
+    applications: int
+    funnel: List[FunnelStage]
+    time_in_stage: List[StageDuration]
+    throughput: List[ThroughputPoint]
@@ -0,0 +1,71 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class ApplicationOut(BaseModel):
+    id: int
+    candidate_id: int
+    job_id: int
+    stage: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ApplicationListItem(ApplicationOut):
+    """List row: one flat projection, no ORM objects behind it."""
+    job_title: str
+    candidate_email: str
+
+
+class JobSummary(BaseModel):
+    id: int
+    title: str
+    company_id: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class CandidateSummary(BaseModel):
+    id: int
+    email: str
+    full_name: str
+
+    class Config:
+        from_attributes = True
+
+
+class ApplicationHistoryOut(BaseModel):
+    old_stage: Optional[str]
+    new_stage: str
+    changed_by: Optional[int]
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ApplicationDetail(ApplicationOut):
+    job: JobSummary
+    candidate: CandidateSummary
+    history: List[ApplicationHistoryOut]
+
+
+class BulkStageChange(BaseModel):
+    application_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    new_stage: str
+
+
+class SkippedApplication(BaseModel):
+    application_id: int
+    current_stage: Optional[str] = None  # None when the application does not exist
+    reason: str
+
+
+class BulkStageChangeResult(BaseModel):
+    new_stage: str
+    updated: List[int]
+    skipped: List[SkippedApplication]
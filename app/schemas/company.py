@@ -0,0 +1,17 @@
+from pydantic import BaseModel, EmailStr
+from typing import Dict, List, Literal, Optional
+
+
+class CompanyOut(BaseModel):
+    id: int
+    name: str
+    domain: Optional[str] = None
+    pipeline: Optional[Dict[str, List[str]]] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CompanyMemberAdd(BaseModel):
+    email: EmailStr
+    role: Literal["recruiter", "hiring_manager"]
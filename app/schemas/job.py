@@ -1,11 +1,12 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 
 class JobCreate(BaseModel):
-    title: str
+    title: str = Field(..., min_length=1)
     description: Optional[str] = None
     company_id: int
+    status: Literal["open", "closed"] = "open"
 
 
 class JobUpdate(BaseModel):
@@ -20,7 +21,49 @@ class JobOut(BaseModel):
     title: str
     description: Optional[str]
     status: str
-    company_id: int
+    company_id: Optional[int]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class JobSearchResult(JobOut):
+    rank: float
+
+
+class RecommendedJob(JobOut):
+    score: float  # cosine similarity to the candidate's applications and profile
+
+
+class StageCount(BaseModel):
+    stage: str
+    count: int
+
+
+class JobPipeline(BaseModel):
+    job_id: int
+    total: int
+    stages: List[StageCount]  # in pipeline order
+
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row (CSV header not counted) / NDJSON line
+    errors: List[str]
+
+
+class JobImportResult(BaseModel):
+    received: int
+    imported: int
+    failed: int
+    method: str  # "copy" or "executemany"
+    errors: List[ImportRowError]
+    errors_truncated: bool = False
+
+
+class RankedApplicant(BaseModel):
+    application_id: int
+    candidate_id: int
+    candidate_email: str
+    candidate_name: str
+    stage: Optional[str]
+    score: float  # BM25 of the candidate profile against the job
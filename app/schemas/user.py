@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from enum import Enum
+from typing import Optional
 
 
 class UserRole(str, Enum):
@@ -13,6 +14,7 @@ class UserCreate(BaseModel):
     password: str
     full_name: str
     role: UserRole
+    profile: Optional[str] = Field(None, max_length=20000)
 
 
 class UserLogin(BaseModel):
@@ -28,3 +30,7 @@ class UserResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProfileUpdate(BaseModel):
+    profile: str = Field(..., max_length=20000)
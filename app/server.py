@@ -0,0 +1,88 @@
+"""
+Production entrypoint: checks (or migrates) the schema once, then serves
+app.main:app from several uvicorn worker processes.
+
+    python -m app.server                  # WEB_CONCURRENCY workers on HOST:PORT
+    python -m app.server --migrate        # alembic upgrade head first
+    python -m app.server --workers 8 --port 8080
+
+Handlers are async and hand blocking work to threads and the hashing
+processes, so one worker per CPU core is the default. With
+DB_MAX_CONNECTIONS set, the worker count is capped so every worker's
+pool (DB_POOL_SIZE + DB_MAX_OVERFLOW) fits in the database.
+
+On SIGTERM or Ctrl-C each worker stops accepting connections, finishes
+in-flight requests for up to GRACEFUL_TIMEOUT_SECONDS, then runs the
+lifespan shutdown (app.core.lifecycle), so rolling deploys don't cut off
+applications mid-request.
+"""
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from app.config import settings
+from app.core import lifecycle
+
+logger = logging.getLogger("app.server")
+
+
+def cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # respects container CPU pinning
+    except AttributeError:  # not on Linux
+        return os.cpu_count() or 1
+
+
+def worker_count(requested: int = 0) -> int:
+    workers = requested or settings.WEB_CONCURRENCY or cpu_count()
+
+    per_worker = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if settings.DB_ASYNC:
+        per_worker *= 2  # the sync engine still serves streaming, exports and imports
+    if settings.DB_MAX_CONNECTIONS and not settings.DB_PGBOUNCER and workers * per_worker > settings.DB_MAX_CONNECTIONS:
+        capped = max(1, settings.DB_MAX_CONNECTIONS // per_worker)
+        logger.warning(
+            "%s workers x %s connections exceed DB_MAX_CONNECTIONS=%s; starting %s",
+            workers, per_worker, settings.DB_MAX_CONNECTIONS, capped,
+        )
+        workers = capped
+    return workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the ATS API in production")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=0, help="default: WEB_CONCURRENCY, else one per CPU core")
+    parser.add_argument("--migrate", action="store_true", help="run alembic upgrade head before starting")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(levelname)s:     %(name)s - %(message)s")
+
+    # Once, in the supervisor, before any worker imports the app
+    if args.migrate:
+        lifecycle.migrate()
+    lifecycle.check_schema()
+    lifecycle.engine.dispose()  # workers open their own pools
+
+    workers = worker_count(args.workers)
+    logger.info("Starting %s worker(s) on %s:%s", workers, args.host, args.port)
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT_SECONDS,
+        timeout_keep_alive=settings.KEEP_ALIVE_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+        log_level=args.log_level,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,31 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+
 from celery import shared_task
-from app.core.email import send_email  # actual email sending function
+from sqlalchemy import or_
+
+from app.config import settings
+from app.core.email import send_email, deliver_email  # actual email sending functions
+from app.database import SessionLocal
+from app.models.application import Application
+from app.models.job import Job
+from app.models.user import User
 
 
 @shared_task
 def send_stage_change_email(to_email: str, job_title: str, new_stage: str):
     subject = f"Application Update: {job_title}"
     message = f"Your application stage has changed to: {new_stage}"
-    send_email(to_email, subject, message)
+    # Already running in a worker: send now instead of queueing a second task
+    deliver_email(to_email, subject, message)
+
+
+@shared_task
+def send_stage_change_emails(notifications):
+    """Batch of (to_email, job_title, new_stage) from a bulk stage change."""
+    for to_email, job_title, new_stage in notifications:
+        send_stage_change_email(to_email, job_title, new_stage)
+    return len(notifications)
 
 
 @shared_task
@@ -14,3 +33,130 @@ def notify_recruiter_new_application(recruiter_email: str, job_title: str, candi
     subject = f"New Application Received for {job_title}"
     message = f"Candidate {candidate_email} applied for the job: {job_title}"
     send_email(recruiter_email, subject, message)
+
+
+def _company_recruiters(db, company_ids):
+    recruiters = defaultdict(list)
+    rows = db.query(User.company_id, User.email).filter(
+        User.role == "recruiter",
+        User.company_id.in_(company_ids)
+    )
+    for company_id, email in rows:
+        recruiters[company_id].append(email)
+    return recruiters
+
+
+@shared_task
+def notify_recruiters_new_application(application_id: int):
+    """
+    One task per application: recipients are resolved here in the worker
+    (not in the request) and each recruiter is emailed directly, without
+    enqueueing a message per recruiter.
+    """
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(Job.title, Job.company_id, User.email)
+            .select_from(Application)
+            .join(Job, Job.id == Application.job_id)
+            .join(User, User.id == Application.candidate_id)
+            .filter(Application.id == application_id)
+            .first()
+        )
+        if row is None:
+            return 0
+
+        job_title, company_id, candidate_email = row
+        recipients = _company_recruiters(db, [company_id])[company_id]
+    finally:
+        db.close()
+
+    subject = f"New Application Received for {job_title}"
+    message = f"Candidate {candidate_email} applied for the job: {job_title}"
+    for email in recipients:
+        deliver_email(email, subject, message)
+
+    return len(recipients)
+
+
+# Applications inserted just before a run may not be committed yet; leave
+# them to the next digest
+DIGEST_COMMIT_GRACE = timedelta(seconds=30)
+
+
+@shared_task
+def send_recruiter_digests():
+    """
+    Digest mode (RECRUITER_DIGEST_MINUTES > 0): scheduled by Celery beat every
+    N minutes; sends each recruiter a single email listing the applications
+    their company received since their last digest.
+
+    Each recruiter's `digest_sent_until` watermark moves forward only after
+    their digest is sent, so late, drifting or missed beat runs neither skip
+    nor repeat applications. Recruiters without a watermark start with the
+    last N minutes.
+    """
+    minutes = settings.RECRUITER_DIGEST_MINUTES
+    if minutes <= 0:
+        return 0
+
+    end = datetime.utcnow() - DIGEST_COMMIT_GRACE
+    first_start = end - timedelta(minutes=minutes)
+
+    db = SessionLocal()
+    try:
+        recruiters = db.query(User.id, User.email, User.company_id, User.digest_sent_until).filter(
+            User.role == "recruiter",
+            User.company_id.isnot(None),
+            or_(User.digest_sent_until.is_(None), User.digest_sent_until < end),
+        ).all()
+        if not recruiters:
+            return 0
+
+        start = min(recruiter.digest_sent_until or first_start for recruiter in recruiters)
+        rows = (
+            db.query(Job.company_id, Application.created_at, Job.title, User.email)
+            .select_from(Application)
+            .join(Job, Job.id == Application.job_id)
+            .join(User, User.id == Application.candidate_id)
+            .filter(
+                Application.created_at >= start,
+                Application.created_at < end,
+                Job.company_id.in_({recruiter.company_id for recruiter in recruiters}),
+            )
+            .order_by(Job.company_id, Job.title, Application.created_at)
+            .all()
+        )
+
+        applicants = defaultdict(list)
+        for company_id, created_at, job_title, candidate_email in rows:
+            applicants[company_id].append((created_at, f"- {candidate_email} applied for {job_title}"))
+
+        sent, idle = 0, []
+        for recruiter in recruiters:
+            since = recruiter.digest_sent_until or first_start
+            lines = [line for created_at, line in applicants.get(recruiter.company_id, []) if created_at >= since]
+            if not lines:
+                idle.append(recruiter.id)
+                continue
+
+            deliver_email(
+                recruiter.email,
+                f"{len(lines)} new application(s) since {since:%Y-%m-%d %H:%M} UTC",
+                "\n".join(lines),
+            )
+            sent += 1
+            db.query(User).filter(User.id == recruiter.id).update(
+                {User.digest_sent_until: end}, synchronize_session=False
+            )
+            db.commit()
+
+        if idle:
+            db.query(User).filter(User.id.in_(idle)).update(
+                {User.digest_sent_until: end}, synchronize_session=False
+            )
+            db.commit()
+    finally:
+        db.close()
+
+    return sent
@@ -0,0 +1,65 @@
+"""
+Bulk-import jobs for one company from a CSV or NDJSON file.
+
+    python -m app.tasks.import_jobs jobs.csv --company-id 7
+    python -m app.tasks.import_jobs jobs.ndjson --company-id 7 --batch-size 10000
+    python -m app.tasks.import_jobs - --format ndjson --company-id 7 < jobs.ndjson
+
+CSV needs a header row with title and optionally description and status
+(open/closed). NDJSON has one {"title": ..., ...} object per line. Rows that
+fail validation are listed on stderr; everything else is loaded with COPY
+(PostgreSQL) or executemany, one batch per transaction.
+
+Running API workers pick the new jobs up in search results and listings
+once their caches expire (LISTING_CACHE_TTL_SECONDS) or the next job write.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+
+import app.models  # noqa: F401  (configure every mapper before querying)
+from app.database import SessionLocal
+from app.core import job_import
+
+logger = logging.getLogger(__name__)
+
+
+def _format_for(path: str) -> str:
+    return "ndjson" if path.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-import jobs from CSV or NDJSON")
+    parser.add_argument("path", help="input file, or - for stdin")
+    parser.add_argument("--company-id", type=int, required=True)
+    parser.add_argument("--format", choices=job_import.FORMATS, help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, help="rows per validation/load batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stderr)
+    fmt = args.format or _format_for(args.path)
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        if args.path == "-":
+            result = job_import.import_jobs(db, sys.stdin, fmt, args.company_id, args.batch_size)
+        else:
+            with open(args.path, encoding="utf-8-sig", newline="") as text:
+                result = job_import.import_jobs(db, text, fmt, args.company_id, args.batch_size)
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - start
+
+    for error in result["errors"]:
+        logger.warning("row %s: %s", error["row"], "; ".join(error["errors"]))
+    logger.info(
+        "Imported %s of %s row(s) via %s in %.1fs (%.0f rows/s), %s failed",
+        result["imported"], result["received"], result["method"], elapsed,
+        result["imported"] / elapsed if elapsed else 0, result["failed"],
+    )
+    json.dump({k: v for k, v in result.items() if k != "errors"}, sys.stdout)
+    print()
+    sys.exit(1 if result["failed"] else 0)
@@ -0,0 +1,175 @@
+"""
+Outbox relay: publishes rows from `outbox_messages` to Celery.
+
+Run as a standalone process next to the Celery workers:
+
+    python -m app.tasks.outbox_relay            # publish to the broker
+    python -m app.tasks.outbox_relay --direct   # run the tasks in-process (no broker)
+    python -m app.tasks.outbox_relay --once     # drain what is pending and exit
+
+Delivery is at-least-once. A batch is claimed first: FOR UPDATE SKIP LOCKED
+picks pending rows (so several relays can run side by side on PostgreSQL),
+marks them in flight (claimed_at) and commits. Publishing happens outside
+any transaction, then the results are recorded. A claim older than
+OUTBOX_CLAIM_TIMEOUT_SECONDS (the relay died mid-batch) is taken over.
+
+Messages that keep failing are retried on every poll; after
+OUTBOX_MAX_ATTEMPTS they are dead-lettered (failed_at, logged as an error)
+and purged with the dispatched ones after OUTBOX_RETENTION_HOURS.
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.outbox import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _publish(message: OutboxMessage) -> None:
+    from celery_app import celery
+
+    celery.send_task(message.task, args=message.payload.get("args", []))
+
+
+def _run_direct(message: OutboxMessage) -> None:
+    from celery_app import celery
+
+    # Register the task modules a worker would import (celery `include`)
+    celery.loader.import_default_modules()
+    celery.tasks[message.task](*message.payload.get("args", []))
+
+
+def claim_batch(db: Session, batch_size: int) -> List[OutboxMessage]:
+    """
+    Mark up to `batch_size` pending messages in flight and commit, so no
+    transaction (or row lock) is held while they are published.
+    """
+    now = datetime.utcnow()
+    stale = now - timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT_SECONDS)
+    messages = (
+        db.query(OutboxMessage)
+        .filter(
+            OutboxMessage.dispatched_at.is_(None),
+            OutboxMessage.failed_at.is_(None),
+            or_(OutboxMessage.claimed_at.is_(None), OutboxMessage.claimed_at < stale)
+        )
+        .order_by(OutboxMessage.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for message in messages:
+        message.claimed_at = now
+    db.flush()
+
+    # Detached copies stay readable after the commit without a reload each
+    for message in messages:
+        db.expunge(message)
+    db.commit()
+    return messages
+
+
+def relay_batch(db: Session, batch_size: int, deliver=_publish) -> int:
+    """Claim, deliver and mark one batch of pending messages. Returns the count sent."""
+    messages = claim_batch(db, batch_size)
+
+    sent, failed = [], []
+    for message in messages:
+        try:
+            deliver(message)
+        except Exception as exc:  # broker down, unknown task, mailer error...
+            logger.warning("Outbox message %s failed: %s", message.id, exc)
+            failed.append((message, str(exc)[:500]))
+            continue
+        sent.append(message.id)
+
+    now = datetime.utcnow()
+    if sent:
+        db.query(OutboxMessage).filter(OutboxMessage.id.in_(sent)).update(
+            {OutboxMessage.dispatched_at: now}, synchronize_session=False
+        )
+
+    for message, error in failed:
+        # Released for the next poll, or dead-lettered once out of attempts
+        dead = message.attempts + 1 >= settings.OUTBOX_MAX_ATTEMPTS
+        db.query(OutboxMessage).filter(OutboxMessage.id == message.id).update(
+            {
+                OutboxMessage.attempts: OutboxMessage.attempts + 1,
+                OutboxMessage.last_error: error,
+                OutboxMessage.claimed_at: None,
+                OutboxMessage.failed_at: now if dead else None,
+            },
+            synchronize_session=False
+        )
+        if dead:
+            logger.error(
+                "Outbox message %s (%s) dead-lettered after %s attempts: %s",
+                message.id, message.task, message.attempts + 1, error
+            )
+
+    db.commit()
+    return len(sent)
+
+
+def purge_finished(db: Session, older_than: timedelta) -> int:
+    """Delete messages dispatched, or dead-lettered, more than `older_than` ago."""
+    cutoff = datetime.utcnow() - older_than
+    deleted = 0
+    # One DELETE per column, so each can use its index
+    for column in (OutboxMessage.dispatched_at, OutboxMessage.failed_at):
+        deleted += (
+            db.query(OutboxMessage)
+            .filter(column < cutoff)
+            .delete(synchronize_session=False)
+        )
+    db.commit()
+    return deleted
+
+
+def run(direct: bool = False, once: bool = False) -> None:
+    deliver = _run_direct if direct else _publish
+    batch_size = settings.OUTBOX_BATCH_SIZE
+    retention = timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+    last_purge = 0.0
+
+    while True:
+        db = SessionLocal()
+        try:
+            # Keep draining while batches come back full
+            while True:
+                sent = relay_batch(db, batch_size, deliver)
+                if sent:
+                    logger.info("Relayed %s outbox message(s)", sent)
+                if sent < batch_size:
+                    break
+
+            if time.monotonic() - last_purge > 3600:
+                purge_finished(db, retention)
+                last_purge = time.monotonic()
+        except Exception:
+            logger.exception("Outbox relay iteration failed")
+            db.rollback()
+        finally:
+            db.close()
+
+        if once:
+            return
+        time.sleep(settings.OUTBOX_POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relay outbox messages to Celery")
+    parser.add_argument("--direct", action="store_true", help="run tasks in-process instead of publishing")
+    parser.add_argument("--once", action="store_true", help="drain pending messages and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    run(direct=args.direct, once=args.once)
@@ -0,0 +1,69 @@
+"""
+Celery tasks that keep `job_recommendations` current (app.core.recommendations).
+
+- refresh_recommendations: every active candidate against all open jobs
+  (beat, every RECOMMENDATIONS_REFRESH_MINUTES)
+- add_new_jobs_to_recommendations: merges newly posted jobs into stored
+  feeds; enqueued through the outbox when jobs are created or imported
+- refresh_candidate_recommendations: one candidate, the first time their
+  feed is requested
+
+The full refresh can also be run by hand:
+
+    python -m app.tasks.recommendation_tasks                  # all active candidates
+    python -m app.tasks.recommendation_tasks --candidate-id 42
+    python -m app.tasks.recommendation_tasks --new-jobs       # incremental merge only
+"""
+import argparse
+
+from celery import shared_task
+
+from app.core import recommendations
+from app.database import SessionLocal
+
+
+@shared_task
+def refresh_recommendations():
+    db = SessionLocal()
+    try:
+        return recommendations.refresh(db)
+    finally:
+        db.close()
+
+
+@shared_task
+def refresh_candidate_recommendations(candidate_id: int):
+    db = SessionLocal()
+    try:
+        return recommendations.refresh(db, [candidate_id])
+    finally:
+        db.close()
+
+
+@shared_task
+def add_new_jobs_to_recommendations():
+    db = SessionLocal()
+    try:
+        return recommendations.add_new_jobs(db)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    import app.models  # noqa: F401  (configure every mapper before querying)
+
+    parser = argparse.ArgumentParser(description="Recompute candidate job recommendations")
+    parser.add_argument("--candidate-id", type=int, action="append", help="only these candidates (repeatable)")
+    parser.add_argument("--new-jobs", action="store_true", help="only merge jobs posted since the last refresh")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.new_jobs:
+            count = recommendations.add_new_jobs(session, args.batch_size)
+        else:
+            count = recommendations.refresh(session, args.candidate_id, args.batch_size)
+    finally:
+        session.close()
+    print(f"Updated {count} feed(s)")
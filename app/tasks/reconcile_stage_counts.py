@@ -0,0 +1,48 @@
+"""
+Rebuild `job_stage_counts` from `applications` to repair drift (rows edited
+by hand, restored backups, a deploy that predates the counters...).
+
+    python -m app.tasks.reconcile_stage_counts                # rebuild every job
+    python -m app.tasks.reconcile_stage_counts --job-id 42    # just these jobs
+    python -m app.tasks.reconcile_stage_counts --check        # report drift, change nothing
+
+--check exits with status 1 when any counter is off, so it can run from cron
+or CI as a consistency probe.
+"""
+import argparse
+import logging
+import sys
+
+import app.models  # noqa: F401  (configure every mapper before querying)
+from app.database import SessionLocal
+from app.core import stage_counts
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile(job_ids=None, check: bool = False) -> int:
+    """Log every drifting counter and (unless `check`) rebuild. Returns the drift count."""
+    db = SessionLocal()
+    try:
+        off = stage_counts.drift(db, job_ids)
+        for (job_id, stage), (stored, actual) in off.items():
+            logger.info("job %s / %s: stored %s, actual %s", job_id, stage, stored, actual)
+
+        if not check:
+            stage_counts.rebuild(db, job_ids)
+            db.commit()
+            logger.info("Rebuilt stage counts (%s counter(s) were off)", len(off))
+        return len(off)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-job pipeline counters")
+    parser.add_argument("--job-id", type=int, action="append", dest="job_ids", help="limit to this job (repeatable)")
+    parser.add_argument("--check", action="store_true", help="only report drift; exit 1 if any")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    drifted = reconcile(args.job_ids, check=args.check)
+    sys.exit(1 if args.check and drifted else 0)
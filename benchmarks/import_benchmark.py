@@ -0,0 +1,109 @@
+"""
+Benchmark bulk job import (POST /jobs/import, app.tasks.import_jobs).
+
+Generates a CSV of synthetic postings (100k rows by default, ~1% invalid)
+and loads it three ways into a throwaway database:
+
+- one ORM insert + commit per job, as POST /jobs/ does (timed on a sample
+  and extrapolated, since 100k commits take minutes)
+- app.core.job_import, which uses COPY on PostgreSQL/psycopg2 and a single
+  executemany per batch elsewhere
+- the same import with a small batch size, to show the per-batch overhead
+
+Usage:
+    python -m benchmarks.import_benchmark --url postgresql://.../ats_bench
+    python -m benchmarks.import_benchmark --url sqlite:///import_bench.db --rows 100000
+
+Point it at a throwaway database: the jobs table is emptied between runs.
+"""
+import argparse
+import io
+import random
+import time
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.models.company import Company
+from app.models.job import Job
+from app.core import job_import, lifecycle
+
+from benchmarks.search_benchmark import FILLER, LEVELS, ROLES, SKILLS
+
+
+COMPANY_ID = 1
+
+
+def make_csv(rows: int, rng: random.Random) -> str:
+    buffer = io.StringIO()
+    buffer.write("title,description,status\n")
+    for i in range(rows):
+        if rng.random() < 0.01:
+            buffer.write(f",missing title {i},open\n")  # rejected by JobCreate
+            continue
+        title = " ".join(filter(None, [rng.choice(LEVELS), rng.choice(SKILLS).title(), rng.choice(ROLES)]))
+        description = " ".join(rng.sample(FILLER, 10) + rng.sample(SKILLS, 3))
+        status = "open" if rng.random() < 0.8 else "closed"
+        buffer.write(f"{title},{description},{status}\n")
+    return buffer.getvalue()
+
+
+def reset(engine):
+    with engine.begin() as conn:
+        conn.execute(delete(Job))
+
+
+def per_row_orm(engine, data: str, sample: int) -> float:
+    """Seconds per row for one ORM insert + commit each, like create_job."""
+    rows = list(job_import.read_rows(io.StringIO(data), "csv"))[:sample]
+    valid, _ = job_import.validate_batch(rows, COMPANY_ID)
+    with Session(engine) as db:
+        start = time.perf_counter()
+        for _, row in valid:
+            db.add(Job(**row))
+            db.commit()
+        return (time.perf_counter() - start) / len(valid)
+
+
+def bulk(engine, data: str, batch_size: int):
+    with Session(engine) as db:
+        start = time.perf_counter()
+        result = job_import.import_jobs(db, io.StringIO(data), "csv", COMPANY_ID, batch_size)
+        return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="SQLAlchemy URL of a throwaway database")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--orm-sample", type=int, default=2_000, help="rows timed for the per-row baseline")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    lifecycle.create_schema(engine)
+    with Session(engine) as db:
+        if db.get(Company, COMPANY_ID) is None:
+            db.execute(insert(Company), [{"id": COMPANY_ID, "name": "Import Bench"}])
+            db.commit()
+
+    data = make_csv(args.rows, random.Random(args.seed))
+    print(f"Generated {args.rows:,} rows ({len(data) / 1e6:.1f} MB)")
+
+    reset(engine)
+    per_row = per_row_orm(engine, data, min(args.orm_sample, args.rows))
+    print(f"{'per-row ORM commit':<32}{per_row * args.rows:>10.2f}s (extrapolated){1 / per_row:>12,.0f} rows/s")
+
+    for label, batch_size in ((f"bulk, batch {args.batch_size:,}", args.batch_size), ("bulk, batch 100", 100)):
+        reset(engine)
+        elapsed, result = bulk(engine, data, batch_size)
+        print(f"{label:<32}{elapsed:>10.2f}s {result['method']:<13}{result['imported'] / elapsed:>12,.0f} rows/s"
+              f"  ({result['imported']:,} imported, {result['failed']:,} rejected)")
+
+    reset(engine)
+
+
+if __name__ == "__main__":
+    main()
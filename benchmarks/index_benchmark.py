@@ -0,0 +1,206 @@
+"""
+Benchmark the application hot-path queries with and without the composite
+indexes added in migration 1544a754f51d.
+
+Seeds a database with synthetic companies, users, jobs and applications
+(one million applications by default), then times each endpoint's query
+with the hot-path indexes dropped and again after creating them, and prints
+p50/p99 latency per query.
+
+Usage:
+    python -m benchmarks.index_benchmark --url postgresql://.../ats_bench
+    python -m benchmarks.index_benchmark --url sqlite:///bench.db --applications 200000
+
+Point it at a throwaway database: tables are created if missing and the
+hot-path indexes are dropped and recreated.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.core import lifecycle
+from app.database import Base
+from app.models.user import User
+from app.models.company import Company
+from app.models.job import Job
+from app.models.application import Application
+from app.models.application_history import ApplicationHistory
+
+
+HOT_PATH_INDEX_NAMES = {
+    "uq_applications_candidate_job",
+    "ix_applications_job_stage_created",
+    "ix_jobs_company_status",
+    "ix_users_company_role",
+    "ix_application_history_application_changed",
+}
+HOT_PATH_INDEXES = [
+    index
+    for model in (Application, Job, User, ApplicationHistory)
+    for index in model.__table__.indexes
+    if index.name in HOT_PATH_INDEX_NAMES
+]
+
+STAGES = ["Applied", "Screening", "Interview", "Offer", "Hired", "Rejected"]
+STAGE_WEIGHTS = [50, 20, 12, 5, 3, 10]
+BATCH = 10_000
+
+
+# ---------------------------------------------------------
+# 🌱 Seed data
+# ---------------------------------------------------------
+def seed(engine, companies: int, jobs_per_company: int, candidates: int, applications: int, rng: random.Random):
+    lifecycle.create_schema(engine)
+    with Session(engine) as db:
+        if db.scalar(select(func.count()).select_from(Application)) >= applications:
+            print("Seed data already present, skipping")
+            return
+
+    Base.metadata.drop_all(engine)
+    lifecycle.create_schema(engine)
+    start = datetime(2025, 1, 1)
+    total_jobs = companies * jobs_per_company
+
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": c + 1, "name": f"Company {c + 1}"} for c in range(companies)])
+
+        users = []
+        for c in range(companies):
+            for r in range(5):
+                users.append({"email": f"recruiter{r}@company{c + 1}.test", "password_hash": "x",
+                              "full_name": f"Recruiter {r}", "role": "recruiter", "company_id": c + 1})
+            users.append({"email": f"manager@company{c + 1}.test", "password_hash": "x",
+                          "full_name": "Manager", "role": "hiring_manager", "company_id": c + 1})
+        conn.execute(insert(User), users)
+        first_candidate = len(users) + 1
+
+        for offset in range(0, candidates, BATCH):
+            conn.execute(insert(User), [
+                {"email": f"candidate{i}@example.test", "password_hash": "x",
+                 "full_name": f"Candidate {i}", "role": "candidate"}
+                for i in range(offset, min(offset + BATCH, candidates))
+            ])
+
+        conn.execute(insert(Job), [
+            {"id": j + 1, "title": f"Job {j + 1}", "description": "Synthetic job",
+             "status": "open" if rng.random() < 0.8 else "closed",
+             "company_id": j // jobs_per_company + 1}
+            for j in range(total_jobs)
+        ])
+
+    # (candidate, job) pairs are unique as long as applications <= candidates * jobs
+    for offset in range(0, applications, BATCH):
+        apps, history = [], []
+        for k in range(offset, min(offset + BATCH, applications)):
+            candidate = k % candidates
+            job = (k // candidates + candidate) % total_jobs
+            created = start + timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            stage = rng.choices(STAGES, STAGE_WEIGHTS)[0]
+            apps.append({"id": k + 1, "candidate_id": first_candidate + candidate,
+                         "job_id": job + 1, "stage": stage, "created_at": created})
+            history.append({"application_id": k + 1, "old_stage": "Applied", "new_stage": stage,
+                            "changed_at": created + timedelta(days=1)})
+        with engine.begin() as conn:
+            conn.execute(insert(Application), apps)
+            conn.execute(insert(ApplicationHistory), history)
+        print(f"  seeded {min(offset + BATCH, applications):,} applications", end="\r")
+    print()
+
+
+# ---------------------------------------------------------
+# ⏱️ Hot-path queries (mirroring the routers)
+# ---------------------------------------------------------
+def hot_path_queries(engine, rng: random.Random):
+    with Session(engine) as db:
+        max_app = db.scalar(select(func.max(Application.id)))
+        max_job = db.scalar(select(func.max(Job.id)))
+        max_company = db.scalar(select(func.max(Company.id)))
+        max_user = db.scalar(select(func.max(User.id)))
+
+    return {
+        "apply_to_job duplicate check": lambda db: db.query(Application).filter(
+            Application.candidate_id == rng.randint(1, max_user),
+            Application.job_id == rng.randint(1, max_job),
+        ).first(),
+        "job_applications (job, stage)": lambda db: db.query(Application).filter(
+            Application.job_id == rng.randint(1, max_job),
+            Application.stage == rng.choice(STAGES),
+        ).order_by(Application.created_at.desc(), Application.id.desc()).limit(50).all(),
+        "company_applications": lambda db: db.query(Application).join(Job).filter(
+            Job.company_id == rng.randint(1, max_company),
+        ).order_by(Application.created_at.desc(), Application.id.desc()).limit(50).all(),
+        "recruiter fan-out": lambda db: db.query(User).filter(
+            User.role == "recruiter",
+            User.company_id == rng.randint(1, max_company),
+        ).all(),
+        "application history": lambda db: db.query(ApplicationHistory).filter(
+            ApplicationHistory.application_id == rng.randint(1, max_app),
+        ).order_by(ApplicationHistory.changed_at).all(),
+    }
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_queries(engine, queries, repeat: int):
+    results = {}
+    with Session(engine) as db:
+        for name, query in queries.items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                query(db)
+                samples.append((time.perf_counter() - start) * 1000)
+                db.expunge_all()
+            results[name] = (statistics.median(samples), percentile(samples, 99))
+    return results
+
+
+def analyze(engine):
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="SQLAlchemy URL of a throwaway database")
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--jobs-per-company", type=int, default=25)
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--applications", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=200, help="samples per query")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    engine = create_engine(args.url)
+
+    print(f"Seeding {args.applications:,} applications ...")
+    seed(engine, args.companies, args.jobs_per_company, args.candidates, args.applications, rng)
+
+    for index in HOT_PATH_INDEXES:
+        index.drop(engine, checkfirst=True)
+    analyze(engine)
+    before = run_queries(engine, hot_path_queries(engine, random.Random(args.seed)), args.repeat)
+
+    for index in HOT_PATH_INDEXES:
+        index.create(engine, checkfirst=True)
+    analyze(engine)
+    after = run_queries(engine, hot_path_queries(engine, random.Random(args.seed)), args.repeat)
+
+    print(f"\n{'query':<32}{'p50 before':>12}{'p99 before':>12}{'p50 after':>12}{'p99 after':>12}")
+    for name in before:
+        b50, b99 = before[name]
+        a50, a99 = after[name]
+        print(f"{name:<32}{b50:>10.2f}ms{b99:>10.2f}ms{a50:>10.2f}ms{a99:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
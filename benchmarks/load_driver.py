@@ -0,0 +1,372 @@
+"""
+Load-test the ATS API with a weighted mix of user journeys and record
+throughput and p50/p95/p99 latency per route.
+
+Seed the database first (benchmarks.seed_tenants), start the API against
+it, then drive it with --concurrency virtual users for --duration seconds:
+
+    python -m benchmarks.seed_tenants --url postgresql://.../ats_bench
+    uvicorn app.main:app --workers 4
+    python -m benchmarks.load_driver --base-url http://127.0.0.1:8000 -o results.json
+
+--in-process drives app.main:app through httpx's ASGI transport instead of
+a server (the app uses DATABASE_URL, so point it at the seeded database);
+handy for a quick check, not for absolute numbers.
+
+Journeys (weights in SCENARIOS): register + login, login, apply,
+recruiter stage change, job listing and search, candidate and company
+application listings, pipeline counts. A request counts as an error when
+its status is not one the journey expects (e.g. 400 "Already applied" is
+expected for apply; 500 never is).
+
+The results JSON holds run metadata (git commit, arguments, manifest) and,
+per route template, requests, errors, throughput and latency percentiles.
+Pass --compare baseline.json to flag routes whose p95 or throughput got
+worse than --max-regression (exit status 1), e.g. between releases.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import httpx
+
+
+# name -> weight; see the journey functions below
+SCENARIOS = {
+    "register": 3,
+    "login": 7,
+    "apply": 20,
+    "change_stage": 15,
+    "list_jobs": 20,
+    "search_jobs": 10,
+    "my_applications": 10,
+    "company_applications": 8,
+    "job_pipeline": 7,
+}
+
+SEARCH_TERMS = ["python", "senior engineer", "kubernetes", "data analyst", "react developer", "golang"]
+
+
+def percentile(samples, pct):
+    # Same nearest-rank percentile as benchmarks.index_benchmark, which
+    # imports the app (and needs its settings); the driver does not
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Recorder:
+    """Latency samples and status codes per route template."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.recording = False
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str,
+                   expected=(200,), **kwargs) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            status = response.status_code
+        except httpx.HTTPError:
+            response, status = None, "transport"
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if self.recording:
+            self.samples[route].append(elapsed)
+            self.statuses[route][str(status)] += 1
+            if status not in expected:
+                self.errors[route] += 1
+        return response
+
+    def summary(self, seconds: float) -> dict:
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            routes[route] = {
+                "requests": len(samples),
+                "errors": self.errors[route],
+                "error_rate": round(self.errors[route] / len(samples), 4),
+                "throughput_rps": round(len(samples) / seconds, 2),
+                "mean_ms": round(statistics.fmean(samples), 2),
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "statuses": dict(self.statuses[route]),
+            }
+        every = [sample for samples in self.samples.values() for sample in samples]
+        total = {
+            "requests": len(every),
+            "errors": sum(self.errors.values()),
+            "throughput_rps": round(len(every) / seconds, 2),
+            "p50_ms": round(percentile(every, 50), 2) if every else None,
+            "p95_ms": round(percentile(every, 95), 2) if every else None,
+            "p99_ms": round(percentile(every, 99), 2) if every else None,
+        }
+        return {"routes": routes, "total": total}
+
+
+def _bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+# ---------------------------------------------------------
+# 👥 Tenants (from the seed manifest) and logged-in sessions
+# ---------------------------------------------------------
+class Tenants:
+    def __init__(self, manifest: dict, rng: random.Random):
+        self.manifest = manifest
+        self.rng = rng
+        self.emails = manifest["emails"]
+        self.password = manifest["password"]
+        self.total_jobs = manifest["companies"] * manifest["jobs_per_company"]
+        self.candidates, self.recruiters, self.managers = [], [], []  # (token, company_id)
+        self.registered = itertools.count()
+
+    def random_candidate_email(self) -> str:
+        return self.emails["candidate"].format(i=self.rng.randrange(self.manifest["candidates"]))
+
+    def company_jobs(self, company_id: int) -> range:
+        per = self.manifest["jobs_per_company"]
+        return range((company_id - 1) * per + 1, company_id * per + 1)
+
+    async def log_in(self, client, recorder: Recorder, sessions: int):
+        """Log in a pool of candidates, recruiters and managers (not recorded)."""
+        async def token(email):
+            response = await recorder.call(client, "setup", "POST", "/auth/login",
+                                           json={"email": email, "password": self.password})
+            if response is None or response.status_code != 200:
+                raise SystemExit(f"Login failed for {email}: {response and response.text}")
+            return response.json()["access_token"]
+
+        companies = list(range(1, self.manifest["companies"] + 1))
+        self.rng.shuffle(companies)
+        companies = companies[:max(1, sessions // 4)]
+
+        self.candidates = [(await token(self.random_candidate_email()), None) for _ in range(sessions)]
+        self.recruiters = [
+            (await token(self.emails["recruiter"].format(r=self.rng.randrange(self.manifest["recruiters_per_company"]),
+                                                         c=c)), c)
+            for c in companies
+        ]
+        self.managers = [(await token(self.emails["manager"].format(c=c)), c) for c in companies]
+
+
+# ---------------------------------------------------------
+# 🧭 Journeys
+# ---------------------------------------------------------
+async def register(client, rec: Recorder, tenants: Tenants, run_id: str):
+    email = f"load-{run_id}-{next(tenants.registered)}@load.example.com"
+    await rec.call(client, "POST /auth/register", "POST", "/auth/register", json={
+        "email": email, "password": tenants.password, "full_name": "Load User", "role": "candidate",
+        "profile": "python django postgres",
+    })
+    await rec.call(client, "POST /auth/login", "POST", "/auth/login",
+                   json={"email": email, "password": tenants.password})
+
+
+async def login(client, rec: Recorder, tenants: Tenants, run_id: str):
+    await rec.call(client, "POST /auth/login", "POST", "/auth/login",
+                   json={"email": tenants.random_candidate_email(), "password": tenants.password})
+
+
+async def apply(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, _ = tenants.rng.choice(tenants.candidates)
+    job_id = tenants.rng.randint(1, tenants.total_jobs)
+    # 400: already applied to this job
+    await rec.call(client, "POST /applications/apply/{job_id}", "POST", f"/applications/apply/{job_id}",
+                   expected=(200, 400), headers=_bearer(token))
+
+
+async def change_stage(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, company_id = tenants.rng.choice(tenants.recruiters)
+    job_id = tenants.rng.choice(tenants.company_jobs(company_id))
+    response = await rec.call(client, "GET /applications/job/{job_id}", "GET", f"/applications/job/{job_id}",
+                              params={"stage": "Screening", "limit": 20}, headers=_bearer(token))
+    if response is None or response.status_code != 200 or not response.json():
+        return
+    application = tenants.rng.choice(response.json())
+    target = "Interview" if tenants.rng.random() < 0.6 else "Rejected"
+    # Another virtual user moved it first: 400 when its new stage no longer
+    # allows the transition, 409 when it moved between the read and the update
+    await rec.call(client, "PUT /applications/{application_id}/stage", "PUT",
+                   f"/applications/{application['id']}/stage", expected=(200, 400, 409),
+                   params={"new_stage": target}, headers=_bearer(token))
+
+
+async def list_jobs(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, _ = tenants.rng.choice(tenants.candidates)
+    await rec.call(client, "GET /jobs/", "GET", "/jobs/", params={"limit": 20}, headers=_bearer(token))
+
+
+async def search_jobs(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, _ = tenants.rng.choice(tenants.candidates)
+    await rec.call(client, "GET /jobs/search", "GET", "/jobs/search",
+                   params={"q": tenants.rng.choice(SEARCH_TERMS), "limit": 20}, headers=_bearer(token))
+
+
+async def my_applications(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, _ = tenants.rng.choice(tenants.candidates)
+    await rec.call(client, "GET /applications/my", "GET", "/applications/my",
+                   params={"limit": 20}, headers=_bearer(token))
+
+
+async def company_applications(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, company_id = tenants.rng.choice(tenants.managers)
+    await rec.call(client, "GET /applications/company/{company_id}", "GET", f"/applications/company/{company_id}",
+                   params={"limit": 50}, headers=_bearer(token))
+
+
+async def job_pipeline(client, rec: Recorder, tenants: Tenants, run_id: str):
+    token, company_id = tenants.rng.choice(tenants.recruiters)
+    job_id = tenants.rng.choice(tenants.company_jobs(company_id))
+    await rec.call(client, "GET /jobs/{job_id}/pipeline", "GET", f"/jobs/{job_id}/pipeline",
+                   headers=_bearer(token))
+
+
+JOURNEYS = {
+    "register": register,
+    "login": login,
+    "apply": apply,
+    "change_stage": change_stage,
+    "list_jobs": list_jobs,
+    "search_jobs": search_jobs,
+    "my_applications": my_applications,
+    "company_applications": company_applications,
+    "job_pipeline": job_pipeline,
+}
+
+
+async def virtual_user(client, rec: Recorder, tenants: Tenants, run_id: str, weights: dict, deadline: float):
+    names, cumulative = list(weights), list(itertools.accumulate(weights.values()))
+    while time.perf_counter() < deadline:
+        name = tenants.rng.choices(names, cum_weights=cumulative)[0]
+        await JOURNEYS[name](client, rec, tenants, run_id)
+
+
+async def drive(args, manifest: dict) -> dict:
+    if args.in_process:
+        from app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://in-process"
+    else:
+        transport, base_url = None, args.base_url
+
+    weights = {name: weight for name, weight in SCENARIOS.items() if name not in args.skip}
+    tenants = Tenants(manifest, random.Random(args.seed))
+    recorder = Recorder()
+    run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=args.timeout) as client:
+        await tenants.log_in(client, recorder, args.sessions)
+
+        if args.warmup:
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*[
+                virtual_user(client, recorder, tenants, run_id, weights, deadline) for _ in range(args.concurrency)
+            ])
+
+        recorder.recording = True
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            virtual_user(client, recorder, tenants, run_id, weights, deadline) for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    return {"seconds": round(elapsed, 2), **recorder.summary(elapsed)}
+
+
+# ---------------------------------------------------------
+# 📈 Results and regression check
+# ---------------------------------------------------------
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, max_regression: float):
+    """[(route, metric, baseline, current)] for routes that got worse."""
+    regressions = []
+    for route, current in results["routes"].items():
+        before = baseline.get("routes", {}).get(route)
+        if not before:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            regressions.append((route, "p95_ms", before["p95_ms"], current["p95_ms"]))
+        if current["throughput_rps"] < before["throughput_rps"] * (1 - max_regression):
+            regressions.append((route, "throughput_rps", before["throughput_rps"], current["throughput_rps"]))
+        if current["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append((route, "error_rate", before["error_rate"], current["error_rate"]))
+    return regressions
+
+
+def print_table(results: dict):
+    print(f"\n{'route':<44}{'req':>8}{'err':>6}{'rps':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for route, row in results["routes"].items():
+        print(f"{route:<44}{row['requests']:>8}{row['errors']:>6}{row['throughput_rps']:>9.1f}"
+              f"{row['p50_ms']:>8.1f}ms{row['p95_ms']:>8.1f}ms{row['p99_ms']:>8.1f}ms")
+    total = results["total"]
+    print(f"{'total':<44}{total['requests']:>8}{total['errors']:>6}{total['throughput_rps']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="URL of a running API, e.g. http://127.0.0.1:8000")
+    target.add_argument("--in-process", action="store_true", help="drive app.main:app over ASGI, no server")
+    parser.add_argument("--manifest", default="load_bench_manifest.json", help="written by benchmarks.seed_tenants")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=32, help="virtual users")
+    parser.add_argument("--sessions", type=int, default=200, help="candidates logged in up front")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--skip", action="append", default=[], choices=list(SCENARIOS), help="drop a journey")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to check against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed relative p95 increase / throughput drop (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    with open(args.manifest) as source:
+        manifest = json.load(source)
+
+    results = asyncio.run(drive(args, manifest))
+    results["meta"] = {
+        "started_at": datetime.utcnow().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "target": "in-process" if args.in_process else args.base_url,
+        "args": {key: value for key, value in vars(args).items() if key not in ("compare", "output")},
+        "manifest": {key: value for key, value in manifest.items() if key != "password"},
+    }
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(results, out, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as source:
+            regressions = compare(results, json.load(source), args.max_regression)
+        for route, metric, before, now in regressions:
+            print(f"REGRESSION {route}: {metric} {before} -> {now}")
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions beyond {args.max_regression:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark keyword job search (GET /jobs/search) over a synthetic corpus.
+
+Seeds a database with one million jobs by default (titles and descriptions
+drawn from a Zipf-like vocabulary), then times ranked search through
+app.core.search against a naive ILIKE scan, and prints p50/p99 latency per
+query shape.
+
+On PostgreSQL the generated search_vector column and its GIN index come
+with the schema (lifecycle.create_schema). On SQLite the in-process
+inverted index is used; its build time is reported separately.
+
+Usage:
+    python -m benchmarks.search_benchmark --url postgresql://.../ats_bench
+    python -m benchmarks.search_benchmark --url sqlite:///search_bench.db --jobs 200000
+
+Point it at a throwaway database: the jobs table is dropped and reseeded
+when it holds fewer rows than requested.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.company import Company
+from app.models.job import Job
+from app.core import lifecycle, search
+
+from benchmarks.index_benchmark import analyze, percentile
+
+
+BATCH = 10_000
+PAGE = 50
+
+ROLES = ["Engineer", "Developer", "Manager", "Analyst", "Designer", "Scientist",
+         "Architect", "Consultant", "Administrator", "Specialist"]
+LEVELS = ["Junior", "Senior", "Lead", "Principal", "Staff", ""]
+SKILLS = ["python", "java", "golang", "rust", "react", "kubernetes", "postgres", "django",
+          "fastapi", "spark", "terraform", "aws", "azure", "gcp", "pandas", "typescript",
+          "kafka", "redis", "graphql", "docker", "linux", "swift", "kotlin", "scala",
+          "airflow", "tableau", "excel", "figma", "salesforce", "sap"]
+FILLER = ["team", "product", "customers", "build", "scale", "platform", "data", "services",
+          "remote", "hybrid", "office", "growth", "mission", "impact", "quality", "delivery",
+          "systems", "infrastructure", "analytics", "design", "security", "mobile", "cloud"]
+
+QUERIES = {
+    "one common term": "python",
+    "one rare term": "salesforce",
+    "two terms (AND)": "python kubernetes",
+    "title + skill": "senior engineer postgres",
+    "no match": "blockchain",
+}
+
+
+def _zipf_choice(rng: random.Random, words):
+    # Earlier words are much more frequent, as in real postings
+    return words[min(int(rng.paretovariate(1.2)) - 1, len(words) - 1)]
+
+
+# ---------------------------------------------------------
+# 🌱 Seed data
+# ---------------------------------------------------------
+def seed(engine, jobs: int, companies: int, rng: random.Random):
+    lifecycle.create_schema(engine)
+    with Session(engine) as db:
+        if db.scalar(select(func.count()).select_from(Job)) >= jobs:
+            print("Seed data already present, skipping")
+            return
+
+    Base.metadata.drop_all(engine)
+    lifecycle.create_schema(engine)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": c + 1, "name": f"Company {c + 1}"} for c in range(companies)])
+
+    for offset in range(0, jobs, BATCH):
+        rows = []
+        for j in range(offset, min(offset + BATCH, jobs)):
+            skills = {_zipf_choice(rng, SKILLS) for _ in range(rng.randint(2, 5))}
+            title = " ".join(filter(None, [rng.choice(LEVELS), _zipf_choice(rng, SKILLS).title(),
+                                           rng.choice(ROLES)]))
+            description = " ".join(
+                rng.sample(FILLER, 8) + sorted(skills) + rng.sample(FILLER, 6)
+            )
+            rows.append({"id": j + 1, "title": title, "description": description,
+                         "status": "open" if rng.random() < 0.8 else "closed",
+                         "company_id": j % companies + 1})
+        with engine.begin() as conn:
+            conn.execute(insert(Job), rows)
+        print(f"  seeded {min(offset + BATCH, jobs):,} jobs", end="\r")
+    print()
+
+
+# ---------------------------------------------------------
+# ⏱️ Queries
+# ---------------------------------------------------------
+def ranked_search(q):
+    return lambda db: search.search_jobs(db, q, "open", None, PAGE)
+
+
+def ilike_scan(q):
+    # What a naive implementation would do: every term must appear somewhere
+    def run(db):
+        query = db.query(Job).filter(Job.status == "open")
+        for term in q.split():
+            pattern = f"%{term}%"
+            query = query.filter(or_(Job.title.ilike(pattern), Job.description.ilike(pattern)))
+        return query.order_by(Job.id.desc()).limit(PAGE).all()
+    return run
+
+
+def run_queries(engine, queries, repeat: int):
+    results = {}
+    with Session(engine) as db:
+        for name, query in queries.items():
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                query(db)
+                samples.append((time.perf_counter() - start) * 1000)
+                db.expunge_all()
+            results[name] = (statistics.median(samples), percentile(samples, 99))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="SQLAlchemy URL of a throwaway database")
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=50, help="samples per query")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+
+    print(f"Seeding {args.jobs:,} jobs ...")
+    seed(engine, args.jobs, args.companies, random.Random(args.seed))
+
+    # On PostgreSQL, lifecycle.create_schema added search_vector + GIN index
+    if engine.dialect.name != "postgresql":
+        start = time.perf_counter()
+        with Session(engine) as db:
+            search.search_index.invalidate()
+            search.search_index.ensure_built(db)
+        print(f"In-process index built in {time.perf_counter() - start:.1f}s "
+              f"({len(search.search_index.postings):,} terms)")
+    analyze(engine)
+
+    baseline = run_queries(engine, {name: ilike_scan(q) for name, q in QUERIES.items()}, args.repeat)
+    ranked = run_queries(engine, {name: ranked_search(q) for name, q in QUERIES.items()}, args.repeat)
+
+    print(f"\n{'query':<28}{'p50 ILIKE':>12}{'p99 ILIKE':>12}{'p50 search':>12}{'p99 search':>12}")
+    for name in QUERIES:
+        b50, b99 = baseline[name]
+        s50, s99 = ranked[name]
+        print(f"{name:<28}{b50:>10.2f}ms{b99:>10.2f}ms{s50:>10.2f}ms{s99:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Seed a throwaway database with synthetic tenants for the load driver
+(benchmarks.load_driver).
+
+Creates N companies, each with M recruiters, one hiring manager and K jobs,
+a pool of candidates (most with a skills profile), and applications whose
+ApplicationHistory walks the default pipeline the way real ones do: every
+application enters Applied, fewer reach each later stage, rejections happen
+at every step, and each step lands hours to weeks after the previous one.
+Pipeline counters (job_stage_counts) are rebuilt to match, and on
+PostgreSQL the id sequences are moved past the seeded rows so the API can
+insert more.
+
+Every user shares one password, hashed once at BCRYPT_ROUNDS; start the API
+with the same BCRYPT_ROUNDS or every login will rehash. A JSON manifest
+describes the tenants (counts, email patterns, password) for the driver.
+
+Usage:
+    python -m benchmarks.seed_tenants --url postgresql://.../ats_bench
+    python -m benchmarks.seed_tenants --url sqlite:///load_bench.db --applications 200000
+
+Point it at a throwaway database: all tables are dropped and recreated.
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select, text
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.config import settings
+from app.core import lifecycle, stage_counts
+from app.core.passwords import pwd_context
+from app.core.workflow import DEFAULT_TRANSITIONS
+from app.database import Base
+from app.models.application import Application
+from app.models.application_history import ApplicationHistory
+from app.models.company import Company
+from app.models.job import Job
+from app.models.user import User
+
+from benchmarks.search_benchmark import FILLER, LEVELS, ROLES, SKILLS
+
+
+BATCH = 10_000
+
+# Email patterns the driver logs in with (1-based company, 0-based index)
+RECRUITER_EMAIL = "recruiter{r}@company{c}.example.com"
+MANAGER_EMAIL = "manager@company{c}.example.com"
+CANDIDATE_EMAIL = "candidate{i}@candidates.example.com"
+
+# Per stage: probability of moving on to the next stage, of being rejected;
+# the rest stay where they are (still in progress)
+ADVANCE = {"Applied": (0.45, 0.35), "Screening": (0.50, 0.30), "Interview": (0.35, 0.45), "Offer": (0.75, 0.15)}
+
+# Hours between two steps: log-normal, median ~1.5 days, long tail
+STEP_HOURS = (3.6, 1.0)
+
+
+def _next_stage(stage: str) -> str:
+    return next(target for target in DEFAULT_TRANSITIONS[stage] if target != "Rejected")
+
+
+def stage_path(rng: random.Random):
+    """Stages one application goes through, Applied first."""
+    path = ["Applied"]
+    while path[-1] in ADVANCE:
+        advance, reject = ADVANCE[path[-1]]
+        roll = rng.random()
+        if roll < advance:
+            path.append(_next_stage(path[-1]))
+        elif roll < advance + reject:
+            path.append("Rejected")
+        else:
+            break
+    return path
+
+
+# ---------------------------------------------------------
+# 🌱 Seed data
+# ---------------------------------------------------------
+def seed_tenants(engine, companies: int, recruiters: int, jobs_per_company: int, candidates: int, applications: int,
+                 days: int, password: str, rng: random.Random) -> dict:
+    Base.metadata.drop_all(engine)
+    lifecycle.create_schema(engine)
+
+    password_hash = pwd_context().hash(password)
+    total_jobs = companies * jobs_per_company
+    now = datetime.utcnow()
+    start = now - timedelta(days=days)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": c, "name": f"Company {c}"} for c in range(1, companies + 1)])
+
+        staff, recruiter_ids = [], {}
+        for c in range(1, companies + 1):
+            for r in range(recruiters):
+                staff.append({"id": len(staff) + 1, "email": RECRUITER_EMAIL.format(r=r, c=c),
+                              "password_hash": password_hash, "full_name": f"Recruiter {r}",
+                              "role": "recruiter", "company_id": c})
+                recruiter_ids.setdefault(c, []).append(len(staff))
+            staff.append({"id": len(staff) + 1, "email": MANAGER_EMAIL.format(c=c),
+                          "password_hash": password_hash, "full_name": "Hiring Manager",
+                          "role": "hiring_manager", "company_id": c})
+        conn.execute(insert(User), staff)
+        first_candidate = len(staff) + 1
+
+        for offset in range(0, candidates, BATCH):
+            conn.execute(insert(User), [
+                {"id": first_candidate + i, "email": CANDIDATE_EMAIL.format(i=i), "password_hash": password_hash,
+                 "full_name": f"Candidate {i}", "role": "candidate",
+                 "profile": " ".join(rng.sample(SKILLS, 4) + rng.sample(FILLER, 6)) if rng.random() < 0.7 else None}
+                for i in range(offset, min(offset + BATCH, candidates))
+            ])
+
+        for offset in range(0, total_jobs, BATCH):
+            rows = []
+            for j in range(offset, min(offset + BATCH, total_jobs)):
+                skills = rng.sample(SKILLS, 3)
+                rows.append({
+                    "id": j + 1,
+                    "title": " ".join(filter(None, [rng.choice(LEVELS), skills[0].title(), rng.choice(ROLES)])),
+                    "description": " ".join(rng.sample(FILLER, 10) + skills),
+                    "status": "open" if rng.random() < 0.8 else "closed",
+                    "company_id": j // jobs_per_company + 1,
+                })
+            conn.execute(insert(Job), rows)
+
+    # (candidate, job) pairs are unique as long as applications <= candidates * jobs
+    history_id = 0
+    for offset in range(0, applications, BATCH):
+        apps, history = [], []
+        for k in range(offset, min(offset + BATCH, applications)):
+            candidate = first_candidate + k % candidates
+            job = (k // candidates + k % candidates) % total_jobs + 1
+            company = (job - 1) // jobs_per_company + 1
+            at = start + timedelta(seconds=rng.randrange(days * 24 * 3600))
+            created, previous = at, None
+            for stage in stage_path(rng):
+                if previous is not None:
+                    at = min(at + timedelta(hours=rng.lognormvariate(*STEP_HOURS)), now)
+                history_id += 1
+                history.append({"id": history_id, "application_id": k + 1, "old_stage": previous,
+                                "new_stage": stage, "changed_at": at,
+                                "changed_by": candidate if previous is None else rng.choice(recruiter_ids[company])})
+                previous = stage
+            apps.append({"id": k + 1, "candidate_id": candidate, "job_id": job,
+                         "stage": previous, "created_at": created})
+        with engine.begin() as conn:
+            conn.execute(insert(Application), apps)
+            conn.execute(insert(ApplicationHistory), history)
+        print(f"  seeded {min(offset + BATCH, applications):,} applications", end="\r")
+    print()
+
+    with Session(engine) as db:
+        stage_counts.rebuild(db)
+        db.commit()
+        histories = db.scalar(select(func.count()).select_from(ApplicationHistory))
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for table in ("companies", "users", "jobs", "applications", "application_history"):
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT coalesce(max(id), 1) FROM {table}))"
+                ))
+
+    return {
+        "companies": companies,
+        "recruiters_per_company": recruiters,
+        "jobs_per_company": jobs_per_company,
+        "candidates": candidates,
+        "applications": applications,
+        "history_entries": histories,
+        "password": password,
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "emails": {"recruiter": RECRUITER_EMAIL, "manager": MANAGER_EMAIL, "candidate": CANDIDATE_EMAIL},
+        "seeded_at": now.isoformat(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="SQLAlchemy URL of a throwaway database")
+    parser.add_argument("--companies", type=int, default=100)
+    parser.add_argument("--recruiters-per-company", type=int, default=3)
+    parser.add_argument("--jobs-per-company", type=int, default=50)
+    parser.add_argument("--candidates", type=int, default=200_000)
+    parser.add_argument("--applications", type=int, default=2_000_000)
+    parser.add_argument("--days", type=int, default=365, help="spread application dates over this many days")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--manifest", default="load_bench_manifest.json", help="where to write the tenant manifest")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.applications > args.candidates * args.companies * args.jobs_per_company:
+        parser.error("more applications than (candidate, job) pairs")
+
+    engine = create_engine(args.url)
+    print(f"Seeding {args.companies:,} companies, {args.candidates:,} candidates, "
+          f"{args.applications:,} applications ...")
+    manifest = seed_tenants(engine, args.companies, args.recruiters_per_company, args.jobs_per_company,
+                            args.candidates, args.applications, args.days, args.password,
+                            random.Random(args.seed))
+    manifest["seed"] = args.seed
+
+    with open(args.manifest, "w") as out:
+        json.dump(manifest, out, indent=2)
+    print(f"{manifest['history_entries']:,} history entries; manifest written to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+API cold-start benchmark: how long `import app.main` takes, and what it pulls in.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+takes the median over runs of the total import time and of the time spent
+in each top-level package (self time, so nested imports are not counted
+twice). Results are checked against benchmarks/startup_baseline.json:
+
+- the total must stay within `budget_ms`;
+- none of the `lazy` packages may be imported: they are loaded on first use
+  (Celery only by the outbox relay and workers, passlib by the hashing
+  processes and CLIs, numpy by the first ranking, recommendation, analytics
+  or bulk stage-change request).
+
+Exits 1 when either check fails, so it can gate CI:
+
+    python -m benchmarks.startup_benchmark                    # report + check
+    python -m benchmarks.startup_benchmark --write-baseline   # record new numbers
+
+Import time depends on the machine; re-record the baseline (keeping the
+budget, or passing --budget-ms) on the machine that enforces it.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE = Path(__file__).resolve().with_name("startup_baseline.json")
+
+DEFAULT_LAZY = ["alembic", "celery", "kombu", "numpy", "passlib", "redis"]
+
+
+def import_profile(module: str) -> dict:
+    """One fresh interpreter: {"import_ms", "wall_ms", "packages": {package: self ms}, "modules": set}."""
+    env = dict(os.environ)
+    # Importing the app only needs settings to parse; nothing connects
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("JWT_SECRET_KEY", "startup-benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # measure with bytecode caches, as deployed
+
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    packages, modules, import_ms = defaultdict(float), set(), None
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.add(name)
+        packages[name.split(".")[0]] += int(self_us) / 1000
+        if name == module:
+            import_ms = int(cumulative_us) / 1000
+    return {"import_ms": import_ms, "wall_ms": wall_ms, "packages": packages, "modules": modules}
+
+
+def measure(module: str, runs: int) -> dict:
+    import_profile(module)  # unmeasured: compiles bytecode, fills the OS file cache
+    profiles = [import_profile(module) for _ in range(runs)]
+
+    names = set().union(*(profile["packages"] for profile in profiles))
+    packages = {
+        name: round(statistics.median(profile["packages"].get(name, 0.0) for profile in profiles), 1)
+        for name in names
+    }
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms": round(statistics.median(profile["import_ms"] for profile in profiles), 1),
+        "wall_ms": round(statistics.median(profile["wall_ms"] for profile in profiles), 1),
+        "packages": dict(sorted(packages.items(), key=lambda item: -item[1])),
+        "imported": sorted({name.split(".")[0] for profile in profiles for name in profile["modules"]}),
+    }
+
+
+def check(results: dict, budget_ms: float, lazy) -> list:
+    """Failed checks, as messages."""
+    failures = []
+    if results["import_ms"] > budget_ms:
+        failures.append(f"import {results['module']} took {results['import_ms']}ms, budget is {budget_ms}ms")
+    for package in sorted(set(lazy) & set(results["imported"])):
+        failures.append(f"{package} is imported at startup; it should load on first use")
+    return failures
+
+
+def print_table(results: dict, baseline: dict, top: int):
+    before = baseline.get("packages", {})
+    print(f"\n{'package':<28}{'self ms':>10}{'baseline':>10}")
+    for name, ms in list(results["packages"].items())[:top]:
+        reference = f"{before[name]:.1f}" if name in before else "-"
+        print(f"{name:<28}{ms:>10.1f}{reference:>10}")
+    reference = baseline.get("import_ms", "-")
+    print(f"{'import ' + results['module']:<28}{results['import_ms']:>10.1f}{reference:>10}")
+    print(f"{'interpreter wall time':<28}{results['wall_ms']:>10.1f}{baseline.get('wall_ms', '-'):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15, help="packages shown in the report")
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--budget-ms", type=float, help="override the baseline's budget_ms")
+    parser.add_argument("--write-baseline", action="store_true", help="save these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as source:
+            baseline = json.load(source)
+    budget_ms = args.budget_ms or baseline.get("budget_ms")
+    lazy = baseline.get("lazy", DEFAULT_LAZY)
+
+    print(f"Measuring `import {args.module}` over {args.runs} fresh interpreters ...")
+    results = measure(args.module, args.runs)
+    print_table(results, baseline, args.top)
+
+    if args.write_baseline:
+        results.update({
+            "packages": {name: ms for name, ms in results["packages"].items() if ms >= 1.0},
+            "budget_ms": budget_ms or round(results["import_ms"] * 1.5, -1),
+            "lazy": lazy,
+            "meta": {"python": platform.python_version(), "platform": platform.platform()},
+        })
+        results.pop("imported")
+        with open(args.baseline, "w") as out:
+            json.dump(results, out, indent=2)
+            out.write("\n")
+        print(f"\nBaseline written to {args.baseline} (budget {results['budget_ms']}ms)")
+        return
+
+    if budget_ms is None:
+        raise SystemExit("no budget: pass --budget-ms or record a baseline with --write-baseline")
+    failures = check(results, budget_ms, lazy)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        raise SystemExit(1)
+    print(f"\nWithin the {budget_ms}ms startup budget; no lazily loaded package imported")
+
+
+if __name__ == "__main__":
+    main()
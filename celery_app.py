@@ -1,10 +1,34 @@
+from datetime import timedelta
+
 from celery import Celery
 
+from app.config import settings
+
 celery = Celery(
     "worker",
-    broker="redis://127.0.0.1:6379/0",
-    backend="redis://127.0.0.1:6379/0"
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+    include=["app.tasks.email_tasks", "app.tasks.recommendation_tasks"]
 )
 
-# Auto discover tasks from app/tasks
-celery.autodiscover_tasks(["app.tasks"])
+# Name used by app.core.email
+celery_app = celery
+
+# shared_task proxies resolve the *current* app, which is thread-local; make
+# this the default so .delay() from threadpool threads uses this broker
+celery.set_default()
+
+# Periodic jobs (run with: celery -A celery_app.celery beat)
+celery.conf.beat_schedule = {}
+
+if settings.RECRUITER_DIGEST_MINUTES > 0:
+    celery.conf.beat_schedule["recruiter-new-application-digest"] = {
+        "task": "app.tasks.email_tasks.send_recruiter_digests",
+        "schedule": timedelta(minutes=settings.RECRUITER_DIGEST_MINUTES),
+    }
+
+if settings.RECOMMENDATIONS_REFRESH_MINUTES > 0:
+    celery.conf.beat_schedule["refresh-job-recommendations"] = {
+        "task": "app.tasks.recommendation_tasks.refresh_recommendations",
+        "schedule": timedelta(minutes=settings.RECOMMENDATIONS_REFRESH_MINUTES),
+    }
@@ -0,0 +1,121 @@
+"""
+Shared fixtures. Settings are read when the app is imported, so the
+environment is pinned first: a throwaway SQLite database, a test JWT key,
+stateless auth, sync sessions and no listing-cache backend.
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+
+_DB_DIR = tempfile.mkdtemp(prefix="ats-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/ats.db"
+os.environ["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough-for-hs256"
+os.environ["JWT_ALGORITHM"] = "HS256"
+os.environ["AUTH_MODE"] = "stateless"
+os.environ["DB_ASYNC"] = "false"
+os.environ["LISTING_CACHE_BACKEND"] = "none"  # ETags still work without one
+os.environ["RECRUITER_DIGEST_MINUTES"] = "0"  # per-application notifications
+os.environ["BCRYPT_ROUNDS"] = "4"  # passlib's minimum: tests don't need slow hashes
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core import analytics, matching, recommendations, security, workflow  # noqa: E402
+from app.core.search import search_index  # noqa: E402
+from app.core.security import create_user_token  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.job import Job  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def password_processes():
+    yield
+    from app.core.passwords import password_hasher
+
+    password_hasher.shutdown()  # started by the first registration or login
+
+
+def _clear_caches():
+    for cache in (
+        security.user_cache,
+        security.token_cache,
+        workflow.pipeline_cache,
+        analytics.analytics_cache,
+        matching.applicant_indexes,
+        recommendations.recommendations_cache,
+        recommendations._corpus_cache,
+    ):
+        cache.clear()
+    search_index.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def fresh_database():
+    """Every test starts from empty tables and cold in-process caches."""
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    _clear_caches()
+    yield
+    _clear_caches()
+
+
+@pytest.fixture
+def db():
+    # Objects stay readable after commit without a refresh query
+    session = SessionLocal(expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def auth_headers(user: User) -> dict:
+    return {"Authorization": f"Bearer {create_user_token(user)}"}
+
+
+@pytest.fixture
+def tenant(db):
+    """
+    Two companies. The first has a recruiter, a hiring manager and two jobs;
+    the second a recruiter. Plus two candidates without a company.
+    """
+    acme, globex = Company(name="Acme"), Company(name="Globex")
+    db.add_all([acme, globex])
+    db.flush()
+
+    users = {
+        "recruiter": User(email="recruiter@acme.example.com", full_name="Rita Recruiter",
+                          role="recruiter", company_id=acme.id),
+        "manager": User(email="manager@acme.example.com", full_name="Hank Manager",
+                        role="hiring_manager", company_id=acme.id),
+        "other_recruiter": User(email="recruiter@globex.example.com", full_name="Otto Recruiter",
+                                role="recruiter", company_id=globex.id),
+        "candidate": User(email="cand@example.com", full_name="Cara Candidate", role="candidate"),
+        "candidate2": User(email="cand2@example.com", full_name="Carl Candidate", role="candidate"),
+    }
+    for user in users.values():
+        user.password_hash = "not-a-real-hash"
+    db.add_all(users.values())
+
+    jobs = [
+        Job(title="Backend Engineer", description="Python, SQL", company_id=acme.id),
+        Job(title="Data Analyst", description="SQL, dashboards", company_id=acme.id),
+    ]
+    db.add_all(jobs)
+    db.commit()
+
+    return SimpleNamespace(
+        company=acme,
+        other_company=globex,
+        jobs=jobs,
+        headers={name: auth_headers(user) for name, user in users.items()},
+        **users,
+    )
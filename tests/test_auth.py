@@ -0,0 +1,167 @@
+import asyncio
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.passwords import PasswordHasher, build_crypt_context, password_hasher
+from app.core.security import create_user_token, decode_access_token, revoke_user_tokens
+from app.models.user import User
+
+
+def register(client, email, password, role="candidate"):
+    return client.post("/auth/register", json={
+        "email": email, "password": password, "full_name": "Sam Sample", "role": role,
+    })
+
+
+def test_register_then_login(client, db):
+    response = register(client, "sam@example.com", "correct horse battery")
+    assert response.status_code == 200
+    assert register(client, "sam@example.com", "another one").status_code == 400
+
+    response = client.post("/auth/login", json={"email": "sam@example.com", "password": "correct horse battery"})
+    assert response.status_code == 200
+    token = response.json()["access_token"]
+
+    response = client.get("/protected", headers={"Authorization": f"Bearer {token}"})
+    assert response.json()["user_id"] == db.query(User.id).filter(User.email == "sam@example.com").scalar()
+
+
+def test_wrong_password_is_rejected(client):
+    register(client, "sam@example.com", "correct horse battery")
+
+    response = client.post("/auth/login", json={"email": "sam@example.com", "password": "battery staple"})
+
+    assert response.status_code == 400
+
+
+def test_login_upgrades_an_outdated_hash(client, db):
+    # Stored at cost 5; the app hashes at BCRYPT_ROUNDS=4
+    user = User(email="old@example.com", full_name="Old Hash", role="candidate",
+                password_hash=build_crypt_context(5).hash("s3cret-pass"))
+    db.add(user)
+    db.commit()
+
+    response = client.post("/auth/login", json={"email": "old@example.com", "password": "s3cret-pass"})
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.get(User, user.id).password_hash.startswith("$2b$04$")
+
+
+def test_revoked_token_keeps_reads_but_loses_writes(client, db, tenant):
+    headers = tenant.headers["recruiter"]
+    revoke_user_tokens(db.get(User, tenant.recruiter.id), db)
+
+    # Stateless reads trust the claims until the token expires
+    assert client.get("/jobs/", headers=headers).status_code == 200
+    response = client.post("/jobs/", json={"title": "Late", "description": ""}, headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+
+
+def test_recruiter_registers_and_creates_a_company(client, db):
+    register(client, "founder@example.com", "correct horse battery", role="recruiter")
+    token = client.post("/auth/login", json={"email": "founder@example.com", "password": "correct horse battery"}
+                        ).json()["access_token"]
+
+    response = client.post("/company/", json={"name": "Initech"}, headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    company_id = response.json()["company_id"]
+    new_token = response.json()["access_token"]
+    assert decode_access_token(new_token)["cid"] == company_id
+    # The company-less token was revoked for writes
+    response = client.post("/company/", json={"name": "Side Gig"}, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+    response = client.post("/jobs/", json={"title": "Engineer", "description": ""},
+                           headers={"Authorization": f"Bearer {new_token}"})
+    assert response.status_code == 200
+
+
+def test_hashing_pool_recovers_from_a_dead_process():
+    asyncio.run(password_hasher.hash("warm-up"))
+    broken = password_hasher.executor
+    for pid in list(broken._processes):
+        os.kill(pid, signal.SIGKILL)
+
+    hashed = asyncio.run(password_hasher.hash("correct horse battery"))
+
+    assert password_hasher.executor is not broken
+    assert build_crypt_context(4).verify("correct horse battery", hashed)
+
+
+def test_hashing_pool_that_keeps_breaking_is_a_503(monkeypatch):
+    class BrokenPool:
+        def submit(self, fn, *args):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    pools = []
+
+    def fresh_pool(self):
+        pools.append(BrokenPool())
+        return pools[-1]
+
+    monkeypatch.setattr(PasswordHasher, "executor", property(fresh_pool))
+    hasher = PasswordHasher(workers=1, max_pending=4, rounds=4)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(hasher.hash("x"))
+
+    assert error.value.status_code == 503
+    assert len(pools) == 2  # retried once on a fresh pool
+    assert hasher.pending == 0
+
+
+
+@pytest.fixture
+def free_recruiter(db):
+    user = User(email="new.recruiter@example.com", password_hash="x", full_name="Nia New", role="recruiter")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_register_cannot_pick_a_company(client, db, tenant):
+    response = client.post("/auth/register", json={
+        "email": "joiner@example.com", "password": "correct horse battery", "full_name": "J",
+        "role": "recruiter", "company_id": tenant.company.id,
+    })
+
+    assert response.status_code == 200
+    assert db.get(User, response.json()["user_id"]).company_id is None
+
+
+def test_recruiter_adds_a_member_to_their_company(client, db, tenant, free_recruiter):
+    old_token = {"Authorization": f"Bearer {create_user_token(free_recruiter)}"}
+
+    response = client.post(f"/company/{tenant.company.id}/members",
+                           json={"email": free_recruiter.email, "role": "hiring_manager"},
+                           headers=tenant.headers["recruiter"])
+
+    assert response.status_code == 200
+    db.refresh(free_recruiter)
+    assert (free_recruiter.company_id, free_recruiter.role) == (tenant.company.id, "hiring_manager")
+    # Tokens issued before the change can no longer write
+    response = client.post("/company/", json={"name": "Side Gig"}, headers=old_token)
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize("who, email, status", [
+    ("other_recruiter", "new.recruiter@example.com", 403),   # not their company
+    ("candidate", "new.recruiter@example.com", 403),         # not a recruiter
+    ("recruiter", "nobody@example.com", 404),
+    ("recruiter", "cand@example.com", 400),                  # candidates can't join
+    ("recruiter", "recruiter@globex.example.com", 409),  # already in a company
+])
+def test_member_add_is_refused(client, tenant, free_recruiter, who, email, status):
+    response = client.post(f"/company/{tenant.company.id}/members", json={"email": email, "role": "recruiter"},
+                           headers=tenant.headers[who])
+
+    assert response.status_code == status
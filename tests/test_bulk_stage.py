@@ -0,0 +1,99 @@
+from sqlalchemy import update
+
+import app.routers.applications as applications_router
+from app.core import outbox
+from app.models.application import Application
+from app.models.application_history import ApplicationHistory
+from app.models.outbox import OutboxMessage
+
+
+def apply(client, tenant, job, who):
+    response = client.post(f"/applications/apply/{job.id}", headers=tenant.headers[who])
+    return response.json()["application_id"]
+
+
+def bulk(client, tenant, ids, stage, who="recruiter"):
+    return client.put("/applications/stage", json={"application_ids": ids, "new_stage": stage},
+                      headers=tenant.headers[who])
+
+
+def test_valid_rows_move_and_the_rest_are_reported(client, db, tenant):
+    job = tenant.jobs[0]
+    screened, fresh = apply(client, tenant, job, "candidate"), apply(client, tenant, job, "candidate2")
+    client.put(f"/applications/{screened}/stage?new_stage=Screening", headers=tenant.headers["recruiter"])
+
+    response = bulk(client, tenant, [screened, fresh, 999, screened], " interview ")
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["new_stage"] == "Interview"
+    assert result["updated"] == [screened]
+    skipped = {entry["application_id"]: entry for entry in result["skipped"]}
+    assert skipped.keys() == {fresh, 999}
+    assert skipped[fresh]["current_stage"] == "Applied"
+    assert skipped[fresh]["reason"].startswith("Invalid transition Applied → Interview")
+    assert skipped[999] == {"application_id": 999, "current_stage": None, "reason": "Application not found"}
+
+    db.expire_all()
+    assert db.get(Application, screened).stage == "Interview"
+    assert db.get(Application, fresh).stage == "Applied"
+    history = db.query(ApplicationHistory).filter(ApplicationHistory.new_stage == "Interview").one()
+    assert (history.application_id, history.old_stage) == (screened, "Screening")
+
+
+def test_one_outbox_message_per_batch(client, db, tenant):
+    job = tenant.jobs[0]
+    ids = [apply(client, tenant, job, "candidate"), apply(client, tenant, job, "candidate2")]
+
+    assert bulk(client, tenant, ids, "Rejected").json()["updated"] == ids
+
+    message = db.query(OutboxMessage).filter(OutboxMessage.task == outbox.SEND_STAGE_CHANGE_EMAILS).one()
+    (emails,) = message.payload["args"]
+    assert sorted(email for email, _, _ in emails) == ["cand2@example.com", "cand@example.com"]
+
+
+def test_unknown_stage_and_roles_are_rejected(client, tenant):
+    application_id = apply(client, tenant, tenant.jobs[0], "candidate")
+
+    assert bulk(client, tenant, [application_id], "Archived").status_code == 400
+    assert bulk(client, tenant, [application_id], "Rejected", who="candidate").status_code == 403
+
+
+def test_other_companies_applications_are_not_found(client, db, tenant):
+    application_id = apply(client, tenant, tenant.jobs[0], "candidate")
+
+    response = bulk(client, tenant, [application_id], "Rejected", who="other_recruiter")
+
+    assert response.status_code == 200
+    assert response.json()["updated"] == []
+    assert response.json()["skipped"] == [
+        {"application_id": application_id, "current_stage": None, "reason": "Application not found"}
+    ]
+    db.expire_all()
+    assert db.get(Application, application_id).stage == "Applied"
+
+
+def test_rows_moved_concurrently_are_skipped(client, db, tenant, monkeypatch):
+    job = tenant.jobs[0]
+    raced, kept = apply(client, tenant, job, "candidate"), apply(client, tenant, job, "candidate2")
+    client.put(f"/applications/{kept}/stage?new_stage=Screening", headers=tenant.headers["recruiter"])
+
+    # Another request moves one row between the read and the update, to a
+    # stage the batch also moves from (SQLite has no FOR UPDATE, so only the
+    # per-row stage guard catches it)
+    original = applications_router.pipelines_for_companies
+
+    def racing(session, company_ids):
+        session.execute(update(Application).where(Application.id == raced).values(stage="Screening"))
+        return original(session, company_ids)
+
+    monkeypatch.setattr(applications_router, "pipelines_for_companies", racing)
+    response = bulk(client, tenant, [raced, kept], "Rejected")
+
+    assert response.json()["updated"] == [kept]
+    (skipped,) = response.json()["skipped"]
+    assert skipped["application_id"] == raced
+    assert skipped["reason"] == "Application stage was changed concurrently, please retry"
+    db.expire_all()
+    assert db.get(Application, raced).stage == "Screening"
+    assert db.query(ApplicationHistory).filter(ApplicationHistory.new_stage == "Rejected").count() == 1
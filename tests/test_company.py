@@ -0,0 +1,43 @@
+import pytest
+
+from app.core.security import create_user_token
+from app.models import Company, User
+
+
+@pytest.fixture
+def free_recruiter(db):
+    user = User(email="founder@example.com", password_hash="x", full_name="Fay Founder", role="recruiter")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def test_recruiter_creates_a_company(client, db, free_recruiter):
+    headers = {"Authorization": f"Bearer {create_user_token(free_recruiter)}"}
+
+    response = client.post("/company/", json={"name": "Initech", "domain": "initech.example.com"},
+                           headers=headers)
+
+    assert response.status_code == 200
+    company = db.get(Company, response.json()["company_id"])
+    assert (company.name, company.domain) == ("Initech", "initech.example.com")
+    db.refresh(free_recruiter)
+    assert free_recruiter.company_id == company.id
+    assert client.get(f"/company/{company.id}", headers=headers).json()["domain"] == "initech.example.com"
+
+
+def test_company_creation_is_refused(client, tenant, free_recruiter):
+    headers = {"Authorization": f"Bearer {create_user_token(free_recruiter)}"}
+
+    assert client.post("/company/", json={"domain": "x.example.com"}, headers=headers).status_code == 400
+    assert client.post("/company/", json={"name": "Acme"}, headers=headers).status_code == 400
+    assert client.post("/company/", json={"name": "Nope"}, headers=tenant.headers["candidate"]).status_code == 403
+
+
+def test_update_company_domain(client, db, tenant):
+    response = client.put(f"/company/{tenant.company.id}", json={"domain": "acme.example.com"},
+                          headers=tenant.headers["recruiter"])
+
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.get(Company, tenant.company.id).domain == "acme.example.com"
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import settings
+from app.models.application import Application
+from app.models.user import User
+from app.tasks import email_tasks
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    monkeypatch.setattr(settings, "RECRUITER_DIGEST_MINUTES", 60)
+    sent = []
+    monkeypatch.setattr(email_tasks, "deliver_email", lambda to, subject, body: sent.append((to, body)))
+    return sent
+
+
+def apply_at(db, tenant, candidate, minutes_ago):
+    db.add(Application(candidate_id=candidate.id, job_id=tenant.jobs[0].id, stage="Applied",
+                       created_at=datetime.utcnow() - timedelta(minutes=minutes_ago)))
+    db.commit()
+
+
+def test_digests_follow_each_recruiters_watermark(db, tenant, outbox):
+    apply_at(db, tenant, tenant.candidate, minutes_ago=10)
+
+    assert email_tasks.send_recruiter_digests() == 1
+    assert [to for to, _ in outbox] == [tenant.recruiter.email]
+    assert tenant.candidate.email in outbox[0][1]
+
+    # Nothing new since the watermark
+    assert email_tasks.send_recruiter_digests() == 0
+
+    # Only applications after the recruiter's own watermark are listed
+    recruiter = db.get(User, tenant.recruiter.id)
+    recruiter.digest_sent_until = datetime.utcnow() - timedelta(minutes=5)
+    db.commit()
+    apply_at(db, tenant, tenant.candidate2, minutes_ago=2)
+
+    assert email_tasks.send_recruiter_digests() == 1
+    body = outbox[-1][1]
+    assert tenant.candidate2.email in body and tenant.candidate.email not in body
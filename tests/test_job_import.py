@@ -0,0 +1,72 @@
+import json
+
+from app.config import settings
+from app.models import Job
+
+CSV = (
+    "title,description,status\n"
+    "Backend Engineer II,Python,open\n"
+    ",No title,open\n"
+    "Designer,Figma,paused\n"
+    "Support Lead,,CLOSED\n"
+)
+
+
+def post_import(client, tenant, body, content_type="text/csv", **params):
+    return client.post("/jobs/import", content=body, params=params,
+                       headers={**tenant.headers["recruiter"], "Content-Type": content_type})
+
+
+def test_csv_import_reports_invalid_rows(client, db, tenant):
+    response = post_import(client, tenant, CSV)
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["received"], result["imported"], result["failed"]) == (4, 2, 2)
+    assert result["method"] == "executemany" and not result["errors_truncated"]
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+    assert result["errors"][0]["errors"][0].startswith("title:")
+    assert result["errors"][1]["errors"][0].startswith("status:")
+
+    imported = db.query(Job.title, Job.status).filter(Job.title.in_(["Backend Engineer II", "Support Lead"])).all()
+    assert sorted(imported) == [("Backend Engineer II", "open"), ("Support Lead", "closed")]
+
+
+def test_ndjson_import_reports_parse_errors_and_other_companies(client, db, tenant):
+    lines = [
+        json.dumps({"title": "SRE"}),
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"title": "Poached", "company_id": tenant.other_company.id}),
+        "",
+        json.dumps({"title": "QA", "status": "closed"}),
+    ]
+    response = post_import(client, tenant, "\n".join(lines), content_type="application/x-ndjson")
+
+    result = response.json()
+    assert (result["received"], result["imported"], result["failed"]) == (5, 2, 3)
+    errors = {error["row"]: error["errors"][0] for error in result["errors"]}
+    assert errors[2].startswith("Invalid JSON")
+    assert errors[3] == "Expected a JSON object"
+    assert errors[4] == f"company_id: not allowed to create jobs for company {tenant.other_company.id}"
+    assert db.query(Job).filter(Job.company_id == tenant.other_company.id).count() == 0
+
+
+def test_error_list_is_capped(client, tenant, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_ERRORS", 3)
+    body = "title,status\n" + "".join(f"Job {i},bogus\n" for i in range(10)) + "Fine,open\n"
+
+    result = post_import(client, tenant, body).json()
+
+    assert (result["imported"], result["failed"]) == (1, 10)
+    assert len(result["errors"]) == 3 and result["errors_truncated"]
+
+
+def test_rejected_requests(client, tenant, monkeypatch):
+    assert post_import(client, tenant, CSV, format="xlsx").status_code == 400
+
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 64)
+    assert post_import(client, tenant, CSV).status_code == 413
+
+    response = client.post("/jobs/import", content=CSV, headers=tenant.headers["candidate"])
+    assert response.status_code == 403
@@ -0,0 +1,56 @@
+import pytest
+
+from app.core import listing_cache
+from app.core.query_counter import assert_num_queries
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(listing_cache, "backend", listing_cache.MemoryBackend(maxsize=100, ttl=60))
+
+
+def test_matching_etag_gets_a_304(client, tenant):
+    headers = tenant.headers["candidate"]
+    for path in ("/jobs/", f"/jobs/{tenant.jobs[0].id}", "/company/", f"/company/{tenant.company.id}"):
+        first = client.get(path, headers=headers)
+        etag = first.headers["ETag"]
+        assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+        again = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b"" and again.headers["ETag"] == etag
+
+        # Weak validators and lists of tags match too
+        weak = client.get(path, headers={**headers, "If-None-Match": f'"stale", W/{etag}'})
+        assert weak.status_code == 304
+
+
+def test_changed_listing_gets_a_new_etag(client, tenant):
+    etag = client.get("/jobs/", headers=tenant.headers["candidate"]).headers["ETag"]
+
+    response = client.post("/jobs/", json={"title": "Platform Engineer", "description": "Kubernetes"},
+                           headers=tenant.headers["recruiter"])
+    assert response.status_code == 200
+
+    response = client.get("/jobs/", headers={**tenant.headers["candidate"], "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert "Platform Engineer" in [job["title"] for job in response.json()]
+
+
+def test_cached_listing_skips_the_database_until_a_write(client, tenant, memory_cache):
+    headers = tenant.headers["candidate"]
+    client.get("/jobs/?limit=5", headers=headers)
+
+    with assert_num_queries(0):
+        cached = client.get("/jobs/?limit=5", headers=headers)
+    assert len(cached.json()) == 2
+
+    response = client.put(f"/jobs/{tenant.jobs[0].id}", json={"title": "Senior Backend Engineer"},
+                          headers=tenant.headers["recruiter"])
+    assert response.status_code == 200
+
+    with assert_num_queries(1):
+        fresh = client.get("/jobs/?limit=5", headers=headers)
+    assert fresh.json()[0]["title"] == "Senior Backend Engineer"
+    assert fresh.headers["ETag"] != cached.headers["ETag"]
@@ -0,0 +1,42 @@
+import importlib.util
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.core import lifecycle, search
+from app.database import Base, engine
+
+
+@pytest.fixture
+def empty_database():
+    Base.metadata.drop_all(engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+@pytest.mark.usefixtures("empty_database")
+def test_migrations_build_the_model_schema():
+    lifecycle.migrate()
+
+    assert lifecycle.check_schema("strict")
+    assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+
+
+@pytest.mark.usefixtures("empty_database")
+def test_created_schema_passes_the_strict_check():
+    with pytest.raises(RuntimeError):
+        lifecycle.check_schema("strict")
+
+    lifecycle.create_schema(engine)
+
+    assert lifecycle.check_schema("strict")
+
+
+def test_search_vector_ddl_matches_its_migration():
+    path = lifecycle.ALEMBIC_INI.parent / "alembic" / "versions" / "c3a9e4f17b05_job_search_vector.py"
+    spec = importlib.util.spec_from_file_location("search_vector_migration", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    # create_schema's copy must build the column the migration builds
+    assert search.SEARCH_DOCUMENT == migration.SEARCH_DOCUMENT
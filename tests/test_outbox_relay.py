@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.core import outbox
+from app.database import SessionLocal
+from app.models.outbox import OutboxMessage
+from app.tasks.outbox_relay import purge_finished, relay_batch
+
+
+def test_messages_commit_with_the_change(client, db, tenant):
+    job = tenant.jobs[0]
+    headers = tenant.headers["candidate"]
+    assert client.post(f"/applications/apply/{job.id}", headers=headers).status_code == 200
+    # Duplicate: the transaction rolls back, and its messages with it
+    assert client.post(f"/applications/apply/{job.id}", headers=headers).status_code == 400
+
+    tasks = [message.task for message in db.query(OutboxMessage).order_by(OutboxMessage.id)]
+    assert tasks == [outbox.SEND_STAGE_CHANGE_EMAIL, outbox.NOTIFY_RECRUITERS_NEW_APPLICATION]
+
+
+def test_relay_delivers_in_order_and_marks_dispatched(db):
+    for n in range(5):
+        outbox.enqueue(db, outbox.SEND_STAGE_CHANGE_EMAIL, f"c{n}@example.com", "Job", "Applied")
+    db.commit()
+    delivered = []
+
+    assert relay_batch(db, batch_size=3, deliver=delivered.append) == 3
+    assert relay_batch(db, batch_size=3, deliver=delivered.append) == 2
+    assert relay_batch(db, batch_size=3, deliver=delivered.append) == 0
+
+    assert [message.payload["args"][0] for message in delivered] == [f"c{n}@example.com" for n in range(5)]
+    assert db.query(OutboxMessage).filter(OutboxMessage.dispatched_at.is_(None)).count() == 0
+
+
+def test_failed_deliveries_are_retried_until_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    outbox.enqueue(db, "app.tasks.unknown")
+    outbox.enqueue(db, outbox.NOTIFY_RECRUITERS_NEW_APPLICATION, 1)
+    db.commit()
+
+    def deliver(message):
+        if message.task == "app.tasks.unknown":
+            raise KeyError(message.task)
+
+    assert relay_batch(db, batch_size=10, deliver=deliver) == 1
+    assert relay_batch(db, batch_size=10, deliver=deliver) == 0
+
+    failed = db.query(OutboxMessage).filter(OutboxMessage.task == "app.tasks.unknown").one()
+    assert failed.attempts == 2 and failed.dispatched_at is None
+    assert failed.failed_at is not None
+    assert "app.tasks.unknown" in failed.last_error
+
+    # Dead-lettered: no longer claimed
+    calls = []
+    relay_batch(db, batch_size=10, deliver=calls.append)
+    assert calls == []
+
+
+def test_messages_are_claimed_before_publishing(db):
+    outbox.enqueue(db, outbox.SEND_STAGE_CHANGE_EMAIL, "c@example.com", "Job", "Applied")
+    db.commit()
+    seen = []
+
+    def deliver(message):
+        # Committed as in flight: no transaction is open while publishing
+        other = SessionLocal()
+        try:
+            seen.append(other.get(OutboxMessage, message.id).claimed_at)
+        finally:
+            other.close()
+
+    assert relay_batch(db, batch_size=10, deliver=deliver) == 1
+    assert seen[0] is not None
+
+
+def test_stale_claims_are_taken_over(db):
+    now = datetime.utcnow()
+    db.add_all([
+        OutboxMessage(task="stale", payload={"args": []}, claimed_at=now - timedelta(hours=1)),
+        OutboxMessage(task="in flight", payload={"args": []}, claimed_at=now),
+    ])
+    db.commit()
+    delivered = []
+
+    assert relay_batch(db, batch_size=10, deliver=delivered.append) == 1
+    assert [message.task for message in delivered] == ["stale"]
+
+
+def test_purge_removes_old_dispatched_and_dead_lettered_messages(db):
+    now = datetime.utcnow()
+    db.add_all([
+        OutboxMessage(task="old", payload={"args": []}, dispatched_at=now - timedelta(days=3)),
+        OutboxMessage(task="dead", payload={"args": []}, failed_at=now - timedelta(days=3)),
+        OutboxMessage(task="recent", payload={"args": []}, dispatched_at=now),
+        OutboxMessage(task="pending", payload={"args": []}),
+    ])
+    db.commit()
+
+    assert purge_finished(db, timedelta(days=1)) == 2
+    assert {message.task for message in db.query(OutboxMessage)} == {"recent", "pending"}
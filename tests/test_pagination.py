@@ -0,0 +1,71 @@
+import json
+from datetime import datetime
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.application import Application
+from app.models.job import Job
+from app.models.user import User
+
+
+def walk(client, path, headers, limit):
+    """Follow X-Next-Cursor to the end; returns the pages."""
+    pages, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def test_job_pages_cover_every_job_once(client, db, tenant):
+    db.add_all(Job(title=f"Job {i}", description="", company_id=tenant.company.id) for i in range(9))
+    db.commit()
+
+    pages = walk(client, "/jobs/", tenant.headers["candidate"], limit=4)
+    ids = [job["id"] for page in pages for job in page]
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    assert ids == sorted(ids) and len(set(ids)) == 11
+
+
+def test_application_pages_break_timestamp_ties_by_id(client, db, tenant):
+    # Same created_at everywhere: only the id tiebreaker keeps pages disjoint
+    same_time = datetime(2025, 3, 1, 9, 30)
+    candidates = [User(email=f"c{i}@example.com", password_hash="x", full_name="C", role="candidate")
+                  for i in range(7)]
+    db.add_all(candidates)
+    db.flush()
+    db.add_all(Application(candidate_id=c.id, job_id=tenant.jobs[0].id, stage="Applied", created_at=same_time)
+               for c in candidates)
+    db.commit()
+
+    pages = walk(client, f"/applications/job/{tenant.jobs[0].id}", tenant.headers["recruiter"], limit=3)
+    ids = [item["id"] for page in pages for item in page]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 7
+
+
+def test_stream_resumes_after_a_page_cursor(client, db, tenant):
+    db.add_all(Job(title=f"Job {i}", description="", company_id=tenant.company.id) for i in range(5))
+    db.commit()
+    headers = tenant.headers["candidate"]
+
+    first = client.get("/jobs/", params={"limit": 3}, headers=headers)
+    streamed = client.get("/jobs/", params={"stream": "true", "cursor": first.headers[NEXT_CURSOR_HEADER]},
+                          headers=headers)
+
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in streamed.text.splitlines()]
+    assert [row["id"] for row in rows] == [job["id"] for job in client.get("/jobs/", headers=headers).json()][3:]
+
+
+def test_invalid_cursor_is_a_400(client, tenant):
+    headers = tenant.headers["candidate"]
+    for params in ({"cursor": "not-a-cursor"}, {"cursor": "WzEsMl0", "limit": 2}):  # WzEsMl0 = [1,2]
+        assert client.get("/jobs/", params=params, headers=headers).status_code == 400
+        # Decoded before the stream starts, so still a proper error response
+        assert client.get("/jobs/", params={**params, "stream": "true"}, headers=headers).status_code == 400
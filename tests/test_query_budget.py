@@ -0,0 +1,103 @@
+"""
+Query budgets: list and detail endpoints run a fixed number of statements,
+however many rows they return (no N+1).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import stage_counts
+from app.core.query_counter import assert_num_queries
+from app.models.application import Application
+from app.models.application_history import ApplicationHistory
+from app.models.job import Job
+from app.models.user import User
+
+
+def add_applicants(db, job_ids, count):
+    """`count` candidates, each applied to every job in `job_ids`."""
+    candidates = [
+        User(email=f"applicant{i}@example.com", password_hash="x", full_name=f"Applicant {i}", role="candidate")
+        for i in range(count)
+    ]
+    db.add_all(candidates)
+    db.flush()
+
+    start = datetime(2025, 1, 1)
+    db.add_all(
+        Application(candidate_id=candidate.id, job_id=job_id, stage="Applied",
+                    created_at=start + timedelta(minutes=i))
+        for i, candidate in enumerate(candidates)
+        for job_id in job_ids
+    )
+    db.flush()
+    stage_counts.rebuild(db)
+    db.commit()
+    return candidates
+
+
+@pytest.mark.parametrize("limit", [50, 5])
+def test_application_lists_are_one_query(client, db, tenant, limit):
+    job_ids = [job.id for job in tenant.jobs]
+    add_applicants(db, job_ids, 12)
+    db.add(Application(candidate_id=tenant.candidate.id, job_id=job_ids[0], stage="Applied"))
+    db.add(Application(candidate_id=tenant.candidate.id, job_id=job_ids[1], stage="Applied"))
+    db.commit()
+
+    with assert_num_queries(1):
+        response = client.get(f"/applications/job/{job_ids[0]}?limit={limit}", headers=tenant.headers["recruiter"])
+    assert response.status_code == 200
+    assert len(response.json()) == min(limit, 13)
+    assert all(item["job_title"] == "Backend Engineer" for item in response.json())
+
+    with assert_num_queries(1):
+        response = client.get(f"/applications/company/{tenant.company.id}?limit={limit}",
+                              headers=tenant.headers["manager"])
+    assert len(response.json()) == min(limit, 26)
+
+    with assert_num_queries(1):
+        response = client.get(f"/applications/my?limit={limit}", headers=tenant.headers["candidate"])
+    assert {item["job_id"] for item in response.json()} == set(job_ids)
+
+
+def test_application_detail_is_two_queries(client, db, tenant):
+    response = client.post(f"/applications/apply/{tenant.jobs[0].id}", headers=tenant.headers["candidate"])
+    application_id = response.json()["application_id"]
+    for stage in ("Screening", "Interview"):
+        response = client.put(f"/applications/{application_id}/stage?new_stage={stage}",
+                              headers=tenant.headers["recruiter"])
+        assert response.status_code == 200
+
+    # Application + job + candidate joined, then the history in one SELECT ... IN
+    with assert_num_queries(2):
+        response = client.get(f"/applications/{application_id}", headers=tenant.headers["recruiter"])
+    assert response.status_code == 200
+    detail = response.json()
+    assert detail["stage"] == "Interview"
+    assert sorted(entry["new_stage"] for entry in detail["history"]) == ["Applied", "Interview", "Screening"]
+    assert db.query(ApplicationHistory).count() == 3
+
+
+def test_job_and_company_listings_are_one_query(client, db, tenant):
+    db.add_all(Job(title=f"Job {i}", description="", company_id=tenant.company.id) for i in range(30))
+    db.commit()
+    headers = tenant.headers["candidate"]
+
+    with assert_num_queries(1):
+        assert len(client.get("/jobs/?limit=25", headers=headers).json()) == 25
+    with assert_num_queries(1):
+        assert client.get(f"/jobs/{tenant.jobs[0].id}", headers=headers).json()["title"] == "Backend Engineer"
+    with assert_num_queries(1):
+        assert len(client.get("/company/", headers=headers).json()) == 2
+
+
+def test_job_pipeline_reads_the_counters(client, db, tenant):
+    job_id = tenant.jobs[0].id
+    add_applicants(db, [job_id], 40)
+    headers = tenant.headers["recruiter"]
+    client.get(f"/jobs/{job_id}/pipeline", headers=headers)  # compiles and caches the company's pipeline
+
+    # Job's company, then its counter rows: independent of the applicant count
+    with assert_num_queries(2):
+        response = client.get(f"/jobs/{job_id}/pipeline", headers=headers)
+    assert response.json()["total"] == 40
@@ -0,0 +1,45 @@
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.job import Job
+
+
+def search(client, **params):
+    response = client.get("/jobs/search", params=params)
+    assert response.status_code == 200
+    return response
+
+
+def test_title_matches_rank_first(client, db, tenant):
+    db.add_all([
+        Job(title="Office Manager", description="Keeps the Python team fed", company_id=tenant.company.id),
+        Job(title="Senior Python Developer", description="Django and SQL", company_id=tenant.company.id),
+        Job(title="Python Trainer", description="Teach python", status="closed", company_id=tenant.company.id),
+    ])
+    db.commit()
+
+    titles = [job["title"] for job in search(client, q="python").json()]
+
+    # Description-only matches (including the fixture's Backend Engineer) come after
+    assert titles[0] == "Senior Python Developer"
+    assert sorted(titles[1:]) == ["Backend Engineer", "Office Manager"]
+    assert "Python Trainer" in [job["title"] for job in search(client, q="python", status="all").json()]
+
+
+def test_results_page_by_cursor(client, db, tenant):
+    db.add_all(Job(title=f"Data Engineer {i}", description="spark", company_id=tenant.company.id) for i in range(5))
+    db.commit()
+
+    first = search(client, q="data engineer", limit=3)
+    second = search(client, q="data engineer", limit=3, cursor=first.headers[NEXT_CURSOR_HEADER])
+
+    ids = [job["id"] for job in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 5
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+
+def test_new_jobs_are_searchable(client, tenant):
+    assert search(client, q="kubernetes").json() == []
+
+    client.post("/jobs/", json={"title": "Kubernetes Engineer", "description": "clusters"},
+                headers=tenant.headers["recruiter"])
+
+    assert [job["title"] for job in search(client, q="kubernetes").json()] == ["Kubernetes Engineer"]
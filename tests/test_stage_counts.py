@@ -0,0 +1,97 @@
+from collections import Counter
+
+from sqlalchemy import update
+
+import app.routers.applications as applications_router
+from app.core import stage_counts
+from app.models import Application, ApplicationHistory, JobStageCount, OutboxMessage
+
+
+def pipeline(client, tenant, job):
+    response = client.get(f"/jobs/{job.id}/pipeline", headers=tenant.headers["recruiter"])
+    assert response.status_code == 200
+    return {entry["stage"]: entry["count"] for entry in response.json()["stages"]}
+
+
+def apply(client, tenant, job, who="candidate"):
+    response = client.post(f"/applications/apply/{job.id}", headers=tenant.headers[who])
+    assert response.status_code == 200
+    return response.json()["application_id"]
+
+
+def test_apply_deltas_upserts_and_accumulates(db, tenant):
+    job_id = tenant.jobs[0].id
+    stage_counts.apply_deltas(db, stage_counts.moved(job_id, None, "Applied"))
+    stage_counts.apply_deltas(db, Counter({(job_id, "Applied"): 2, (job_id, "Screening"): 0}))
+    stage_counts.apply_deltas(db, stage_counts.moved(job_id, "Applied", "Screening"))
+    db.commit()
+
+    assert dict(stage_counts.counts_for_job(db, job_id)) == {"Applied": 2, "Screening": 1}
+
+
+def test_write_paths_keep_counters_in_sync(client, db, tenant):
+    job = tenant.jobs[0]
+    first, second = apply(client, tenant, job), apply(client, tenant, job, "candidate2")
+    assert pipeline(client, tenant, job)["Applied"] == 2
+
+    response = client.put(f"/applications/{first}/stage?new_stage=screening", headers=tenant.headers["recruiter"])
+    assert response.json()["new_stage"] == "Screening"
+
+    response = client.put("/applications/stage", json={"application_ids": [first, second], "new_stage": "Rejected"},
+                          headers=tenant.headers["recruiter"])
+    assert sorted(response.json()["updated"]) == [first, second]
+
+    counts = pipeline(client, tenant, job)
+    assert (counts["Applied"], counts["Screening"], counts["Rejected"]) == (0, 0, 2)
+    assert stage_counts.drift(db) == {}
+
+
+def test_invalid_transition_changes_nothing(client, db, tenant):
+    job = tenant.jobs[0]
+    application_id = apply(client, tenant, job)
+
+    response = client.put(f"/applications/{application_id}/stage?new_stage=Hired", headers=tenant.headers["recruiter"])
+
+    assert response.status_code == 400
+    assert pipeline(client, tenant, job)["Applied"] == 1
+    assert db.query(ApplicationHistory).count() == 1
+
+
+def test_concurrent_stage_change_is_a_409(client, db, tenant, monkeypatch):
+    job = tenant.jobs[0]
+    application_id = apply(client, tenant, job)
+    outbox_before = db.query(OutboxMessage).count()
+
+    # Another request moves the application between the read and the update
+    # (SQLite has no FOR UPDATE, so only the stage guard catches it)
+    original = applications_router.pipeline_for_company
+
+    def racing(session, company_id):
+        session.execute(update(Application).where(Application.id == application_id).values(stage="Rejected"))
+        return original(session, company_id)
+
+    monkeypatch.setattr(applications_router, "pipeline_for_company", racing)
+    response = client.put(f"/applications/{application_id}/stage?new_stage=Screening",
+                          headers=tenant.headers["recruiter"])
+
+    assert response.status_code == 409
+    # Rolled back as a whole: stage, counters, history and outbox untouched
+    db.expire_all()
+    assert db.get(Application, application_id).stage == "Applied"
+    assert dict(stage_counts.counts_for_job(db, job.id)) == {"Applied": 1}
+    assert db.query(ApplicationHistory).count() == 1
+    assert db.query(OutboxMessage).count() == outbox_before
+
+
+def test_rebuild_repairs_drift(db, tenant):
+    job_id = tenant.jobs[0].id
+    db.add(Application(candidate_id=tenant.candidate.id, job_id=job_id, stage="Interview"))
+    db.add(JobStageCount(job_id=job_id, stage="Applied", count=5))
+    db.commit()
+    assert stage_counts.drift(db) == {(job_id, "Applied"): (5, 0), (job_id, "Interview"): (0, 1)}
+
+    stage_counts.rebuild(db)
+    db.commit()
+
+    assert stage_counts.drift(db) == {}
+    assert dict(stage_counts.counts_for_job(db, job_id)) == {"Interview": 1}